@@ -0,0 +1,17 @@
+from fastapi import HTTPException, Request
+from app.services.recommendation_engine import RecommendationEngine
+from app.services.result_cache import ResultCache
+
+def get_engine(request: Request) -> RecommendationEngine:
+    """Return the process-wide RecommendationEngine created in the lifespan hook."""
+    engine = getattr(request.app.state, "engine", None)
+    if engine is None or not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=503, detail="Service is warming up")
+    return engine
+
+def get_result_cache(request: Request) -> ResultCache:
+    """Return the process-wide /recommend-skills result cache."""
+    cache = getattr(request.app.state, "result_cache", None)
+    if cache is None:
+        raise HTTPException(status_code=503, detail="Service is warming up")
+    return cache
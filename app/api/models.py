@@ -28,6 +28,25 @@ class JobDescriptionResponse(BaseModel):
     job_title: str
     description: str
 
+class BatchRecommendationItem(BaseModel):
+    index: int  # Position of the request in the submitted batch
+    result: Optional[SkillRecommendationResponse] = None
+    error: Optional[str] = None
+
+class GeneratedSkill(BaseModel):
+    name: str
+    proficiency: str = "Intermediate"
+
+class GeneratedFrameworkSkills(BaseModel):
+    framework: str
+    hard_skills: List[GeneratedSkill]
+    soft_skills: List[GeneratedSkill]
+
+class GeneratedRecommendation(BaseModel):
+    """Shape of the single JSON-mode completion that covers the description and every framework."""
+    job_description: str
+    frameworks: List[GeneratedFrameworkSkills]
+
 
 # from pydantic import BaseModel
 # from typing import Optional, List, Dict
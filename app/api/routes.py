@@ -1,31 +1,136 @@
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from app.api.models import JobRequest, SkillRecommendationResponse, JobDescriptionResponse
-from app.services.recommendation_engine import RecommendationEngine
+from app.api.dependencies import get_engine, get_result_cache
+from app.config import Config
+from app.services.batch_service import stream_batch_recommendations
+from app.services.llm_scheduler import LLMUnavailableError
+from app.services.metrics import render_metrics, start_request_timing, timed
+from app.services.stream_service import stream_recommendation_events
+from app.services.recommendation_engine import RecommendationEngine, country_for_domain
+from app.services.result_cache import ResultCache, normalize_request_key
 
 router = APIRouter()
 
+def llm_unavailable(error: LLMUnavailableError) -> HTTPException:
+    """503 for an upstream Groq overload, passing its Retry-After hint on to the caller."""
+    headers = {"Retry-After": str(max(1, round(error.retry_after)))} if error.retry_after is not None else None
+    return HTTPException(status_code=503, detail=str(error), headers=headers)
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """Report whether the shared engine has loaded its model and collection."""
+    if getattr(request.app.state, "ready", False):
+        return {"status": "ready"}
+    error = getattr(request.app.state, "warmup_error", None)
+    if error:
+        return JSONResponse(status_code=503, content={"status": "failed", "detail": error})
+    return JSONResponse(status_code=503, content={"status": "not ready"})
+
 @router.post("/recommend-skills", response_model=SkillRecommendationResponse)
-async def recommend_skills(request: JobRequest):
+async def recommend_skills(
+    request: JobRequest,
+    response: Response,
+    engine: RecommendationEngine = Depends(get_engine),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    timing = start_request_timing() if Config.TIMING_HEADER_ENABLED else None
     try:
-        engine = RecommendationEngine()
-        recommendation = engine.get_recommendations(
-            role=request.role,
-            domain=request.domain,
-            industry=request.industry
-        )
-        return recommendation
+        key = normalize_request_key(request.role, request.domain, request.industry)
+        with timed("request"):
+            recommendation = await cache.get_or_compute(key, lambda: engine.aget_recommendations(
+                role=request.role,
+                domain=request.domain,
+                industry=request.industry
+            ))
+        if timing is not None:
+            response.headers["Server-Timing"] = timing.header()
+        # Echo the caller's own spelling of the request fields
+        return recommendation.model_copy(update={
+            "role": request.role,
+            "domain": request.domain,
+            "industry": request.industry,
+            "country": country_for_domain(request.domain)
+        })
+    except LLMUnavailableError as e:
+        raise llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/recommend-skills/batch")
+async def recommend_skills_batch(
+    requests: List[JobRequest],
+    engine: RecommendationEngine = Depends(get_engine),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    """Stream a BatchRecommendationItem per request as newline-delimited JSON, as each one completes."""
+    if len(requests) > Config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {Config.BATCH_MAX_ITEMS} items")
+    return StreamingResponse(
+        stream_batch_recommendations(requests, engine, cache),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/recommend-skills/stream")
+async def recommend_skills_stream(
+    request: JobRequest,
+    engine: RecommendationEngine = Depends(get_engine),
+    cache: ResultCache = Depends(get_result_cache)
+):
+    """Server-sent events variant of /recommend-skills that pushes partial results as they are ready."""
+    return StreamingResponse(
+        stream_recommendation_events(request, engine, cache),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/job-description/{job_title}", response_model=JobDescriptionResponse)
-async def get_job_description(job_title: str):
+async def get_job_description(job_title: str, engine: RecommendationEngine = Depends(get_engine)):
     try:
-        engine = RecommendationEngine()
-        description = engine.get_job_description(job_title)
+        description = await engine.aget_job_description(job_title)
         return JobDescriptionResponse(job_title=job_title, description=description)
+    except LLMUnavailableError as e:
+        raise llm_unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage latency histograms, LLM token usage and JSON-parse fallback counts in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/admin/cache")
+async def cache_stats(request: Request, cache: ResultCache = Depends(get_result_cache)):
+    """Report result, LLM and embedding cache counters."""
+    engine = getattr(request.app.state, "engine", None)
+    llm_cache = engine.llm_service.cache if engine is not None else None
+    embedding_cache = engine.rag_service.embedding_cache if engine is not None else None
+    return {
+        "results": cache.stats(),
+        "llm": await llm_cache.astats() if llm_cache is not None else None,
+        "embeddings": embedding_cache.stats() if embedding_cache is not None else None
+    }
+
+@router.get("/admin/encoder")
+async def encoder_stats(engine: RecommendationEngine = Depends(get_engine)):
+    """Report query-encode micro-batching metrics (batch sizes and queueing delay)."""
+    batcher = engine.rag_service.batcher
+    return {"batching": batcher.stats() if batcher is not None else None}
+
+@router.delete("/admin/cache")
+async def invalidate_cache(
+    role: Optional[str] = None,
+    domain: Optional[str] = None,
+    industry: Optional[str] = None,
+    cache: ResultCache = Depends(get_result_cache)
+):
+    """Invalidate one cached recommendation, or all of them when no request fields are given."""
+    if role is None and domain is None and industry is None:
+        return {"invalidated": cache.invalidate()}
+    if role is None or domain is None or industry is None:
+        raise HTTPException(status_code=400, detail="Provide role, domain and industry, or none of them")
+    return {"invalidated": cache.invalidate(normalize_request_key(role, domain, industry))}
 
 
 # from fastapi import APIRouter, HTTPException
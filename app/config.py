@@ -6,6 +6,101 @@ load_dotenv()
 class Config:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     GROQ_MODEL = "llama-3.3-70b-versatile"
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    # Encoder runtime: "torch" (float model) or "onnx" (int8 dynamically quantized export, CPU only)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+    EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+    EMBEDDING_ONNX_MIN_AGREEMENT = float(os.getenv("EMBEDDING_ONNX_MIN_AGREEMENT", "0.98"))
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))  # 0 leaves the runtime default
+    # Micro-batch concurrent query encodes: wait up to the window for more requests, or until the batch is full
+    EMBEDDING_BATCH_ENABLED = os.getenv("EMBEDDING_BATCH_ENABLED", "true").lower() == "true"
+    EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "3"))
+    EMBEDDING_BATCH_MAX = int(os.getenv("EMBEDDING_BATCH_MAX", "64"))
+    # Shared embedding server (python -m app.services.embedding_server); empty encodes in-process
+    EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET", "")
+    # Also run vector and lexical queries in the server, so workers hold no index or Chroma client
+    EMBEDDING_SERVER_QUERY = os.getenv("EMBEDDING_SERVER_QUERY", "true").lower() == "true"
+    EMBEDDING_SERVER_CONNECT_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_CONNECT_TIMEOUT", "120"))
     CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "/home/artisans15/projects/skill_recommendation/data/vector_db")
     ONET_DATA_PATH = os.getenv("ONET_DATA_PATH", "/home/artisans15/projects/skill_recommendation/data/framworks/onet/db_30_0_text")
-    ESCO_DATA_PATH = os.getenv("ESCO_DATA_PATH", "/home/artisans15/projects/skill_recommendation/data/framworks/esco/ESCO dataset - v1.2.0 - classification - en - csv")
\ No newline at end of file
+    ESCO_DATA_PATH = os.getenv("ESCO_DATA_PATH", "/home/artisans15/projects/skill_recommendation/data/framworks/esco/ESCO dataset - v1.2.0 - classification - en - csv")
+    INDEX_PATH = os.getenv("INDEX_PATH", "/home/artisans15/projects/skill_recommendation/data/indexes")
+    ONET_RATINGS_PATH = os.getenv("ONET_RATINGS_PATH", os.path.join(INDEX_PATH, "onet_ratings.npz"))
+    OCCUPATION_PROFILES_PATH = os.getenv("OCCUPATION_PROFILES_PATH", os.path.join(INDEX_PATH, "occupation_profiles.npz"))
+    SKILL_GRAPH_PATH = os.getenv("SKILL_GRAPH_PATH", os.path.join(INDEX_PATH, "skill_graph.npz"))
+    SKILL_CLASSIFIER_PATH = os.getenv("SKILL_CLASSIFIER_PATH", os.path.join(INDEX_PATH, "skill_classifier.npz"))
+    TITLE_INDEX_PATH = os.getenv("TITLE_INDEX_PATH", os.path.join(INDEX_PATH, "title_index.pkl"))
+    TITLE_MATCH_MIN_SCORE = float(os.getenv("TITLE_MATCH_MIN_SCORE", "0.6"))
+    # A title only normalizes to a code that beats the best different code by this much
+    TITLE_MATCH_MIN_MARGIN = float(os.getenv("TITLE_MATCH_MIN_MARGIN", "0.1"))
+    NUMPY_INDEX_PATH = os.getenv("NUMPY_INDEX_PATH", os.path.join(INDEX_PATH, "numpy"))
+    # Vector search backend: "chroma" (persistent client) or "numpy" (in-process exact search)
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+    # Fuse BM25 hits from the lexical index with vector hits (reciprocal-rank fusion constant RRF_K)
+    HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+    LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", os.path.join(INDEX_PATH, "lexical"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+
+    # Groq call scheduling: AIMD concurrency limit, retries with jittered backoff, optional hedging
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_CONCURRENCY_INITIAL = int(os.getenv("LLM_CONCURRENCY_INITIAL", "16"))
+    LLM_CONCURRENCY_MIN = int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+    LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "64"))
+    # Shrink the limit when a window's median latency exceeds this multiple of the best recent median
+    LLM_LATENCY_TOLERANCE = float(os.getenv("LLM_LATENCY_TOLERANCE", "2.0"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_BACKOFF_BASE_MS = float(os.getenv("LLM_BACKOFF_BASE_MS", "250"))
+    LLM_BACKOFF_MAX_MS = float(os.getenv("LLM_BACKOFF_MAX_MS", "8000"))
+    # A Retry-After longer than this fails the call immediately instead of holding the request open
+    LLM_RETRY_AFTER_MAX_SECONDS = float(os.getenv("LLM_RETRY_AFTER_MAX_SECONDS", "20"))
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "50"))
+
+    # LLM response cache (in-memory LRU backed by SQLite)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "/home/artisans15/projects/skill_recommendation/data/cache/llm_cache.sqlite3")
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+    LLM_CACHE_DISK_ENTRIES = int(os.getenv("LLM_CACHE_DISK_ENTRIES", "100000"))
+
+    # Request-level /recommend-skills result cache
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+
+    # /recommend-skills/batch
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
+    # Columnar snapshots of the raw O*NET/ESCO files, rebuilt when a source checksum changes
+    FRAMEWORK_CACHE_ENABLED = os.getenv("FRAMEWORK_CACHE_ENABLED", "true").lower() == "true"
+    FRAMEWORK_CACHE_PATH = os.getenv("FRAMEWORK_CACHE_PATH", os.path.join(INDEX_PATH, "frameworks"))
+
+    # Vector store ingestion
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "512"))
+
+    # Persistent embedding cache (memory-mapped vectors + digest index)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "/home/artisans15/projects/skill_recommendation/data/cache/embeddings")
+    EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+    EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "4096"))
+
+    # Load the encoder, vector collection and indexes after the server starts accepting connections
+    BACKGROUND_WARMUP = os.getenv("BACKGROUND_WARMUP", "true").lower() == "true"
+    # Background builds are retried with doubling delays; after the last failure the process exits
+    WARMUP_MAX_ATTEMPTS = int(os.getenv("WARMUP_MAX_ATTEMPTS", "4"))
+    WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+    # One JSON-mode completion for the job description and every framework, instead of one per branch
+    LLM_CONSOLIDATED_ENABLED = os.getenv("LLM_CONSOLIDATED_ENABLED", "true").lower() == "true"
+    LLM_CONSOLIDATED_MAX_TOKENS = int(os.getenv("LLM_CONSOLIDATED_MAX_TOKENS", "1200"))
+
+    # Add a Server-Timing header with the per-stage breakdown to /recommend-skills responses
+    TIMING_HEADER_ENABLED = os.getenv("TIMING_HEADER_ENABLED", "false").lower() == "true"
+
+    # Hard/soft skill categorization
+    SKILL_CLASSIFIER_K = int(os.getenv("SKILL_CLASSIFIER_K", "7"))
+    # Local predictions below this vote share (or nearest-neighbour similarity) go to the LLM
+    SKILL_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("SKILL_CLASSIFIER_MIN_CONFIDENCE", "0.8"))
+    SKILL_CLASSIFIER_MIN_SIMILARITY = float(os.getenv("SKILL_CLASSIFIER_MIN_SIMILARITY", "0.6"))
+    SKILL_CATEGORY_CACHE_SIZE = int(os.getenv("SKILL_CATEGORY_CACHE_SIZE", "10000"))
@@ -1,13 +1,45 @@
+import logging
+from app.core.title_index import TitleIndex
+from app.data.framework_loader import FrameworkLoader
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 class JobNormalizer:
-    def __init__(self):
-        # Placeholder for ISCO or framework mappings
-        self.mappings = {
-            "data scientist": {"O*NET": "15-2051.00", "ESCO": "252901"},
-            "software engineer": {"O*NET": "15-1252.00", "ESCO": "251202"},
-            # Add more mappings as needed
-        }
+    def __init__(self, title_index: TitleIndex = None): # type: ignore
+        # Curated overrides (framework -> title -> code) checked before the title index
+        self.mappings = FrameworkLoader().load_mappings()
+        try:
+            self.title_index = title_index or TitleIndex.load_or_build()
+        except Exception as e:
+            logger.error(f"Title index unavailable, using curated mappings only: {str(e)}")
+            self.title_index = None
 
-    def normalize(self, job_title: str, framework: str) -> str:
-        """Normalize job title to a framework-specific occupation code."""
+    def resolve(self, job_title: str, framework: str = None, k: int = 5) -> list: # type: ignore
+        """Return ranked {"framework", "code", "title", "score"} matches for a job title."""
+        if self.title_index is None:
+            return []
+        return self.title_index.lookup(job_title, framework, k)
+
+    def occupation_code(self, job_title: str, framework: str) -> str:
+        """Return the occupation code a job title unambiguously maps to, or None.
+
+        Generic titles ("manager", "engineer") score alike against many occupations, so the best
+        index match is only accepted when it clears TITLE_MATCH_MIN_SCORE and beats the best
+        match for a different code by TITLE_MATCH_MIN_MARGIN; a tie is never accepted.
+        """
         job_title = job_title.lower().strip()
-        return self.mappings.get(job_title, {}).get(framework, job_title)
\ No newline at end of file
+        code = self.mappings.get(framework, {}).get(job_title)
+        if code is not None:
+            return code
+        matches = self.resolve(job_title, framework, k=2)
+        if not matches or matches[0]["score"] < Config.TITLE_MATCH_MIN_SCORE:
+            return None # type: ignore
+        if len(matches) > 1 and matches[0]["score"] - matches[1]["score"] < Config.TITLE_MATCH_MIN_MARGIN:
+            return None # type: ignore
+        return matches[0]["code"]
+
+    def normalize(self, job_title: str, framework: str) -> str:
+        """Normalize job title to a framework-specific occupation code, or its lowercase form when ambiguous."""
+        return self.occupation_code(job_title, framework) or job_title.lower().strip()
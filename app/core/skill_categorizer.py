@@ -1,13 +1,37 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from app.config import Config
+from app.core.skill_classifier import SkillTypeClassifier
 from app.services.llm_service import LLMService
+from app.services.metrics import JSON_PARSE, timed
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_skill_name(skill: str) -> str:
+    """Memo key for a skill: lowercased with whitespace collapsed."""
+    return " ".join(skill.lower().split())
 
 class SkillCategorizer:
-    def __init__(self):
-        self.llm_service = LLMService()
+    def __init__(self, llm_service: LLMService = None, rag_service=None, classifier: SkillTypeClassifier = None): # type: ignore
+        self.llm_service = llm_service or LLMService()
+        # The local classifier needs an encoder; without a RAG service every unseen skill goes to the LLM
+        self.rag_service = rag_service
+        self.classifier = classifier or (SkillTypeClassifier.load() if rag_service is not None else None)
+        self._categories = OrderedDict()
+        self._lock = threading.Lock()
 
-    def categorize(self, skills: list) -> tuple:
-        """Categorize skills into hard and soft skills using LLM."""
+    def categorize(self, skills: list, batch: bool = True) -> tuple:
+        """Categorize skills into hard and soft skills.
+
+        Memoized and confidently classified skills skip the LLM; with batch=True the rest are
+        categorized in a single LLM call instead of one call per skill.
+        """
         hard_skills = []
         soft_skills = []
+        cleaned = []
         for skill in skills:
             skill_name = skill.get("name", "")
             skill_desc = skill.get("description", skill_name)
@@ -17,8 +41,11 @@ class SkillCategorizer:
             skill_name_clean = self._clean_skill_name(skill_name)
             if not skill_name_clean:
                 continue
-            # Use LLM to determine category
-            category = self._determine_category(skill_name_clean, skill_desc)
+            cleaned.append((skill_name_clean, skill_desc))
+
+        categories = self._determine_categories(cleaned, batch)
+        for skill_name_clean, _ in cleaned:
+            category = categories[normalize_skill_name(skill_name_clean)]
             proficiency = self._assign_proficiency(skill_name_clean)
             skill_obj = {"name": skill_name_clean, "category": category, "proficiency": proficiency}
             if category == "Hard":
@@ -38,6 +65,74 @@ class SkillCategorizer:
             return ""
         return skill
 
+    def _determine_categories(self, skills: list, batch: bool = True) -> dict:
+        """Resolve normalized name -> category via the memo, the local classifier, then the LLM."""
+        categories = {}
+        pending = {}
+        for skill_name, skill_desc in skills:
+            key = normalize_skill_name(skill_name)
+            if key in categories or key in pending:
+                continue
+            category = self._memo_get(key)
+            if category is not None:
+                categories[key] = category
+            else:
+                pending[key] = (skill_name, skill_desc)
+
+        if pending and self.classifier is not None:
+            names = [skill_name for skill_name, _ in pending.values()]
+            predictions = self.classifier.predict(self.rag_service.encode(names))
+            for key, (category, confidence) in zip(list(pending), predictions):
+                if category is not None and confidence >= Config.SKILL_CLASSIFIER_MIN_CONFIDENCE:
+                    categories[key] = category
+                    self._memo_put(key, category)
+                    del pending[key]
+            logger.info(f"Classified {len(names) - len(pending)} of {len(names)} skills locally")
+
+        if pending:
+            if batch:
+                resolved = self._determine_categories_llm(list(pending.values()))
+            else:
+                resolved = {
+                    normalize_skill_name(skill_name): self._determine_category(skill_name, skill_desc)
+                    for skill_name, skill_desc in pending.values()
+                }
+            for key in pending:
+                category = resolved.get(key)
+                if category is None:
+                    categories[key] = "Soft"  # Default to Soft if unclear, but don't remember the guess
+                else:
+                    categories[key] = category
+                    self._memo_put(key, category)
+        return categories
+
+    def _determine_categories_llm(self, skills: list) -> dict:
+        """Categorize several skills with one structured LLM call; unparseable entries are left out."""
+        skills_str = "\n".join(f"- {skill_name}: {skill_desc}" for skill_name, skill_desc in skills)
+        prompt = (
+            "For each skill below, determine if it is a hard skill (technical, job-specific) or a soft skill "
+            "(interpersonal, behavioral).\n"
+            f"{skills_str}\n"
+            "Output ONLY valid JSON mapping each skill name exactly as given to \"Hard\" or \"Soft\", "
+            "e.g. {\"Python\": \"Hard\", \"Teamwork\": \"Soft\"}"
+        )
+        response = self.llm_service.generate(prompt, max_tokens=max(100, 16 * len(skills)))
+        try:
+            with timed("json_parse"):
+                parsed = json.loads(response.strip())
+        except json.JSONDecodeError:
+            JSON_PARSE.inc(site="categorizer", outcome="fallback")
+            logger.warning(f"JSON parse failed for batched categorization of {len(skills)} skills")
+            return {}
+        if not isinstance(parsed, dict):
+            JSON_PARSE.inc(site="categorizer", outcome="fallback")
+            return {}
+        JSON_PARSE.inc(site="categorizer", outcome="ok")
+        return {
+            normalize_skill_name(str(name)): category
+            for name, category in parsed.items() if category in ["Hard", "Soft"]
+        }
+
     def _determine_category(self, skill_name: str, skill_desc: str) -> str:
         """Use LLM to determine if a skill is hard or soft."""
         prompt = (
@@ -46,7 +141,21 @@ class SkillCategorizer:
             "(interpersonal, behavioral). Respond with only 'Hard' or 'Soft'."
         )
         response = self.llm_service.generate(prompt)
-        return response.strip() if response.strip() in ["Hard", "Soft"] else "Soft"  # Default to Soft if unclear
+        return response.strip() if response.strip() in ["Hard", "Soft"] else None # type: ignore
+
+    def _memo_get(self, key: str):
+        with self._lock:
+            category = self._categories.get(key)
+            if category is not None:
+                self._categories.move_to_end(key)
+            return category
+
+    def _memo_put(self, key: str, category: str):
+        with self._lock:
+            self._categories[key] = category
+            self._categories.move_to_end(key)
+            while len(self._categories) > Config.SKILL_CATEGORY_CACHE_SIZE:
+                self._categories.popitem(last=False)
 
     def _assign_proficiency(self, skill: str) -> str:
         """Assign proficiency level (placeholder logic)."""
@@ -55,4 +164,4 @@ class SkillCategorizer:
             return "Advanced"
         elif any(kw in skill.lower() for kw in ["basic", "beginner"]):
             return "Beginner"
-        return "Intermediate"
\ No newline at end of file
+        return "Intermediate"
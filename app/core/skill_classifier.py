@@ -0,0 +1,86 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Optional
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("Hard", "Soft")
+HARD, SOFT = 0, 1
+
+class SkillTypeClassifier:
+    """Similarity-weighted kNN over embedded ESCO skill labels.
+
+    Transversal skill/competences are the Soft examples; knowledge items and sector- or
+    occupation-specific skills are the Hard ones. Predictions come back with a confidence so
+    callers can send ambiguous skills to the LLM instead.
+    """
+
+    def __init__(self, embeddings: np.ndarray, labels: np.ndarray):
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.uint8)
+
+    @staticmethod
+    def training_frame(esco_df: pd.DataFrame, transversal_df: pd.DataFrame) -> pd.DataFrame:
+        """Label ESCO skills as Hard/Soft, returning a deduplicated (name, label) frame."""
+        soft = transversal_df[transversal_df["skillType"] == "skill/competence"]["Element Name"]
+        soft_names = set(soft.str.lower())
+        hard = esco_df[
+            (esco_df["skillType"] == "knowledge") | esco_df["reuseLevel"].isin(["sector-specific", "occupation-specific"])
+        ]["Element Name"]
+        hard = hard[~hard.str.lower().isin(soft_names)]
+        frame = pd.concat([
+            pd.DataFrame({"name": soft, "label": SOFT}),
+            pd.DataFrame({"name": hard, "label": HARD})
+        ], ignore_index=True)
+        return frame.dropna().drop_duplicates(subset=["name"])
+
+    @classmethod
+    def build(cls, loader=None, rag_service=None) -> "SkillTypeClassifier":
+        from app.data.framework_loader import FrameworkLoader
+        from app.services.rag_service import RAGService
+        loader = loader or FrameworkLoader()
+        rag_service = rag_service or RAGService()
+        frame = cls.training_frame(loader.load_esco(), loader.load_esco_transversal())
+        classifier = cls(rag_service.encode(frame["name"].tolist()), frame["label"].to_numpy())
+        logger.info(f"Built skill classifier from {len(frame)} labelled skills ({int((frame['label'] == SOFT).sum())} soft)")
+        return classifier
+
+    def save(self, path: str = None): # type: ignore
+        path = path or Config.SKILL_CLASSIFIER_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, embeddings=self.embeddings.astype(np.float16), labels=self.labels)
+        logger.info(f"Saved skill classifier to {path}")
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["SkillTypeClassifier"]: # type: ignore
+        path = path or Config.SKILL_CLASSIFIER_PATH
+        if not os.path.exists(path):
+            logger.warning(f"Skill classifier not found at {path}")
+            return None
+        with np.load(path) as data:
+            return cls(data["embeddings"], data["labels"])
+
+    def predict(self, embeddings: np.ndarray, k: int = None) -> list: # type: ignore
+        """Return a (category, confidence) pair per embedding; category is None when no neighbour is close enough."""
+        k = min(k or Config.SKILL_CLASSIFIER_K, len(self.labels))
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if k == 0 or len(embeddings) == 0:
+            return [(None, 0.0)] * len(embeddings)
+        similarities = embeddings @ self.embeddings.T
+        neighbours = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(similarities, neighbours, axis=1)
+        weights = np.clip(top, 0.0, None)
+        soft_votes = (weights * (self.labels[neighbours] == SOFT)).sum(axis=1)
+        totals = weights.sum(axis=1)
+        predictions = []
+        for best, soft, total in zip(top.max(axis=1), soft_votes, totals):
+            if best < Config.SKILL_CLASSIFIER_MIN_SIMILARITY or total <= 0:
+                predictions.append((None, 0.0))
+                continue
+            share = float(soft / total)
+            predictions.append((CATEGORIES[SOFT], share) if share >= 0.5 else (CATEGORIES[HARD], 1.0 - share))
+        return predictions
@@ -0,0 +1,175 @@
+import os
+import pickle
+import re
+import logging
+import numpy as np
+from typing import Optional
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FRAMEWORKS = ("O*NET", "ESCO")
+
+def _singular(token: str) -> str:
+    # O*NET titles are plural ("Data Scientists"), job requests usually singular
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def normalize_title(title: str) -> str:
+    """Lowercase and reduce a title to space-separated, singularized alphanumeric tokens."""
+    return " ".join(_singular(token) for token in re.sub(r"[^a-z0-9]+", " ", str(title).lower()).split())
+
+def _trigrams(normalized: str) -> set:
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _postings(keys_per_entry: list) -> tuple:
+    """Build a CSR inverted index: vocabulary, indptr and int32 entry ids per key."""
+    postings = {}
+    for entry, keys in enumerate(keys_per_entry):
+        for key in keys:
+            postings.setdefault(key, []).append(entry)
+    vocabulary = sorted(postings)
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(postings[key]) for key in vocabulary])
+    indices = np.fromiter((entry for key in vocabulary for entry in postings[key]), dtype=np.int32, count=int(indptr[-1]))
+    return vocabulary, indptr, indices
+
+class TitleIndex:
+    """Ranked job-title -> occupation code lookup built from O*NET and ESCO title data.
+
+    Lookups try an exact normalized-title match first, then token overlap and finally character
+    trigram overlap (for typos), each answered from compact CSR inverted indexes.
+    """
+
+    def __init__(self, titles: list, frameworks: np.ndarray, codes: list, weights: np.ndarray,
+                 token_index: tuple, trigram_index: tuple, token_counts: np.ndarray, trigram_counts: np.ndarray):
+        self.titles = titles
+        self.frameworks = frameworks  # uint8 index into FRAMEWORKS per entry
+        self.codes = codes
+        self.weights = weights
+        self.token_index = token_index
+        self.trigram_index = trigram_index
+        self.token_counts = token_counts
+        self.trigram_counts = trigram_counts
+        self._exact = {}
+        for entry, title in enumerate(titles):
+            self._exact.setdefault(title, []).append(entry)
+        self._token_slots = {key: slot for slot, key in enumerate(token_index[0])}
+        self._trigram_slots = {key: slot for slot, key in enumerate(trigram_index[0])}
+
+    @classmethod
+    def from_frames(cls, onet_titles, esco_titles) -> "TitleIndex":
+        """Build the index from (code, title, weight) frames, keeping the best weight per entry."""
+        best = {}
+        for framework, frame in (("O*NET", onet_titles), ("ESCO", esco_titles)):
+            for code, title, weight in zip(frame["code"].astype(str), frame["title"], frame["weight"]):
+                normalized = normalize_title(title)
+                if not normalized:
+                    continue
+                key = (normalized, framework, code)
+                best[key] = max(best.get(key, 0.0), float(weight))
+        entries = sorted(best)
+        titles = [title for title, _, _ in entries]
+        tokens = [set(title.split()) for title in titles]
+        trigrams = [_trigrams(title) for title in titles]
+        return cls(
+            titles,
+            np.array([FRAMEWORKS.index(framework) for _, framework, _ in entries], dtype=np.uint8),
+            [code for _, _, code in entries],
+            np.array([best[entry] for entry in entries], dtype=np.float32),
+            _postings(tokens),
+            _postings(trigrams),
+            np.array([len(keys) for keys in tokens], dtype=np.int32),
+            np.array([len(keys) for keys in trigrams], dtype=np.int32)
+        )
+
+    @classmethod
+    def build(cls, loader=None) -> "TitleIndex":
+        """Parse the raw framework title files into a new index."""
+        from app.data.framework_loader import FrameworkLoader
+        loader = loader or FrameworkLoader()
+        index = cls.from_frames(loader.load_onet_titles(), loader.load_esco_occupations())
+        logger.info(f"Built title index with {len(index.titles)} entries")
+        return index
+
+    def save(self, path: str = None): # type: ignore
+        path = path or Config.TITLE_INDEX_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        state = {name: getattr(self, name) for name in (
+            "titles", "frameworks", "codes", "weights", "token_index", "trigram_index", "token_counts", "trigram_counts"
+        )}
+        with open(path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Saved title index to {path}")
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["TitleIndex"]: # type: ignore
+        path = path or Config.TITLE_INDEX_PATH
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return cls(**pickle.load(f))
+
+    @classmethod
+    def load_or_build(cls, path: str = None) -> "TitleIndex": # type: ignore
+        """Load the serialized index, building and saving it from the raw files on first use."""
+        index = cls.load(path)
+        if index is None:
+            logger.info("Title index not found, building it from framework title files")
+            index = cls.build()
+            index.save(path)
+        return index
+
+    def _overlap(self, keys: set, postings: tuple, slots: dict, counts: np.ndarray):
+        """Return (entry ids, Jaccard similarity) for entries sharing at least one key."""
+        vocabulary, indptr, indices = postings
+        hits = [indices[indptr[slot]:indptr[slot + 1]] for slot in (slots.get(key) for key in keys) if slot is not None]
+        if not hits:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        entries, overlap = np.unique(np.concatenate(hits), return_counts=True)
+        return entries, overlap / (len(keys) + counts[entries] - overlap)
+
+    def _in_framework(self, entries: np.ndarray, scores: np.ndarray, framework: Optional[str]) -> tuple:
+        if framework is None:
+            return entries, scores
+        keep = self.frameworks[entries] == FRAMEWORKS.index(framework)
+        return entries[keep], scores[keep]
+
+    def lookup(self, title: str, framework: str = None, k: int = 5) -> list: # type: ignore
+        """Return up to k {"framework", "code", "title", "score"} matches, best first.
+
+        With a framework, each stage only considers that framework's entries, so a match in the
+        other framework never stops the fallback to the next stage.
+        """
+        normalized = normalize_title(title)
+        if not normalized:
+            return []
+        entries = np.array(self._exact.get(normalized, []), dtype=np.int32)
+        entries, scores = self._in_framework(entries, np.ones(len(entries), dtype=np.float32), framework)
+        if not len(entries):
+            entries, scores = self._in_framework(
+                *self._overlap(set(normalized.split()), self.token_index, self._token_slots, self.token_counts), framework
+            )
+            if not len(scores) or scores.max() < Config.TITLE_MATCH_MIN_SCORE:
+                entries, scores = self._in_framework(
+                    *self._overlap(_trigrams(normalized), self.trigram_index, self._trigram_slots, self.trigram_counts), framework
+                )
+        if not len(entries):
+            return []
+        scores = scores * self.weights[entries]
+
+        # Only the best few entries per code matter, so rank a bounded candidate set
+        limit = min(len(scores), k * 50)
+        top = np.argpartition(-scores, limit - 1)[:limit] if len(scores) > limit else np.arange(len(scores))
+        results = {}
+        for i in top[np.argsort(-scores[top], kind="stable")]:
+            entry = int(entries[i])
+            key = (FRAMEWORKS[self.frameworks[entry]], self.codes[entry])
+            if key not in results:
+                results[key] = {"framework": key[0], "code": key[1], "title": self.titles[entry], "score": float(scores[i])}
+                if len(results) == k:
+                    break
+        return list(results.values())
@@ -0,0 +1,127 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def file_checksum(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ColumnarCache:
+    """Column-pruned, typed snapshots of loaded framework tables.
+
+    Each table becomes a directory of .npy files: numeric columns as typed arrays, text columns
+    as int32 codes plus an interned category array, read back memory-mapped. A snapshot records
+    the checksum of every source file it was built from and is rebuilt when one changes; size
+    and mtime are compared first so unchanged sources are never re-hashed.
+    """
+
+    def __init__(self, path: str = None): # type: ignore
+        self.path = path or Config.FRAMEWORK_CACHE_PATH
+
+    def get(self, name: str, sources: list, build) -> pd.DataFrame:
+        """Return table name from its snapshot when current, else build() it and snapshot the result."""
+        table_dir = os.path.join(self.path, name)
+        meta = self._current_meta(table_dir, sources)
+        if meta is not None:
+            return self._read(table_dir, meta)
+        df = build()
+        if df.empty:
+            # Loaders return empty frames on errors, which must not be pinned until the sources change
+            return df
+        try:
+            self._write(table_dir, df, sources)
+        except Exception as e:
+            logger.warning(f"Could not write columnar snapshot {name}: {str(e)}")
+        return df
+
+    def _source_state(self, source: str, checksum: bool) -> dict:
+        if not os.path.exists(source):
+            return {"path": source, "size": -1, "mtime_ns": 0, "checksum": None}
+        stat = os.stat(source)
+        return {
+            "path": source, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+            "checksum": file_checksum(source) if checksum else None
+        }
+
+    def _current_meta(self, table_dir: str, sources: list):
+        """Load the snapshot metadata if it still matches every source file, else None."""
+        meta_file = os.path.join(table_dir, "meta.json")
+        if not os.path.exists(meta_file):
+            return None
+        try:
+            with open(meta_file, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        recorded = meta["sources"]
+        if [source["path"] for source in recorded] != list(sources):
+            return None
+        touched = False
+        for source in recorded:
+            current = self._source_state(source["path"], checksum=False)
+            if current["size"] != source["size"]:
+                break
+            if current["mtime_ns"] != source["mtime_ns"]:
+                if file_checksum(source["path"]) != source["checksum"]:
+                    break
+                # Touched but unchanged: remember the new mtime so the next load skips hashing
+                source["mtime_ns"] = current["mtime_ns"]
+                touched = True
+        else:
+            if touched:
+                self._write_meta(table_dir, meta)
+            return meta
+        logger.info(f"Columnar snapshot {os.path.basename(table_dir)} is stale, rebuilding")
+        return None
+
+    def _write(self, table_dir: str, df: pd.DataFrame, sources: list):
+        staging = f"{table_dir}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        columns = []
+        for i, column in enumerate(df.columns):
+            values = df[column]
+            if values.dtype.kind in "biuf":
+                np.save(os.path.join(staging, f"{i}.npy"), values.to_numpy())
+                columns.append({"name": column, "kind": "numeric"})
+            else:
+                codes, categories = pd.factorize(values)
+                np.save(os.path.join(staging, f"{i}.codes.npy"), codes.astype(np.int32))
+                np.save(os.path.join(staging, f"{i}.categories.npy"), np.asarray(categories, dtype=str))
+                columns.append({"name": column, "kind": "text"})
+        self._write_meta(staging, {
+            "sources": [self._source_state(source, checksum=True) for source in sources],
+            "rows": len(df), "columns": columns
+        })
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.replace(staging, table_dir)
+        logger.info(f"Wrote columnar snapshot {os.path.basename(table_dir)} ({len(df)} rows, {len(columns)} columns)")
+
+    def _write_meta(self, table_dir: str, meta: dict):
+        tmp_file = os.path.join(table_dir, "meta.json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, os.path.join(table_dir, "meta.json"))
+
+    def _read(self, table_dir: str, meta: dict) -> pd.DataFrame:
+        data = {}
+        for i, column in enumerate(meta["columns"]):
+            if column["kind"] == "numeric":
+                data[column["name"]] = np.load(os.path.join(table_dir, f"{i}.npy"), mmap_mode="r")
+                continue
+            codes = np.load(os.path.join(table_dir, f"{i}.codes.npy"), mmap_mode="r")
+            categories = np.load(os.path.join(table_dir, f"{i}.categories.npy")).astype(object)
+            # Missing values are coded -1, which indexes the trailing NaN
+            data[column["name"]] = np.append(categories, np.nan)[codes]
+        return pd.DataFrame(data, index=pd.RangeIndex(meta["rows"]))
@@ -1,16 +1,36 @@
 import os
+import functools
 import pandas as pd
 from app.config import Config
+from app.data.columnar_cache import ColumnarCache
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only the columns downstream code reads are parsed and snapshotted
+ONET_SKILL_COLUMNS = ["O*NET-SOC Code", "Element ID", "Element Name", "Scale ID", "Data Value"]
+ESCO_SKILL_COLUMNS = ["conceptUri", "preferredLabel", "description", "skillType", "reuseLevel"]
+
+def snapshot(data_path: str, *filenames: str):
+    """Serve a loader method from its columnar snapshot, rebuilt when any of the source files change."""
+    def decorator(load):
+        @functools.wraps(load)
+        def wrapper(self):
+            if self.cache is None:
+                return load(self)
+            sources = [os.path.join(getattr(self, data_path), filename) for filename in filenames]
+            return self.cache.get(load.__name__, sources, lambda: load(self))
+        return wrapper
+    return decorator
+
 class FrameworkLoader:
     def __init__(self):
         self.onet_path = Config.ONET_DATA_PATH
         self.esco_path = Config.ESCO_DATA_PATH
+        self.cache = ColumnarCache() if Config.FRAMEWORK_CACHE_ENABLED else None
 
+    @snapshot("onet_path", "Skills.txt", "Content Model Reference.txt")
     def load_onet(self):
         """Load O*NET skills data."""
         skills_file = os.path.join(self.onet_path, "Skills.txt")
@@ -20,7 +40,7 @@ class FrameworkLoader:
 
         try:
             # Load Skills.txt (tab-separated)
-            skills_df = pd.read_csv(skills_file, sep="\t", encoding="utf-8")
+            skills_df = pd.read_csv(skills_file, sep="\t", encoding="utf-8", usecols=lambda column: column in ONET_SKILL_COLUMNS)
             logger.info(f"Loaded {len(skills_df)} skills from {skills_file}")
             logger.debug(f"Columns in Skills.txt: {list(skills_df.columns)}")
 
@@ -33,7 +53,7 @@ class FrameworkLoader:
             # Load Content Model Reference for descriptions
             content_file = os.path.join(self.onet_path, "Content Model Reference.txt")
             if os.path.exists(content_file):
-                content_df = pd.read_csv(content_file, sep="\t", encoding="utf-8")
+                content_df = pd.read_csv(content_file, sep="\t", encoding="utf-8", usecols=["Element ID", "Description"])
                 skills_df = skills_df.merge(
                     content_df[["Element ID", "Description"]],
                     on="Element ID",
@@ -52,6 +72,43 @@ class FrameworkLoader:
             logger.error(f"Error loading O*NET data: {str(e)}")
             return pd.DataFrame()
 
+    @snapshot("onet_path", "Technology Skills.txt")
+    def load_onet_technology_skills(self):
+        """Load O*NET Technology Skills with their Hot Technology / In Demand flags."""
+        tech_file = os.path.join(self.onet_path, "Technology Skills.txt")
+        if not os.path.exists(tech_file):
+            logger.warning(f"Technology Skills file not found at {tech_file}")
+            return pd.DataFrame()
+        try:
+            tech_df = pd.read_csv(
+                tech_file, sep="\t", encoding="utf-8",
+                usecols=["O*NET-SOC Code", "Example", "Commodity Title", "Hot Technology", "In Demand"]
+            )
+            logger.info(f"Loaded {len(tech_df)} technology skills from {tech_file}")
+            return tech_df[tech_df["O*NET-SOC Code"].notna() & tech_df["Example"].notna()]
+        except Exception as e:
+            logger.error(f"Error loading O*NET technology skills: {str(e)}")
+            return pd.DataFrame()
+
+    @snapshot("onet_path", "Work Styles.txt")
+    def load_onet_work_styles(self):
+        """Load O*NET Work Styles importance ratings."""
+        styles_file = os.path.join(self.onet_path, "Work Styles.txt")
+        if not os.path.exists(styles_file):
+            logger.warning(f"Work Styles file not found at {styles_file}")
+            return pd.DataFrame()
+        try:
+            styles_df = pd.read_csv(
+                styles_file, sep="\t", encoding="utf-8",
+                usecols=["O*NET-SOC Code", "Element ID", "Element Name", "Scale ID", "Data Value"]
+            )
+            logger.info(f"Loaded {len(styles_df)} work style ratings from {styles_file}")
+            return styles_df[styles_df["O*NET-SOC Code"].notna() & styles_df["Element Name"].notna()]
+        except Exception as e:
+            logger.error(f"Error loading O*NET work styles: {str(e)}")
+            return pd.DataFrame()
+
+    @snapshot("esco_path", "skills_en.csv")
     def load_esco(self):
         """Load ESCO skills data from CSV."""
         skills_file = os.path.join(self.esco_path, "skills_en.csv")
@@ -60,7 +117,7 @@ class FrameworkLoader:
             return pd.DataFrame()
 
         try:
-            esco_df = pd.read_csv(skills_file, encoding="utf-8")
+            esco_df = pd.read_csv(skills_file, encoding="utf-8", usecols=lambda column: column in ESCO_SKILL_COLUMNS)
             logger.info(f"Loaded {len(esco_df)} skills from {skills_file}")
             return esco_df.rename(columns={
                 "preferredLabel": "Element Name",
@@ -71,8 +128,106 @@ class FrameworkLoader:
             logger.error(f"Error loading ESCO data: {str(e)}")
             return pd.DataFrame()
 
+    @snapshot("esco_path", "transversalSkillsCollection_en.csv")
+    def load_esco_transversal(self):
+        """Load ESCO transversal skills (the cross-cutting, mostly interpersonal competences)."""
+        transversal_file = os.path.join(self.esco_path, "transversalSkillsCollection_en.csv")
+        if not os.path.exists(transversal_file):
+            logger.warning(f"ESCO transversal skills file not found at {transversal_file}")
+            return pd.DataFrame(columns=["Element Name", "skillType"])
+        try:
+            df = pd.read_csv(transversal_file, encoding="utf-8", usecols=["preferredLabel", "skillType"])
+            logger.info(f"Loaded {len(df)} transversal skills from {transversal_file}")
+            return df.rename(columns={"preferredLabel": "Element Name"}).dropna(subset=["Element Name"])
+        except Exception as e:
+            logger.error(f"Error loading ESCO transversal skills: {str(e)}")
+            return pd.DataFrame(columns=["Element Name", "skillType"])
+
+    def _load_esco_csv(self, filename: str, usecols: list, description: str):
+        """Read selected columns of an ESCO CSV, returning an empty frame with those columns on failure."""
+        path = os.path.join(self.esco_path, filename)
+        if not os.path.exists(path):
+            logger.warning(f"ESCO {description} file not found at {path}")
+            return pd.DataFrame(columns=usecols)
+        try:
+            df = pd.read_csv(path, encoding="utf-8", usecols=usecols)
+            logger.info(f"Loaded {len(df)} {description} rows from {path}")
+            return df
+        except Exception as e:
+            logger.error(f"Error loading ESCO {description}: {str(e)}")
+            return pd.DataFrame(columns=usecols)
+
+    @snapshot("esco_path", "skillSkillRelations_en.csv")
+    def load_esco_skill_relations(self):
+        """Load ESCO skill-to-skill relations (essential/optional)."""
+        return self._load_esco_csv(
+            "skillSkillRelations_en.csv", ["originalSkillUri", "relationType", "relatedSkillUri"], "skill relations"
+        ).dropna()
+
+    @snapshot("esco_path", "broaderRelationsSkillPillar_en.csv")
+    def load_esco_broader_skills(self):
+        """Load ESCO broader relations of the skills pillar (skill or group -> broader group)."""
+        return self._load_esco_csv(
+            "broaderRelationsSkillPillar_en.csv", ["conceptType", "conceptUri", "broaderUri"], "broader skill relations"
+        ).dropna()
+
+    @snapshot("esco_path", "skillsHierarchy_en.csv")
+    def load_esco_skills_hierarchy(self):
+        """Load the ESCO skills hierarchy (levels 0-3 of skill groups)."""
+        columns = [f"Level {level} {field}" for level in range(4) for field in ("URI", "preferred term")]
+        return self._load_esco_csv("skillsHierarchy_en.csv", columns, "skills hierarchy")
+
+    @snapshot("onet_path", "Occupation Data.txt", "Alternate Titles.txt", "Sample of Reported Titles.txt")
+    def load_onet_titles(self):
+        """Load O*NET occupation titles, alternate titles and sample reported titles.
+
+        Returns a frame of (code, title, weight) where weight ranks official titles above variants.
+        """
+        sources = [
+            ("Occupation Data.txt", ["Title"], 1.0),
+            ("Alternate Titles.txt", ["Alternate Title", "Short Title"], 0.95),
+            ("Sample of Reported Titles.txt", ["Reported Job Title"], 0.95)
+        ]
+        frames = []
+        for filename, title_columns, weight in sources:
+            path = os.path.join(self.onet_path, filename)
+            if not os.path.exists(path):
+                logger.warning(f"O*NET titles file not found at {path}")
+                continue
+            try:
+                df = pd.read_csv(path, sep="\t", encoding="utf-8", usecols=["O*NET-SOC Code", *title_columns])
+                for column in title_columns:
+                    frames.append(pd.DataFrame({"code": df["O*NET-SOC Code"], "title": df[column], "weight": weight}))
+                logger.info(f"Loaded {len(df)} titles from {path}")
+            except Exception as e:
+                logger.error(f"Error loading O*NET titles from {path}: {str(e)}")
+        if not frames:
+            return pd.DataFrame(columns=["code", "title", "weight"])
+        titles = pd.concat(frames, ignore_index=True)
+        return titles[titles["title"].notna() & (titles["title"] != "n/a")]
+
+    @snapshot("esco_path", "occupations_en.csv")
+    def load_esco_occupations(self):
+        """Load ESCO occupation preferred and alternative labels as (code, title, weight) rows."""
+        occupations_file = os.path.join(self.esco_path, "occupations_en.csv")
+        if not os.path.exists(occupations_file):
+            logger.warning(f"ESCO occupations file not found at {occupations_file}")
+            return pd.DataFrame(columns=["code", "title", "weight"])
+        try:
+            df = pd.read_csv(occupations_file, encoding="utf-8", usecols=["code", "preferredLabel", "altLabels"])
+            logger.info(f"Loaded {len(df)} occupations from {occupations_file}")
+            preferred = pd.DataFrame({"code": df["code"], "title": df["preferredLabel"], "weight": 1.0})
+            # altLabels holds one label per line
+            alternatives = df[["code", "altLabels"]].assign(title=df["altLabels"].str.split("\n")).explode("title")
+            alternatives = pd.DataFrame({"code": alternatives["code"], "title": alternatives["title"], "weight": 0.95})
+            titles = pd.concat([preferred, alternatives], ignore_index=True)
+            return titles[titles["title"].notna() & titles["code"].notna()]
+        except Exception as e:
+            logger.error(f"Error loading ESCO occupations: {str(e)}")
+            return pd.DataFrame(columns=["code", "title", "weight"])
+
     def load_mappings(self):
-        """Load framework mappings."""
+        """Load curated framework mappings (title -> occupation code) that override index lookups."""
         return {
             "O*NET": {
                 "data scientist": "15-2051.00",
@@ -80,12 +235,8 @@ class FrameworkLoader:
                 "software engineer": "15-1252.00",
                 "software developer": "15-1252.00"
             },
-            "ESCO": {
-                "data scientist": "252901",
-                "data sciencetist": "252901",
-                "software engineer": "251202",
-                "software developer": "251202"
-            }
+            # ESCO titles resolve through the title index, which carries the ISCO-based codes
+            "ESCO": {}
         }
 
 # import os
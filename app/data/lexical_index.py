@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import re
+import numpy as np
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Function words plus the fixed words of the engine's query template, which would otherwise
+# match nearly every description
+STOPWORDS = frozenset({
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "is", "of", "on", "or", "the", "to", "with",
+    "skill", "skills", "role", "industry"
+})
+NAME_WEIGHT = 2  # Skill-name tokens count as this many occurrences of the term
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens, keeping symbols used in technology names (C++, C#, Node.js)."""
+    return [token for token in re.findall(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*", str(text).lower()) if token not in STOPWORDS]
+
+def normalize_name(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9+#]+", str(text).lower()))
+
+class LexicalIndex:
+    """BM25 over skill names and descriptions, one CSR inverted index per framework.
+
+    Each partition is an .npz of the sorted vocabulary, posting offsets, int32 document ids,
+    uint16 term frequencies and document lengths, plus a JSON sidecar with ids and metadatas.
+    An exact skill-name lookup table lets name queries be answered without any scoring.
+    """
+
+    def __init__(self, path: str = None): # type: ignore
+        self.path = path or Config.LEXICAL_INDEX_PATH
+        self.partitions = {}  # framework -> dict of arrays, ids, metadatas and lookup tables
+        self.load()
+
+    @staticmethod
+    def _slug(framework: str) -> str:
+        return re.sub(r"[^a-z0-9]+", "", framework.lower())
+
+    @classmethod
+    def write_partition(cls, path: str, framework: str, ids: list, documents: list, metadatas: list):
+        """Build and persist the inverted index for one framework's documents."""
+        os.makedirs(path, exist_ok=True)
+        postings = {}
+        doc_lengths = np.zeros(len(ids), dtype=np.uint16)
+        for doc, (document, meta) in enumerate(zip(documents, metadatas)):
+            counts = {}
+            for token in tokenize((meta or {}).get("skill", "")):
+                counts[token] = counts.get(token, 0) + NAME_WEIGHT
+            for token in tokenize(document or ""):
+                counts[token] = counts.get(token, 0) + 1
+            doc_lengths[doc] = min(sum(counts.values()), np.iinfo(np.uint16).max)
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((doc, count))
+        vocabulary = sorted(postings)
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[token]) for token in vocabulary])
+        entries = [entry for token in vocabulary for entry in postings[token]]
+        stem = os.path.join(path, cls._slug(framework))
+        np.savez(
+            f"{stem}.npz",
+            vocabulary=np.asarray(vocabulary, dtype=str),
+            indptr=indptr,
+            doc_ids=np.asarray([doc for doc, _ in entries], dtype=np.int32),
+            term_freqs=np.asarray([min(count, np.iinfo(np.uint16).max) for _, count in entries], dtype=np.uint16),
+            doc_lengths=doc_lengths
+        )
+        with open(f"{stem}.meta.json", "w", encoding="utf-8") as f:
+            json.dump({"framework": framework, "ids": ids, "metadatas": metadatas}, f, ensure_ascii=False)
+        logger.info(f"Wrote {framework} lexical index with {len(vocabulary)} terms over {len(ids)} documents to {stem}.npz")
+
+    def load(self):
+        """(Re)load every partition found under the index directory."""
+        partitions = {}
+        if os.path.isdir(self.path):
+            for name in sorted(os.listdir(self.path)):
+                if not name.endswith(".meta.json"):
+                    continue
+                stem = os.path.join(self.path, name[:-len(".meta.json")])
+                if not os.path.exists(f"{stem}.npz"):
+                    continue
+                with open(f"{stem}.meta.json", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with np.load(f"{stem}.npz") as data:
+                    partition = {key: data[key] for key in data.files}
+                partition["terms"] = {term: i for i, term in enumerate(partition["vocabulary"].tolist())}
+                partition["avg_length"] = max(float(partition["doc_lengths"].mean()), 1.0) if len(meta["ids"]) else 1.0
+                partition["ids"] = meta["ids"]
+                partition["metadatas"] = meta["metadatas"]
+                names = {}
+                for doc, metadata in enumerate(meta["metadatas"]):
+                    names.setdefault(normalize_name((metadata or {}).get("skill", "")), []).append(doc)
+                names.pop("", None)
+                partition["names"] = names
+                partitions[meta["framework"]] = partition
+        self.partitions = partitions
+        if not partitions:
+            logger.warning(f"No lexical index partitions found at {self.path}")
+        for framework, partition in partitions.items():
+            logger.info(f"Loaded {framework} lexical index with {len(partition['terms'])} terms")
+
+    def exact(self, query_text: str, framework: str) -> list:
+        """Metadatas of skills whose name equals the query, ignoring case and punctuation."""
+        partition = self.partitions.get(framework)
+        if partition is None:
+            return []
+        return [partition["metadatas"][doc] for doc in partition["names"].get(normalize_name(query_text), [])]
+
+    def search(self, query_text: str, framework: str, n_results: int = 5) -> list:
+        """Return the top-n metadatas by BM25 score, best match first; documents sharing no term are left out."""
+        partition = self.partitions.get(framework)
+        if partition is None or n_results <= 0:
+            return []
+        term_ids = [partition["terms"][token] for token in set(tokenize(query_text)) if token in partition["terms"]]
+        if not term_ids:
+            return []
+        indptr, doc_lengths = partition["indptr"], partition["doc_lengths"]
+        n_docs = len(doc_lengths)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term in term_ids:
+            start, end = indptr[term], indptr[term + 1]
+            docs = partition["doc_ids"][start:end]
+            tf = partition["term_freqs"][start:end].astype(np.float32)
+            idf = np.log1p((n_docs - (end - start) + 0.5) / ((end - start) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[docs] / partition["avg_length"])
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        matched = np.flatnonzero(scores)
+        k = min(n_results, len(matched))
+        top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        ranked = top[np.argsort(-scores[top], kind="stable")]
+        return [partition["metadatas"][doc] for doc in ranked.tolist()]
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import re
+import numpy as np
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class NumpyIndex:
+    """In-process exact top-k search over one normalized embedding matrix per framework.
+
+    Each partition is stored as a contiguous float16 .npy file plus a JSON sidecar with ids and
+    metadatas. The matrix stays memory-mapped from disk, so workers share it through the page
+    cache. NumPy has no BLAS kernel for float16, so each query batch upcasts BLOCK_ROWS rows at a
+    time to float32 for the matrix product, then runs argpartition over the joined scores.
+    """
+
+    BLOCK_ROWS = 16384
+
+    def __init__(self, path: str = None): # type: ignore
+        self.path = path or Config.NUMPY_INDEX_PATH
+        self.partitions = {}  # framework -> (float16 memmap, ids, metadatas)
+        self.load()
+
+    @staticmethod
+    def _slug(framework: str) -> str:
+        return re.sub(r"[^a-z0-9]+", "", framework.lower())
+
+    @classmethod
+    def write_partition(cls, path: str, framework: str, ids: list, embeddings: np.ndarray, metadatas: list):
+        """Normalize and persist one framework's vectors and metadata."""
+        os.makedirs(path, exist_ok=True)
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        stem = os.path.join(path, cls._slug(framework))
+        # Write beside and rename, so processes still mapping the old file keep a valid mapping
+        with open(f"{stem}.npy.tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float16))
+        with open(f"{stem}.meta.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({"framework": framework, "ids": ids, "metadatas": metadatas}, f, ensure_ascii=False)
+        os.replace(f"{stem}.npy.tmp", f"{stem}.npy")
+        os.replace(f"{stem}.meta.json.tmp", f"{stem}.meta.json")
+        logger.info(f"Wrote {len(ids)} {framework} vectors to {stem}.npy")
+
+    def load(self):
+        """(Re)load every partition found under the index directory."""
+        partitions = {}
+        if os.path.isdir(self.path):
+            for name in sorted(os.listdir(self.path)):
+                if not name.endswith(".meta.json"):
+                    continue
+                stem = os.path.join(self.path, name[:-len(".meta.json")])
+                if not os.path.exists(f"{stem}.npy"):
+                    continue
+                with open(f"{stem}.meta.json", encoding="utf-8") as f:
+                    meta = json.load(f)
+                matrix = np.load(f"{stem}.npy", mmap_mode="r")
+                partitions[meta["framework"]] = (matrix, meta["ids"], meta["metadatas"])
+        self.partitions = partitions
+        if not partitions:
+            logger.warning(f"No NumPy index partitions found at {self.path}")
+        for framework, (matrix, _, _) in partitions.items():
+            logger.info(f"Loaded {framework} partition with {matrix.shape[0]} vectors")
+
+    def query(self, embedding: np.ndarray, framework: str, n_results: int = 5) -> list:
+        return self.query_batch(np.asarray(embedding).reshape(1, -1), framework, n_results)[0]
+
+    def query_batch(self, embeddings: np.ndarray, framework: str, n_results: int = 5) -> list:
+        """Return the top-n metadatas for each query row, best match first."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if framework not in self.partitions:
+            return [[] for _ in range(len(embeddings))]
+        matrix, _, metadatas = self.partitions[framework]
+        k = min(n_results, matrix.shape[0])
+        if k == 0:
+            return [[] for _ in range(len(embeddings))]
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        queries = embeddings / np.where(norms == 0, 1, norms)
+        scores = np.concatenate([
+            queries @ np.asarray(matrix[start:start + self.BLOCK_ROWS], dtype=np.float32).T
+            for start in range(0, matrix.shape[0], self.BLOCK_ROWS)
+        ], axis=1)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        ranked = np.take_along_axis(top, order, axis=1)
+        return [[metadatas[i] for i in row] for row in ranked.tolist()]
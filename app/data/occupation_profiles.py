@@ -0,0 +1,131 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Optional
+from app.config import Config
+from app.data.occupation_ratings import OccupationRatings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SKILL, TECHNOLOGY, WORK_STYLE = 0, 1, 2
+KIND_NAMES = ("skill", "technology", "work_style")
+# How many candidates of each kind an occupation contributes before filling from the remainder
+DEFAULT_QUOTAS = {TECHNOLOGY: 6, SKILL: 4, WORK_STYLE: 2}
+
+class OccupationProfiles:
+    """Ranked per-occupation skill candidates stored as CSR arrays.
+
+    Built once from the O*NET Skills importance ratings in OccupationRatings, Technology Skills (ranked by In Demand,
+    Hot Technology and how many occupations use the tool) and Work Styles importance, so an
+    occupation resolved to a SOC code gets its candidates from an array slice.
+    """
+
+    def __init__(self, soc_codes: np.ndarray, names: np.ndarray, indptr: np.ndarray,
+                 name_ids: np.ndarray, kinds: np.ndarray, scores: np.ndarray):
+        self.soc_codes = soc_codes
+        self.names = names
+        self.indptr = indptr
+        self.name_ids = name_ids
+        self.kinds = kinds
+        self.scores = scores
+        self._soc_index = {code: i for i, code in enumerate(soc_codes.tolist())}
+
+    @classmethod
+    def from_frames(cls, ratings: Optional[OccupationRatings], tech_df: pd.DataFrame, styles_df: pd.DataFrame) -> "OccupationProfiles":
+        parts = []
+        if ratings is not None and len(ratings.soc_codes):
+            rated = ratings.importance_frame()
+            parts.append(pd.DataFrame({
+                "soc": rated["soc"], "name": rated["name"], "kind": SKILL,
+                "score": rated["importance"].astype(float) / 5.0
+            }))
+        if not tech_df.empty:
+            popularity = tech_df.groupby("Example")["O*NET-SOC Code"].transform("nunique")
+            parts.append(pd.DataFrame({
+                "soc": tech_df["O*NET-SOC Code"], "name": tech_df["Example"], "kind": TECHNOLOGY,
+                "score": 2.0 * (tech_df["In Demand"] == "Y") + 1.0 * (tech_df["Hot Technology"] == "Y")
+                         + popularity / popularity.max()
+            }))
+        if not styles_df.empty:
+            rated = styles_df[styles_df["Scale ID"] == "IM"]
+            parts.append(pd.DataFrame({
+                "soc": rated["O*NET-SOC Code"], "name": rated["Element Name"], "kind": WORK_STYLE,
+                "score": pd.to_numeric(rated["Data Value"], errors="coerce") / 5.0
+            }))
+        if not parts:
+            empty = np.array([], dtype=str)
+            return cls(empty, empty, np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32),
+                       np.array([], dtype=np.uint8), np.array([], dtype=np.float32))
+
+        df = pd.concat(parts, ignore_index=True).dropna(subset=["soc", "name", "score"])
+        df = df.drop_duplicates(subset=["soc", "name", "kind"])
+        df = df.sort_values(["soc", "kind", "score", "name"], ascending=[True, True, False, True])
+        socs = pd.Categorical(df["soc"])
+        names = pd.Categorical(df["name"])
+        counts = np.bincount(socs.codes, minlength=len(socs.categories))
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(counts)
+        return cls(
+            np.asarray(socs.categories, dtype=str),
+            np.asarray(names.categories, dtype=str),
+            indptr,
+            names.codes.astype(np.int32),
+            df["kind"].to_numpy(dtype=np.uint8),
+            df["score"].to_numpy(dtype=np.float32)
+        )
+
+    @classmethod
+    def build(cls, loader=None, ratings: OccupationRatings = None) -> "OccupationProfiles": # type: ignore
+        """Build from the ratings index that VectorStore.initialize saves, or from Skills.txt if it is missing."""
+        from app.data.framework_loader import FrameworkLoader
+        loader = loader or FrameworkLoader()
+        ratings = ratings or OccupationRatings.load()
+        if ratings is None:
+            onet_data = loader.load_onet()
+            ratings = OccupationRatings.from_frame(onet_data) if not onet_data.empty else None
+        profiles = cls.from_frames(ratings, loader.load_onet_technology_skills(), loader.load_onet_work_styles())
+        logger.info(f"Built skill profiles for {len(profiles.soc_codes)} occupations")
+        return profiles
+
+    def save(self, path: str = None): # type: ignore
+        path = path or Config.OCCUPATION_PROFILES_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, soc_codes=self.soc_codes, names=self.names, indptr=self.indptr,
+                 name_ids=self.name_ids, kinds=self.kinds, scores=self.scores)
+        logger.info(f"Saved occupation profiles to {path}")
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["OccupationProfiles"]: # type: ignore
+        path = path or Config.OCCUPATION_PROFILES_PATH
+        if not os.path.exists(path):
+            logger.warning(f"Occupation profiles not found at {path}")
+            return None
+        with np.load(path) as data:
+            return cls(data["soc_codes"], data["names"], data["indptr"], data["name_ids"], data["kinds"], data["scores"])
+
+    def __contains__(self, soc_code: str) -> bool:
+        return soc_code in self._soc_index
+
+    def candidates(self, soc_code: str, k: int = 12, quotas: dict = None) -> list: # type: ignore
+        """Return up to k {"name", "kind", "score"} candidates, honouring per-kind quotas first."""
+        soc = self._soc_index.get(soc_code)
+        if soc is None:
+            return []
+        quotas = quotas or DEFAULT_QUOTAS
+        start, end = self.indptr[soc], self.indptr[soc + 1]
+        kinds = self.kinds[start:end]
+        picked = []
+        for kind, quota in quotas.items():
+            picked.extend(np.flatnonzero(kinds == kind)[:quota].tolist())
+        chosen = set(picked)
+        picked.extend(i for i in range(end - start) if i not in chosen)
+        return [
+            {
+                "name": str(self.names[self.name_ids[start + i]]),
+                "kind": KIND_NAMES[self.kinds[start + i]],
+                "score": float(self.scores[start + i])
+            }
+            for i in picked[:k]
+        ]
@@ -0,0 +1,89 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Optional
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OccupationRatings:
+    """Array-backed lookup of O*NET importance (IM) and level (LV) ratings keyed by (SOC code, element)."""
+
+    SCALES = ("IM", "LV")
+
+    def __init__(self, soc_codes: np.ndarray, element_ids: np.ndarray, values: np.ndarray, element_names: np.ndarray = None): # type: ignore
+        self.soc_codes = soc_codes
+        self.element_ids = element_ids
+        self.element_names = element_names if element_names is not None else element_ids
+        self.values = values  # float32 [n_occupations, n_elements, len(SCALES)], NaN where unrated
+        self._soc_index = {code: i for i, code in enumerate(soc_codes.tolist())}
+        self._element_index = {element: i for i, element in enumerate(element_ids.tolist())}
+
+    @classmethod
+    def from_frame(cls, skills_df: pd.DataFrame) -> "OccupationRatings":
+        """Pivot the long occupation x element x scale rows of Skills.txt into a dense array."""
+        df = skills_df[skills_df["Scale ID"].isin(cls.SCALES)]
+        socs = pd.Categorical(df["O*NET-SOC Code"])
+        elements = pd.Categorical(df["Element ID"])
+        scales = pd.Categorical(df["Scale ID"], categories=list(cls.SCALES))
+        values = np.full((len(socs.categories), len(elements.categories), len(cls.SCALES)), np.nan, dtype=np.float32)
+        values[socs.codes, elements.codes, scales.codes] = pd.to_numeric(df["Data Value"], errors="coerce").to_numpy(dtype=np.float32)
+        element_ids = np.asarray(elements.categories, dtype=str)
+        names = df.groupby("Element ID")["Element Name"].first().reindex(elements.categories) if "Element Name" in df.columns else None
+        return cls(
+            np.asarray(socs.categories, dtype=str),
+            element_ids,
+            values,
+            np.asarray(names.fillna(pd.Series(element_ids, index=elements.categories)), dtype=str) if names is not None else element_ids
+        )
+
+    def save(self, path: str = None): # type: ignore
+        path = path or Config.ONET_RATINGS_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, soc_codes=self.soc_codes, element_ids=self.element_ids, element_names=self.element_names, values=self.values)
+        logger.info(f"Saved ratings for {len(self.soc_codes)} occupations x {len(self.element_ids)} elements to {path}")
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["OccupationRatings"]: # type: ignore
+        path = path or Config.ONET_RATINGS_PATH
+        if not os.path.exists(path):
+            logger.warning(f"O*NET ratings index not found at {path}")
+            return None
+        with np.load(path) as data:
+            # Files written before element names were stored fall back to element IDs
+            names = data["element_names"] if "element_names" in data.files else None
+            return cls(data["soc_codes"], data["element_ids"], data["values"], names) # type: ignore
+
+    def get(self, soc_code: str, element_id: str) -> Optional[dict]:
+        """Return {"importance", "level"} for one occupation/element pair, or None if unknown."""
+        soc = self._soc_index.get(soc_code)
+        element = self._element_index.get(element_id)
+        if soc is None or element is None:
+            return None
+        importance, level = self.values[soc, element]
+        return {
+            "importance": None if np.isnan(importance) else float(importance),
+            "level": None if np.isnan(level) else float(level)
+        }
+
+    def importance_frame(self) -> pd.DataFrame:
+        """One row per rated (SOC code, element): soc, element_id, name and importance."""
+        socs, elements = np.nonzero(~np.isnan(self.values[:, :, 0]))
+        return pd.DataFrame({
+            "soc": self.soc_codes[socs],
+            "element_id": self.element_ids[elements],
+            "name": self.element_names[elements],
+            "importance": self.values[socs, elements, 0]
+        })
+
+    def for_occupation(self, soc_code: str) -> list:
+        """Return (element_id, importance, level) for every rated element, most important first."""
+        soc = self._soc_index.get(soc_code)
+        if soc is None:
+            return []
+        ratings = self.values[soc]
+        rated = np.flatnonzero(~np.isnan(ratings[:, 0]))
+        order = rated[np.argsort(-ratings[rated, 0], kind="stable")]
+        return [(str(self.element_ids[i]), float(ratings[i, 0]), float(ratings[i, 1])) for i in order]
@@ -0,0 +1,163 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Optional
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ESSENTIAL, OPTIONAL, BROADER, NARROWER = 0, 1, 2, 3
+RELATION_TYPES = {"essential": ESSENTIAL, "optional": OPTIONAL}
+
+class SkillGraph:
+    """ESCO skill relations as a typed CSR adjacency over interned integer node ids.
+
+    Nodes are skills and skill groups; edges are essential/optional skill relations plus
+    broader (child -> group) and narrower (group -> child) hierarchy links, sorted by type
+    within each node's slice so expansion visits essential relations first.
+    """
+
+    def __init__(self, uris: np.ndarray, labels: np.ndarray, is_group: np.ndarray,
+                 indptr: np.ndarray, targets: np.ndarray, types: np.ndarray):
+        self.uris = uris
+        self.labels = labels
+        self.is_group = is_group
+        self.indptr = indptr
+        self.targets = targets
+        self.types = types
+        self._uri_index = {uri: i for i, uri in enumerate(uris.tolist())}
+
+    @classmethod
+    def from_frames(cls, skills_df: pd.DataFrame, relations_df: pd.DataFrame,
+                    broader_df: pd.DataFrame, hierarchy_df: pd.DataFrame) -> "SkillGraph":
+        labels = {}
+        groups = set()
+        edges = []
+        for level in range(4):
+            uri_column, term_column = f"Level {level} URI", f"Level {level} preferred term"
+            if uri_column not in hierarchy_df.columns:
+                continue
+            level_nodes = hierarchy_df[[uri_column, term_column]].dropna(subset=[uri_column])
+            labels.update(zip(level_nodes[uri_column], level_nodes[term_column].fillna("")))
+            groups.update(level_nodes[uri_column])
+            if level > 0:
+                links = hierarchy_df[[uri_column, f"Level {level - 1} URI"]].dropna()
+                edges.append(pd.DataFrame({"src": links[uri_column], "dst": links[f"Level {level - 1} URI"], "type": BROADER}))
+        if not skills_df.empty:
+            labels.update(zip(skills_df["Element ID"], skills_df["Element Name"].fillna("")))
+        if not broader_df.empty:
+            groups.update(broader_df.loc[broader_df["conceptType"] == "SkillGroup", "conceptUri"])
+            edges.append(pd.DataFrame({"src": broader_df["conceptUri"], "dst": broader_df["broaderUri"], "type": BROADER}))
+        if not relations_df.empty:
+            relation_type = relations_df["relationType"].map(RELATION_TYPES)
+            known = relations_df[relation_type.notna()]
+            edges.append(pd.DataFrame({
+                "src": known["originalSkillUri"], "dst": known["relatedSkillUri"], "type": relation_type[relation_type.notna()]
+            }))
+
+        edge_frame = pd.concat(edges, ignore_index=True) if edges else pd.DataFrame({"src": [], "dst": [], "type": []})
+        nodes = pd.Index(pd.unique(pd.concat([edge_frame["src"], edge_frame["dst"], pd.Series(list(labels), dtype=object)], ignore_index=True)))
+        src = nodes.get_indexer(edge_frame["src"])
+        dst = nodes.get_indexer(edge_frame["dst"])
+        types = edge_frame["type"].to_numpy(dtype=np.int64)
+        is_broader = types == BROADER
+        # Every broader link is mirrored as a narrower one so groups can list their children
+        src, dst, types = (
+            np.concatenate([src, dst[is_broader]]),
+            np.concatenate([dst, src[is_broader]]),
+            np.concatenate([types, np.full(int(is_broader.sum()), NARROWER)])
+        )
+        edge_frame = pd.DataFrame({"src": src, "dst": dst, "type": types}).drop_duplicates()
+        edge_frame = edge_frame.sort_values(["src", "type", "dst"])
+        counts = np.bincount(edge_frame["src"].to_numpy(), minlength=len(nodes))
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(counts)
+        uris = np.asarray(nodes, dtype=str)
+        return cls(
+            uris,
+            np.asarray([labels.get(uri, "") for uri in uris.tolist()], dtype=str),
+            np.isin(uris, np.asarray(list(groups), dtype=str)),
+            indptr,
+            edge_frame["dst"].to_numpy(dtype=np.int32),
+            edge_frame["type"].to_numpy(dtype=np.uint8)
+        )
+
+    @classmethod
+    def build(cls, loader=None) -> "SkillGraph":
+        from app.data.framework_loader import FrameworkLoader
+        loader = loader or FrameworkLoader()
+        graph = cls.from_frames(
+            loader.load_esco(), loader.load_esco_skill_relations(),
+            loader.load_esco_broader_skills(), loader.load_esco_skills_hierarchy()
+        )
+        logger.info(f"Built skill graph with {len(graph.uris)} nodes and {len(graph.targets)} edges")
+        return graph
+
+    def save(self, path: str = None): # type: ignore
+        path = path or Config.SKILL_GRAPH_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, uris=self.uris, labels=self.labels, is_group=self.is_group,
+                 indptr=self.indptr, targets=self.targets, types=self.types)
+        logger.info(f"Saved skill graph to {path}")
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["SkillGraph"]: # type: ignore
+        path = path or Config.SKILL_GRAPH_PATH
+        if not os.path.exists(path):
+            logger.warning(f"Skill graph not found at {path}")
+            return None
+        with np.load(path) as data:
+            return cls(data["uris"], data["labels"], data["is_group"], data["indptr"], data["targets"], data["types"])
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._uri_index
+
+    def label(self, uri: str) -> str:
+        node = self._uri_index.get(uri)
+        return "" if node is None else str(self.labels[node])
+
+    def _neighbours(self, nodes: np.ndarray, edge_types: tuple) -> np.ndarray:
+        """Targets of the given edge types for all nodes, in slice order."""
+        starts, ends = self.indptr[nodes], self.indptr[nodes + 1]
+        lengths = ends - starts
+        if lengths.sum() == 0:
+            return np.array([], dtype=np.int32)
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        positions = offsets + np.arange(lengths.sum())
+        wanted = np.zeros(NARROWER + 1, dtype=bool)
+        wanted[list(edge_types)] = True
+        return self.targets[positions[wanted[self.types[positions]]]]
+
+    def expand(self, uris: list, depth: int = 1, edge_types: tuple = (ESSENTIAL, OPTIONAL), limit: int = None) -> list: # type: ignore
+        """Skills reachable from the seeds within depth hops, nearest (and essential) first; seeds excluded."""
+        frontier = np.array([self._uri_index[uri] for uri in uris if uri in self._uri_index], dtype=np.int64)
+        visited = np.zeros(len(self.uris), dtype=bool)
+        visited[frontier] = True
+        found = []
+        for _ in range(depth):
+            if len(frontier) == 0:
+                break
+            neighbours = self._neighbours(frontier, edge_types)
+            # Keep the first occurrence of each unvisited node
+            _, first = np.unique(neighbours, return_index=True)
+            neighbours = neighbours[np.sort(first)]
+            frontier = neighbours[~visited[neighbours]].astype(np.int64)
+            visited[frontier] = True
+            found.extend(frontier[~self.is_group[frontier]].tolist())
+            if limit is not None and len(found) >= limit:
+                break
+        return [str(self.uris[node]) for node in found[:limit]]
+
+    def siblings(self, uri: str, limit: int = None) -> list: # type: ignore
+        """Other skills filed under the same hierarchy group(s) as uri."""
+        node = self._uri_index.get(uri)
+        if node is None:
+            return []
+        parents = self._neighbours(np.array([node]), (BROADER,)).astype(np.int64)
+        children = self._neighbours(parents, (NARROWER,))
+        _, first = np.unique(children, return_index=True)
+        children = children[np.sort(first)]
+        children = children[(children != node) & ~self.is_group[children]]
+        return [str(self.uris[child]) for child in children[:limit]]
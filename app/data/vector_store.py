@@ -1,84 +1,51 @@
 from app.services.rag_service import RAGService
 from app.data.framework_loader import FrameworkLoader
+from app.data.occupation_ratings import OccupationRatings
+from app.config import Config
+import pandas as pd
+import hashlib
 import logging
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VectorStore:
     def __init__(self):
-        self.rag_service = RAGService()
+        # Ingestion writes to the vector store directly, never through the embedding server
+        self.rag_service = RAGService(use_server=False)
         self.loader = FrameworkLoader()
 
-    def initialize(self):
-        """Initialize vector store with framework data."""
-        # Clear existing collection
-        try:
-            self.rag_service.client.delete_collection("skills")
-            logger.info("Cleared existing 'skills' collection")
-        except:
-            logger.info("No existing 'skills' collection to clear")
+    def initialize(self, full_rebuild: bool = False):
+        """Initialize vector store with framework data.
+
+        By default this is an incremental sync: records are keyed by framework + element ID and
+        carry a content hash, so only new or changed records are re-encoded and records that
+        disappeared from the source data are deleted. Pass full_rebuild=True to start from scratch.
+        """
+        if full_rebuild:
+            try:
+                self.rag_service.client.delete_collection("skills")
+                logger.info("Cleared existing 'skills' collection")
+            except:
+                logger.info("No existing 'skills' collection to clear")
+            self.rag_service.collection = self.rag_service.client.get_or_create_collection(name="skills")
 
         # Load O*NET data
         onet_data = self.loader.load_onet()
         if not onet_data.empty:
-            documents = []
-            metadatas = []
-            for _, row in onet_data.iterrows():
-                skill_name = row.get("Element Name", "")
-                skill_desc = row.get("Description", skill_name)
-                occupation_code = row.get("O*NET-SOC Code", "")
-                element_id = row.get("Element ID", "")
-                if skill_name and skill_desc and occupation_code:
-                    documents.append({
-                        "text": f"{skill_name}: {skill_desc}",
-                        "framework": "O*NET",
-                        "skill": skill_name,
-                        "description": skill_desc,
-                        "element_id": element_id
-                    })
-                    metadatas.append({
-                        "framework": "O*NET",
-                        "skill": skill_name,
-                        "occupation_code": occupation_code,
-                        "description": skill_desc,
-                        "element_id": element_id
-                    })
-            if documents:
-                self.rag_service.add_documents(documents, metadatas)
-                logger.info(f"Added {len(documents)} O*NET skills to vector store")
+            if "Scale ID" in onet_data.columns and "Data Value" in onet_data.columns:
+                OccupationRatings.from_frame(onet_data).save()
             else:
-                logger.warning("No valid O*NET documents to add")
+                logger.warning("O*NET data has no Scale ID/Data Value columns, skipping ratings index")
+            self._sync(self._build_onet_frame(onet_data), "O*NET")
         else:
             logger.warning("No O*NET data loaded")
 
         # Load ESCO data
         esco_data = self.loader.load_esco()
         if not esco_data.empty:
-            documents = []
-            metadatas = []
-            for _, row in esco_data.iterrows():
-                skill_name = row.get("Element Name", "")
-                skill_desc = row.get("Description", skill_name)
-                occupation_code = row.get("Element ID", "")
-                if skill_name and skill_desc:
-                    documents.append({
-                        "text": f"{skill_name}: {skill_desc}",
-                        "framework": "ESCO",
-                        "skill": skill_name,
-                        "description": skill_desc
-                    })
-                    metadatas.append({
-                        "framework": "ESCO",
-                        "skill": skill_name,
-                        "occupation_code": occupation_code,
-                        "description": skill_desc
-                    })
-            if documents:
-                self.rag_service.add_documents(documents, metadatas)
-                logger.info(f"Added {len(documents)} ESCO skills to vector store")
-            else:
-                logger.warning("No valid ESCO documents to add")
+            self._sync(self._build_esco_frame(esco_data), "ESCO")
         else:
             logger.warning("No ESCO data loaded")
 
@@ -88,6 +55,96 @@ class VectorStore:
         logger.info(f"Vector store contains {count} documents")
         if count == 0:
             logger.error("Vector store is empty after initialization")
+            return
+
+        # Snapshot into the in-process NumPy index so either backend can serve queries
+        self.rag_service.export_index(["O*NET", "ESCO"])
+
+    def _sync(self, frame: pd.DataFrame, framework: str):
+        """Upsert new or changed records of one framework and delete ones no longer in the source."""
+        if frame.empty:
+            logger.warning(f"No valid {framework} documents to add")
+            return
+        existing = self.rag_service.get_content_hashes(framework)
+        stored_hashes = frame["id"].map(existing)
+        changed = frame[stored_hashes.isna() | (stored_hashes != frame["content_hash"])]
+        removed = sorted(set(existing) - set(frame["id"]))
+        logger.info(
+            f"{framework}: {len(frame)} source records, {len(changed)} new or changed, "
+            f"{len(frame) - len(changed)} unchanged, {len(removed)} removed"
+        )
+        if not changed.empty:
+            added = self._ingest(changed, framework)
+            logger.info(f"Upserted {added} {framework} skills to vector store")
+        if removed:
+            self.rag_service.delete_documents(removed)
+            logger.info(f"Deleted {len(removed)} stale {framework} skills from vector store")
+
+    def _build_onet_frame(self, onet_data: pd.DataFrame) -> pd.DataFrame:
+        """Build one O*NET document per unique skill element, column-wise.
+
+        Skills.txt repeats every element for each occupation and scale; the per-occupation
+        ratings live in OccupationRatings, so only the ~35 distinct skill texts are embedded.
+        """
+        onet_data = onet_data[onet_data["O*NET-SOC Code"].notna()].drop_duplicates(subset="Element ID")
+        skill_name = onet_data["Element Name"].fillna("").astype(str)
+        frame = pd.DataFrame({
+            "framework": "O*NET",
+            "skill": skill_name,
+            "description": self._description_column(onet_data, skill_name),
+            "element_id": onet_data["Element ID"].fillna("").astype(str)
+        })
+        frame = frame[(frame["skill"] != "") & (frame["description"] != "")]
+        frame["text"] = frame["skill"] + ": " + frame["description"]
+        return self._with_ids(frame)
+
+    def _build_esco_frame(self, esco_data: pd.DataFrame) -> pd.DataFrame:
+        """Build ESCO documents and metadata column-wise instead of row by row."""
+        esco_data = esco_data.drop_duplicates(subset="Element ID")
+        skill_name = esco_data["Element Name"].fillna("").astype(str)
+        element_id = esco_data["Element ID"].fillna("").astype(str)
+        frame = pd.DataFrame({
+            "framework": "ESCO",
+            "skill": skill_name,
+            "occupation_code": element_id,
+            "description": self._description_column(esco_data, skill_name),
+            "element_id": element_id
+        })
+        frame = frame[(frame["skill"] != "") & (frame["description"] != "") & (frame["element_id"] != "")]
+        frame["text"] = frame["skill"] + ": " + frame["description"]
+        return self._with_ids(frame)
+
+    def _with_ids(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Attach stable framework:element ids and a hash of everything stored for each record."""
+        frame["id"] = frame["framework"] + ":" + frame["element_id"]
+        rows = frame.drop(columns=["id"]).astype(str).itertuples(index=False, name=None)
+        frame["content_hash"] = [hashlib.sha1("\x1f".join(row).encode("utf-8")).hexdigest() for row in rows]
+        return frame
+
+    def _description_column(self, data: pd.DataFrame, skill_name: pd.Series) -> pd.Series:
+        """Use the description where present, falling back to the skill name."""
+        if "Description" not in data.columns:
+            return skill_name
+        description = data["Description"].astype("string").fillna("").astype(str)
+        return description.where(description != "", skill_name)
+
+    def _ingest(self, frame: pd.DataFrame, framework: str) -> int:
+        """Stream a document frame into the collection in fixed-size batches, logging throughput."""
+        total = len(frame)
+        if total == 0:
+            return 0
+        batch_size = Config.INGEST_BATCH_SIZE
+        metadata_columns = [col for col in frame.columns if col not in ("text", "id")]
+        started = time.perf_counter()
+        for start in range(0, total, batch_size):
+            chunk = frame.iloc[start:start + batch_size]
+            documents = [{"text": text} for text in chunk["text"].tolist()]
+            metadatas = chunk[metadata_columns].to_dict("records")
+            self.rag_service.add_documents(documents, metadatas, ids=chunk["id"].tolist(), batch_size=batch_size)
+            done = start + len(chunk)
+            elapsed = time.perf_counter() - started
+            logger.info(f"{framework}: ingested {done}/{total} documents ({done / elapsed:.1f} docs/s)")
+        return total
 
 
 # from app.services.rag_service import RAGService
@@ -1,12 +1,82 @@
+import asyncio
+import os
+import signal
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.routes import router
 from app.config import Config
+from app.services.recommendation_engine import RecommendationEngine
+from app.services.result_cache import ResultCache
 import uvicorn
+import logging
 
-app = FastAPI(title="Skill-360-skill Recommendation")
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def build_engine() -> RecommendationEngine:
+    """Construct the engine (model, collection and index loads) and warm it up; blocking."""
+    engine = RecommendationEngine()
+    engine.warmup()
+    return engine
+
+def exit_process():
+    """Ask uvicorn to shut down so PM2 or the orchestrator restarts the worker."""
+    os.kill(os.getpid(), signal.SIGTERM)
+
+async def warm_up(app: FastAPI):
+    """Build the engine off the event loop and mark the app ready once it can serve.
+
+    Failed builds are retried with doubling delays; after WARMUP_MAX_ATTEMPTS failures the
+    process exits instead of answering 503 forever.
+    """
+    for attempt in range(1, Config.WARMUP_MAX_ATTEMPTS + 1):
+        try:
+            app.state.engine = await asyncio.to_thread(build_engine)
+        except Exception as e:
+            app.state.warmup_error = str(e)
+            if attempt >= Config.WARMUP_MAX_ATTEMPTS:
+                logger.error(f"Engine warmup failed after {attempt} attempts, exiting: {str(e)}")
+                exit_process()
+                return
+            delay = Config.WARMUP_RETRY_SECONDS * 2 ** (attempt - 1)
+            logger.error(f"Engine warmup attempt {attempt} failed, retrying in {delay:.1f}s: {str(e)}")
+            await asyncio.sleep(delay)
+            continue
+        app.state.warmup_error = None
+        app.state.ready = True
+        logger.info("Recommendation engine ready")
+        return
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build one shared RecommendationEngine per process.
+
+    With BACKGROUND_WARMUP the server starts accepting connections immediately and /ready
+    reports 503 until the engine is loaded; otherwise start-up blocks until it is, and fails
+    if the engine can't be built.
+    """
+    app.state.ready = False
+    app.state.engine = None
+    app.state.warmup_error = None
+    app.state.result_cache = ResultCache()
+    app.state.warmup_task = None
+    if Config.BACKGROUND_WARMUP:
+        app.state.warmup_task = asyncio.create_task(warm_up(app))
+    else:
+        # A failed build fails start-up, as before, so the process manager restarts the worker
+        app.state.engine = await asyncio.to_thread(build_engine)
+        app.state.ready = True
+    yield
+    if app.state.warmup_task is not None:
+        app.state.warmup_task.cancel()
+    app.state.ready = False
+    app.state.engine = None
+    app.state.result_cache = None
+
+app = FastAPI(title="Skill-360-skill Recommendation", lifespan=lifespan)
 
 # Include API routes
 app.include_router(router)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import AsyncIterator, List
+from app.api.models import BatchRecommendationItem, JobRequest
+from app.config import Config
+from app.services.recommendation_engine import RecommendationEngine, country_for_domain
+from app.services.result_cache import ResultCache, normalize_request_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def stream_batch_recommendations(
+    requests: List[JobRequest],
+    engine: RecommendationEngine,
+    cache: ResultCache,
+    concurrency: int = None # type: ignore
+) -> AsyncIterator[str]:
+    """Yield one NDJSON line per request, in completion order rather than submission order.
+
+    Identical requests (after key normalization) are computed once and cached results are sent
+    first. Retrieval for every uncached job is prefetched with one batched encode per framework;
+    if that fails, those jobs are reported as errors. At most `concurrency` pipelines run at a time.
+    """
+    indexes_by_key = {}
+    for index, request in enumerate(requests):
+        key = normalize_request_key(request.role, request.domain, request.industry)
+        indexes_by_key.setdefault(key, []).append(index)
+    logger.info(f"Batch of {len(requests)} requests has {len(indexes_by_key)} unique jobs")
+
+    def lines(key: tuple, result, error: str = None): # type: ignore
+        for index in indexes_by_key[key]:
+            request = requests[index]
+            item = BatchRecommendationItem(
+                index=index,
+                result=result.model_copy(update={
+                    "role": request.role,
+                    "domain": request.domain,
+                    "industry": request.industry,
+                    "country": country_for_domain(request.domain)
+                }) if result is not None else None,
+                error=error
+            )
+            yield item.model_dump_json() + "\n"
+
+    unique = {}
+    for key, indexes in indexes_by_key.items():
+        cached = cache.get(key)
+        if cached is not None:
+            for line in lines(key, cached):
+                yield line
+        else:
+            unique[key] = requests[indexes[0]]
+    if not unique:
+        return
+
+    try:
+        prefetched = await engine.aprefetch([(request.role, request.industry) for request in unique.values()])
+    except Exception as e:
+        logger.error(f"Batch prefetch for {len(unique)} jobs failed: {str(e)}")
+        for key in unique:
+            for line in lines(key, None, f"Retrieval failed: {str(e)}"):
+                yield line
+        return
+    semaphore = asyncio.Semaphore(concurrency or Config.BATCH_CONCURRENCY)
+
+    async def run(key: tuple, request: JobRequest):
+        async with semaphore:
+            try:
+                result = await cache.get_or_compute(key, lambda: engine.aget_recommendations(
+                    role=request.role,
+                    domain=request.domain,
+                    industry=request.industry,
+                    prefetched=prefetched
+                ))
+                return key, result, None
+            except Exception as e:
+                logger.error(f"Batch item {request.role} failed: {str(e)}")
+                return key, None, str(e)
+
+    tasks = [asyncio.create_task(run(key, request)) for key, request in unique.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            key, result, error = await next_done
+            for line in lines(key, result, error):
+                yield line
+    finally:
+        # Client went away or the stream finished: ResultCache cancels each pipeline that no other
+        # request is waiting on; shared ones run on and are cached for their other callers
+        for task in tasks:
+            task.cancel()
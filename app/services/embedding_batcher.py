@@ -0,0 +1,113 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)  # Upper bounds; larger batches count as ">64"
+
+class EmbeddingBatcher:
+    """Coalesce concurrent encode calls into one batched model call.
+
+    Callers block in encode() while a single worker thread gathers requests for up to
+    window_ms after the first one arrives (or until max_batch texts are queued), encodes them
+    together and hands each caller its own rows.
+    """
+
+    def __init__(self, encode_fn, window_ms: float = None, max_batch: int = None): # type: ignore
+        self.encode_fn = encode_fn
+        self.window = (window_ms if window_ms is not None else Config.EMBEDDING_BATCH_WINDOW_MS) / 1000.0
+        self.max_batch = max_batch or Config.EMBEDDING_BATCH_MAX
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.batch_sizes = {f"<={bucket}": 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.batch_sizes[f">{BATCH_SIZE_BUCKETS[-1]}"] = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.encode_seconds = 0.0
+
+    def encode(self, texts: list) -> np.ndarray:
+        """Encode texts as part of the next batch; calls already as large as a batch run directly."""
+        if not texts or len(texts) >= self.max_batch:
+            return np.asarray(self.encode_fn(texts), dtype=np.float32)
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((list(texts), time.perf_counter(), future))
+        return future.result()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list:
+        """Block for the first request, then gather more until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = batch[0][1] + self.window
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                # Requests that queued up while the previous batch ran are taken without waiting
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for item_texts, _, _ in batch for text in item_texts]
+            started = time.perf_counter()
+            try:
+                vectors = np.asarray(self.encode_fn(texts), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Batched encode of {len(texts)} texts failed: {str(e)}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+            offset = 0
+            for item_texts, _, future in batch:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+            self._record(len(texts), [started - enqueued for _, enqueued, _ in batch], finished - started)
+
+    def _record(self, size: int, delays: list, encode_seconds: float):
+        with self._lock:
+            self.batches += 1
+            self.requests += len(delays)
+            self.texts += size
+            bucket = next((f"<={bucket}" for bucket in BATCH_SIZE_BUCKETS if size <= bucket), f">{BATCH_SIZE_BUCKETS[-1]}")
+            self.batch_sizes[bucket] += 1
+            self.queue_seconds += sum(delays)
+            self.max_queue_seconds = max(self.max_queue_seconds, max(delays))
+            self.encode_seconds += encode_seconds
+
+    def stats(self) -> dict:
+        """Return batch-size distribution (texts per batch, bucketed by upper bound) and queueing delay."""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "batch_sizes": dict(self.batch_sizes),
+                "mean_queue_ms": round(1000 * self.queue_seconds / self.requests, 3) if self.requests else 0.0,
+                "max_queue_ms": round(1000 * self.max_queue_seconds, 3),
+                "encode_seconds": round(self.encode_seconds, 4),
+                "window_ms": self.window * 1000,
+                "max_batch": self.max_batch
+            }
@@ -0,0 +1,181 @@
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """Persistent text -> embedding cache keyed by (model name, text hash).
+
+    Vectors live in an append-only memory-mapped array (<model>.<dtype>.vectors) and a parallel
+    offset index of 20-byte SHA-1 digests (<model>.<dtype>.index), where digest i owns row i.
+    An in-process LRU holds the hottest vectors as float32.
+
+    Several processes (uvicorn workers, setup_database.py) may share the files: appends happen
+    under an exclusive flock on <model>.<dtype>.lock, after picking up rows other processes
+    wrote, and row offsets come from the vector file's size under that lock.
+    """
+
+    DIGEST_SIZE = 20
+
+    def __init__(self, model_name: str, dim: int, path: str = None, dtype: str = None, memory_items: int = None): # type: ignore
+        self.model_name = model_name
+        self.dim = dim
+        self.path = path or Config.EMBEDDING_CACHE_PATH
+        self.dtype = np.dtype(dtype or Config.EMBEDDING_CACHE_DTYPE)
+        self.memory_items = memory_items if memory_items is not None else Config.EMBEDDING_CACHE_MEMORY_ITEMS
+        self._memory = OrderedDict()  # digest -> float32 vector
+        self._lock = threading.Lock()
+        self._offsets = {}  # digest -> row
+        self._rows = 0
+        self._vectors = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+        os.makedirs(self.path, exist_ok=True)
+        stem = os.path.join(self.path, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)}.{self.dtype.name}")
+        self.vectors_file = f"{stem}.vectors"
+        self.index_file = f"{stem}.index"
+        self.lock_file = f"{stem}.lock"
+        self._load_index()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Hold an flock shared with every other process using these files."""
+        with open(self.lock_file, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        with self._file_lock(exclusive=True):
+            self._read_tail(truncate=True)
+        logger.info(f"Embedding cache for {self.model_name} holds {self._rows} vectors")
+
+    def _read_tail(self, truncate: bool = False):
+        """Index rows appended since we last looked (by any process); must hold the file lock.
+
+        Only rows present in both files count. With truncate, which needs the exclusive lock, a
+        tail written without its vector or digest (e.g. after a crash) is cut off so appends stay aligned.
+        """
+        row_bytes = self.dim * self.dtype.itemsize
+        vector_rows = os.path.getsize(self.vectors_file) // row_bytes if os.path.exists(self.vectors_file) else 0
+        index_rows = os.path.getsize(self.index_file) // self.DIGEST_SIZE if os.path.exists(self.index_file) else 0
+        rows = min(vector_rows, index_rows)
+        if rows > self._rows:
+            with open(self.index_file, "rb") as f:
+                f.seek(self._rows * self.DIGEST_SIZE)
+                digests = f.read((rows - self._rows) * self.DIGEST_SIZE)
+            for row in range(rows - self._rows):
+                self._offsets.setdefault(digests[row * self.DIGEST_SIZE:(row + 1) * self.DIGEST_SIZE], self._rows + row)
+            self._rows = rows
+        if truncate:
+            for file, size in ((self.vectors_file, rows * row_bytes), (self.index_file, rows * self.DIGEST_SIZE)):
+                if os.path.exists(file) and os.path.getsize(file) != size:
+                    os.truncate(file, size)
+
+    def _index_grew(self) -> bool:
+        """Cheap check for rows appended by another process since the last read."""
+        try:
+            return os.path.getsize(self.index_file) > self._rows * self.DIGEST_SIZE
+        except OSError:
+            return False
+
+    def _mapped(self) -> np.ndarray:
+        """Return a read-only memmap covering every row written so far."""
+        if self._vectors is None or len(self._vectors) < self._rows:
+            self._vectors = np.memmap(self.vectors_file, dtype=self.dtype, mode="r", shape=(self._rows, self.dim))
+        return self._vectors
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.sha1(text.encode("utf-8")).digest()
+
+    def get_many(self, texts: list) -> list:
+        """Return a float32 vector per text, or None where the text has not been encoded before."""
+        results = []
+        with self._lock:
+            digests = [self._digest(text) for text in texts]
+            if self._index_grew() and any(digest not in self._memory and digest not in self._offsets for digest in digests):
+                with self._file_lock(exclusive=False):
+                    self._read_tail()
+            for digest in digests:
+                vector = self._memory.get(digest)
+                if vector is not None:
+                    self._memory.move_to_end(digest)
+                    self.hits_memory += 1
+                elif digest in self._offsets:
+                    vector = np.asarray(self._mapped()[self._offsets[digest]], dtype=np.float32)
+                    self._remember(digest, vector)
+                    self.hits_disk += 1
+                else:
+                    self.misses += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: list, vectors: np.ndarray, encode_seconds: float = 0.0):
+        """Persist freshly encoded vectors and record how long encoding them took."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+        with self._lock:
+            self.encoded += len(texts)
+            self.encode_seconds += encode_seconds
+            pending = {}  # digest -> vector not yet on disk
+            for text, vector in zip(texts, vectors):
+                digest = self._digest(text)
+                self._remember(digest, vector)
+                if digest not in self._offsets:
+                    pending[digest] = vector
+            if not pending:
+                return
+            with self._file_lock(exclusive=True):
+                # Another process may have appended rows, including some of ours, since we last looked
+                self._read_tail(truncate=True)
+                new_rows = [(digest, vector) for digest, vector in pending.items() if digest not in self._offsets]
+                if not new_rows:
+                    return
+                # Vectors first, then digests, so the index never points past the vector file
+                with open(self.vectors_file, "ab") as f:
+                    first_row = os.fstat(f.fileno()).st_size // (self.dim * self.dtype.itemsize)
+                    f.write(np.stack([vector for _, vector in new_rows]).astype(self.dtype).tobytes())
+                with open(self.index_file, "ab") as f:
+                    f.write(b"".join(digest for digest, _ in new_rows))
+                for row, (digest, _) in enumerate(new_rows):
+                    self._offsets[digest] = first_row + row
+                self._rows = first_row + len(new_rows)
+
+    def _remember(self, digest: bytes, vector: np.ndarray):
+        self._memory[digest] = vector
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return hit rate and an estimate of encode time saved by cache hits."""
+        with self._lock:
+            hits = self.hits_memory + self.hits_disk
+            lookups = hits + self.misses
+            per_text = self.encode_seconds / self.encoded if self.encoded else 0.0
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "encode_seconds": round(self.encode_seconds, 4),
+                "encode_seconds_saved": round(hits * per_text, 4),
+                "memory_items": len(self._memory),
+                "disk_items": self._rows
+            }
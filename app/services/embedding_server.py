@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+import numpy as np
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Every message is a 5-byte header (1-byte opcode or status, 4-byte big-endian payload length)
+# followed by the payload. Texts travel as length-prefixed UTF-8, vectors as raw little-endian
+# float32 rows after a (rows, dim) header, and query parameters/results as JSON.
+HEADER = struct.Struct(">BI")
+COUNT = struct.Struct(">I")
+SHAPE = struct.Struct(">II")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+OP_INFO = 1
+OP_ENCODE = 2
+OP_QUERY = 3
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server could not be reached or reported a failure."""
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Embedding server connection closed")
+        received += count
+    return bytes(buffer)
+
+def send_frame(sock: socket.socket, code: int, payload: bytes = b""):
+    sock.sendall(HEADER.pack(code, len(payload)) + payload)
+
+def recv_frame(sock: socket.socket) -> tuple:
+    """Read one (code, payload) frame."""
+    code, size = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame of {size} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return code, _recv_exact(sock, size) if size else b""
+
+def pack_texts(texts: list) -> bytes:
+    parts = [COUNT.pack(len(texts))]
+    for text in texts:
+        encoded = text.encode("utf-8")
+        parts.append(COUNT.pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+def unpack_texts(payload: bytes) -> list:
+    (count,), offset = COUNT.unpack_from(payload), COUNT.size
+    texts = []
+    for _ in range(count):
+        (size,) = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        texts.append(payload[offset:offset + size].decode("utf-8"))
+        offset += size
+    return texts
+
+def pack_vectors(vectors: np.ndarray) -> bytes:
+    vectors = np.ascontiguousarray(vectors, dtype="<f4")
+    rows, dim = vectors.shape if vectors.ndim == 2 else (0, 0)
+    return SHAPE.pack(rows, dim) + vectors.tobytes()
+
+def unpack_vectors(payload: bytes) -> np.ndarray:
+    rows, dim = SHAPE.unpack_from(payload)
+    vectors = np.frombuffer(payload, dtype="<f4", offset=SHAPE.size, count=rows * dim)
+    return vectors.reshape(rows, dim).astype(np.float32)
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        rag_service = self.server.rag_service # type: ignore
+        while True:
+            try:
+                op, payload = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                if op == OP_ENCODE:
+                    response = pack_vectors(rag_service.encode(unpack_texts(payload)))
+                elif op == OP_QUERY:
+                    request = json.loads(payload)
+                    results = rag_service.query_batch(
+                        request["texts"], request["framework"], request["n_results"], request.get("exact_texts")
+                    )
+                    response = json.dumps(results).encode("utf-8")
+                elif op == OP_INFO:
+                    response = json.dumps(self.server.info).encode("utf-8") # type: ignore
+                else:
+                    raise ValueError(f"Unknown opcode {op}")
+            except Exception as e:
+                logger.error(f"Embedding server request {op} failed: {str(e)}")
+                send_frame(self.request, STATUS_ERROR, str(e).encode("utf-8"))
+                continue
+            send_frame(self.request, STATUS_OK, response)
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve one process's encoder (and vector index) to local workers over a Unix domain socket.
+
+    Each connection gets a thread; concurrent encode requests from all workers meet in the
+    RAGService micro-batcher, so the model still runs batched.
+    """
+    daemon_threads = True
+
+    def __init__(self, rag_service, socket_path: str = None): # type: ignore
+        socket_path = socket_path or Config.EMBEDDING_SERVER_SOCKET
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+        self.rag_service = rag_service
+        self.info = {"encoder_id": getattr(rag_service, "encoder_id", None)}
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address): # type: ignore
+            os.unlink(self.server_address) # type: ignore
+
+class EmbeddingClient:
+    """Client for EmbeddingServer; keeps one connection per thread and reconnects once on failure."""
+
+    def __init__(self, socket_path: str = None, timeout: float = 30.0): # type: ignore
+        self.socket_path = socket_path or Config.EMBEDDING_SERVER_SOCKET
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _call(self, op: int, payload: bytes) -> bytes:
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_frame(sock, op, payload)
+                status, response = recv_frame(sock)
+                break
+            except (ConnectionError, OSError) as e:
+                self._close()
+                if attempt == 1:
+                    raise EmbeddingServerError(f"Embedding server at {self.socket_path} unavailable: {str(e)}") from e
+        if status != STATUS_OK:
+            raise EmbeddingServerError(response.decode("utf-8", errors="replace"))
+        return response
+
+    def info(self) -> dict:
+        return json.loads(self._call(OP_INFO, b""))
+
+    def wait_ready(self, timeout: float = None) -> dict: # type: ignore
+        """Poll until the server answers, for workers that start alongside it."""
+        timeout = timeout if timeout is not None else Config.EMBEDDING_SERVER_CONNECT_TIMEOUT
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.info()
+            except EmbeddingServerError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+
+    def encode(self, texts: list) -> np.ndarray:
+        return unpack_vectors(self._call(OP_ENCODE, pack_texts(list(texts))))
+
+    def query_batch(self, query_texts: list, framework: str, n_results: int, exact_texts: list = None) -> list: # type: ignore
+        payload = json.dumps({
+            "texts": list(query_texts), "framework": framework, "n_results": n_results,
+            "exact_texts": list(exact_texts) if exact_texts else None
+        })
+        return json.loads(self._call(OP_QUERY, payload.encode("utf-8")))
+
+def main():
+    import argparse
+    from app.services.rag_service import RAGService
+    parser = argparse.ArgumentParser(description="Serve the embedding model and vector index to local workers.")
+    parser.add_argument("--socket", default=Config.EMBEDDING_SERVER_SOCKET or "/tmp/skill-embeddings.sock",
+                        help="Unix domain socket path (set the same EMBEDDING_SERVER_SOCKET for the workers)")
+    args = parser.parse_args()
+    rag_service = RAGService(use_server=False)
+    rag_service.warmup()
+    with EmbeddingServer(rag_service, args.socket) as server:
+        logger.info(f"Embedding server listening on {args.socket}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
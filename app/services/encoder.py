@@ -0,0 +1,90 @@
+import logging
+from typing import TYPE_CHECKING
+import numpy as np
+from app.config import Config
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer as SentenceTransformerType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fixed texts the quantized encoder must agree with the float model on before it is used
+PROBE_TEXTS = [
+    "Python",
+    "SQL",
+    "Apache Spark",
+    "machine learning",
+    "Skills for Data Scientist role in Tech industry in O*NET",
+    "Skills for Registered Nurse role in Healthcare industry in ESCO",
+    "communicate with customers",
+    "negotiate contracts with suppliers",
+    "Critical Thinking: Using logic and reasoning to identify the strengths and weaknesses of alternative solutions.",
+    "operate forklift",
+    "teamwork",
+    "financial statement analysis"
+]
+
+# Bound on first use: importing sentence_transformers pulls in torch and transformers, which
+# dominate process start-up
+SentenceTransformer = None
+
+def _model_class():
+    global SentenceTransformer
+    if SentenceTransformer is None:
+        from sentence_transformers import SentenceTransformer as model_class
+        SentenceTransformer = model_class
+    return SentenceTransformer
+
+def _onnx_encoder() -> "SentenceTransformerType":
+    import onnxruntime as ort
+    session_options = ort.SessionOptions()
+    if Config.EMBEDDING_THREADS > 0:
+        session_options.intra_op_num_threads = Config.EMBEDDING_THREADS
+        session_options.inter_op_num_threads = 1
+    return _model_class()(
+        Config.EMBEDDING_MODEL,
+        device="cpu",
+        backend="onnx",
+        model_kwargs={
+            "file_name": Config.EMBEDDING_ONNX_FILE,
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options
+        }
+    )
+
+def probe_agreement(candidate: "SentenceTransformerType", reference: "SentenceTransformerType", texts: list = None) -> float: # type: ignore
+    """Lowest cosine similarity between the two encoders' embeddings of the probe texts."""
+    texts = texts or PROBE_TEXTS
+    a = np.asarray(candidate.encode(texts), dtype=np.float32)
+    b = np.asarray(reference.encode(texts), dtype=np.float32)
+    cosines = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1) + 1e-12)
+    return float(cosines.min())
+
+def load_encoder() -> tuple:
+    """Return (encoder, encoder id) for the configured EMBEDDING_BACKEND.
+
+    The "onnx" backend loads the int8 dynamically quantized export and only keeps it if its
+    embeddings of PROBE_TEXTS stay within EMBEDDING_ONNX_MIN_AGREEMENT cosine of the float
+    model; otherwise, or if ONNX Runtime is unavailable, the float PyTorch model is used. The id
+    distinguishes the two so their vectors are never mixed in the embedding cache.
+    """
+    if Config.EMBEDDING_BACKEND == "onnx":
+        try:
+            encoder = _onnx_encoder()
+            reference = _model_class()(Config.EMBEDDING_MODEL, device="cpu")
+            agreement = probe_agreement(encoder, reference)
+            del reference
+            if agreement >= Config.EMBEDDING_ONNX_MIN_AGREEMENT:
+                logger.info(f"Using ONNX encoder {Config.EMBEDDING_ONNX_FILE} (min probe cosine {agreement:.4f})")
+                return encoder, f"{Config.EMBEDDING_MODEL}:{Config.EMBEDDING_ONNX_FILE}"
+            logger.error(
+                f"ONNX encoder min probe cosine {agreement:.4f} is below {Config.EMBEDDING_ONNX_MIN_AGREEMENT}, "
+                "falling back to the float model"
+            )
+        except Exception as e:
+            logger.error(f"ONNX encoder unavailable, falling back to the float model: {str(e)}")
+    if Config.EMBEDDING_THREADS > 0:
+        import torch
+        torch.set_num_threads(Config.EMBEDDING_THREADS)
+    return _model_class()(Config.EMBEDDING_MODEL), Config.EMBEDDING_MODEL
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """Content-addressed cache for LLM completions: an in-memory LRU tier in front of SQLite.
+
+    Disk hits don't write; their access times are buffered and flushed in one transaction every
+    TOUCH_BATCH hits or TOUCH_INTERVAL seconds. Async callers use aget/aset, which run the SQLite
+    tier in a worker thread so the event loop only ever touches the memory tier.
+    """
+
+    PRUNE_EVERY = 100
+    TOUCH_BATCH = 64
+    TOUCH_INTERVAL = 30.0
+
+    def __init__(self, path: str = None, ttl: int = None, max_memory_entries: int = None, max_disk_entries: int = None): # type: ignore
+        self.path = path if path is not None else Config.LLM_CACHE_PATH
+        self.ttl = ttl if ttl is not None else Config.LLM_CACHE_TTL
+        self.max_memory_entries = max_memory_entries if max_memory_entries is not None else Config.LLM_CACHE_MEMORY_ENTRIES
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else Config.LLM_CACHE_DISK_ENTRIES
+        self._memory = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()  # Memory tier and counters
+        self._disk_lock = threading.Lock()  # SQLite connection and pending access times
+        self._touched = {}  # key -> accessed_at not yet written
+        self._touched_since = time.monotonic()
+        self._writes = 0
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self._conn = self._connect()
+
+    def _connect(self):
+        """Open the SQLite tier, falling back to memory-only caching if the path is unusable."""
+        if not self.path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache disk tier unavailable at {self.path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, max_tokens: int, response_format: str = "") -> str:
+        """Hash everything that influences the completion into a stable cache key."""
+        fields = [model, system_prompt, prompt, max_tokens] + ([response_format] if response_format else [])
+        payload = json.dumps(fields, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    return entry[1]
+                del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look key up in the SQLite tier, promoting a hit to memory; counts the miss otherwise."""
+        if self._conn is not None:
+            with self._disk_lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    row = None
+                if row is not None:
+                    self._touch(key, now)
+            if row is not None:
+                value, created_at = row
+                with self._lock:
+                    self._remember(key, created_at, value)
+                    self.hits_disk += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached completion, or None on a miss or expired entry."""
+        now = time.time()
+        value = self._get_memory(key, now)
+        return value if value is not None else self._get_disk(key, now)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for coroutines: memory hits return inline, the disk lookup runs in a thread."""
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None:
+            return value
+        if self._conn is None:
+            return self._get_disk(key, now)
+        return await asyncio.to_thread(self._get_disk, key, now)
+
+    def _touch(self, key: str, now: float):
+        """Buffer a disk hit's access time, flushing the buffer when it is full or old; must hold _disk_lock."""
+        self._touched[key] = now
+        if len(self._touched) >= self.TOUCH_BATCH or time.monotonic() - self._touched_since >= self.TOUCH_INTERVAL:
+            self._flush_touched()
+
+    def _flush_touched(self):
+        """Write buffered access times in one transaction; must hold _disk_lock."""
+        if self._touched:
+            self._conn.executemany( # type: ignore
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._conn.commit() # type: ignore
+            self._touched = {}
+        self._touched_since = time.monotonic()
+
+    def _set_disk(self, key: str, value: str, now: float):
+        if self._conn is None:
+            return
+        with self._disk_lock:
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def set(self, key: str, value: str):
+        """Store a completion in both tiers, evicting the least recently used entries when full."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+        self._set_disk(key, value, now)
+
+    async def aset(self, key: str, value: str):
+        """set() for coroutines; the SQLite write runs in a thread."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+        if self._conn is not None:
+            await asyncio.to_thread(self._set_disk, key, value, now)
+
+    def _remember(self, key: str, created_at: float, value: str):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self, now: float):
+        """Drop expired rows and trim the disk tier to its size bound; must hold _disk_lock."""
+        self._flush_touched()  # So recently read entries aren't evicted as stale
+        if self.ttl > 0:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)) # type: ignore
+        self._conn.execute( # type: ignore
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+        self._conn.commit() # type: ignore
+
+    def clear(self):
+        """Remove every cached completion from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._touched = {}
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    async def astats(self) -> dict:
+        """stats() for coroutines; the disk-tier row count runs in a thread."""
+        return await asyncio.to_thread(self.stats)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and tier sizes."""
+        disk_entries = 0
+        if self._conn is not None:
+            with self._disk_lock:
+                disk_entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        with self._lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries
+            }
@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+from app.config import Config
+from app.services.metrics import LLM_CONCURRENCY, LLM_HEDGES, LLM_RETRIES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+class LLMUnavailableError(RuntimeError):
+    """Groq stayed throttled or unreachable after the retry budget; retry_after is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit shared by sync threads and asyncio tasks.
+
+    Each window of `limit` successful calls raises the limit by one, unless the window's median
+    latency exceeds latency_tolerance times the best median seen recently, in which case it
+    shrinks by 10%. A 429 or timeout halves it. Waiters are served in arrival order.
+    """
+
+    def __init__(self, initial: int = None, min_limit: int = None, max_limit: int = None, latency_tolerance: float = None): # type: ignore
+        self.min_limit = min_limit or Config.LLM_CONCURRENCY_MIN
+        self.max_limit = max_limit or Config.LLM_CONCURRENCY_MAX
+        self.limit = float(min(max(initial or Config.LLM_CONCURRENCY_INITIAL, self.min_limit), self.max_limit))
+        self.latency_tolerance = latency_tolerance or Config.LLM_LATENCY_TOLERANCE
+        self.inflight = 0
+        self.baseline = None
+        self._window = []
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self._publish()
+
+    def _capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _publish(self):
+        LLM_CONCURRENCY.set(int(self.limit), kind="limit")
+        LLM_CONCURRENCY.set(self.inflight, kind="inflight")
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now."""
+        with self._lock:
+            if self._waiters or self.inflight >= self._capacity():
+                return False
+            self.inflight += 1
+            self._publish()
+            return True
+
+    async def acquire(self):
+        with self._lock:
+            if not self._waiters and self.inflight < self._capacity():
+                self.inflight += 1
+                self._publish()
+                return
+            waiter = (asyncio.get_running_loop(), asyncio.get_running_loop().create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over just as we were cancelled
+            self.release()
+            raise
+
+    def acquire_sync(self):
+        with self._lock:
+            if not self._waiters and self.inflight < self._capacity():
+                self.inflight += 1
+                self._publish()
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        waiter.wait()
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+            self._wake()
+
+    def _wake(self):
+        """Hand free slots to waiters in order; must hold the lock."""
+        while self._waiters and self.inflight < self._capacity():
+            waiter = self._waiters.popleft()
+            self.inflight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(lambda future=future: future.done() or future.set_result(None))
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self, latency: float):
+        with self._lock:
+            self._window.append(latency)
+            if len(self._window) < max(self._capacity(), 5):
+                return
+            window = sorted(self._window)
+            self._window = []
+            median = window[len(window) // 2]
+            # The baseline follows the best median seen, drifting up slowly if Groq genuinely slows down
+            self.baseline = median if self.baseline is None else min(self.baseline * 1.05, median)
+            if median > self.baseline * self.latency_tolerance:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1)
+            self._wake()
+
+    def on_overload(self):
+        with self._lock:
+            self.limit = max(self.min_limit, self.limit / 2)
+            self._window = []
+            self._publish()
+
+class LatencyTracker:
+    """Recent successful call latencies, for the hedging threshold."""
+
+    def __init__(self, size: int = 500):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Parse Retry-After (seconds or HTTP date) or retry-after-ms from an API error's response."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def classify(error: Exception) -> Optional[str]:
+    """Retry reason for a retryable Groq error ("rate_limited", "timeout", "connection", "server"), else None."""
+    import groq
+    if isinstance(error, groq.APITimeoutError):
+        return "timeout"
+    if isinstance(error, groq.APIConnectionError):
+        return "connection"
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return "rate_limited"
+    if status in RETRYABLE_STATUS:
+        return "server"
+    return None
+
+class LLMScheduler:
+    """Admission control, retries and hedging around Groq calls.
+
+    Calls wait for a slot under the AdaptiveLimiter. Rate limits, timeouts, connection errors
+    and 5xx responses are retried with full-jitter exponential backoff, never sooner than the
+    server's Retry-After. With LLM_HEDGE_ENABLED, an async call still running past the
+    LLM_HEDGE_PERCENTILE latency gets a duplicate request if a slot is free; the first answer wins.
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter = None, max_retries: int = None, hedge: bool = None): # type: ignore
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_retries = max_retries if max_retries is not None else Config.LLM_MAX_RETRIES
+        self.hedge = hedge if hedge is not None else Config.LLM_HEDGE_ENABLED
+        self.latencies = LatencyTracker()
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the next attempt; raises LLMUnavailableError when out of budget."""
+        retry_after = retry_after_seconds(error)
+        if attempt >= self.max_retries or (retry_after or 0.0) > Config.LLM_RETRY_AFTER_MAX_SECONDS:
+            raise LLMUnavailableError(f"Groq unavailable after {attempt + 1} attempts: {str(error)}", retry_after) from error
+        ceiling = min(Config.LLM_BACKOFF_MAX_MS, Config.LLM_BACKOFF_BASE_MS * 2 ** attempt) / 1000.0
+        delay = random.uniform(0, ceiling)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _record(self, started: float, error: Exception = None, sample: bool = True): # type: ignore
+        """Feed an attempt's outcome to the limiter; sample=False keeps its latency out of the window."""
+        if error is None:
+            if sample:
+                latency = time.perf_counter() - started
+                self.latencies.add(latency)
+                self.limiter.on_success(latency)
+        elif classify(error) in ("rate_limited", "timeout"):
+            self.limiter.on_overload()
+
+    async def _attempt(self, request: Callable[[], Awaitable], limited: bool, acquired: bool = False):
+        if limited and not acquired:
+            await self.limiter.acquire()
+        started = time.perf_counter()
+        try:
+            result = await request()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record(started, e)
+            raise
+        finally:
+            if limited:
+                self.limiter.release()
+        # Unlimited calls (opening a stream) finish at the first byte, so their latency isn't comparable
+        self._record(started, sample=limited)
+        return result
+
+    async def _hedged(self, request: Callable[[], Awaitable], limited: bool):
+        primary = asyncio.ensure_future(self._attempt(request, limited))
+        if len(self.latencies) < Config.LLM_HEDGE_MIN_SAMPLES:
+            return await primary
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.latencies.percentile(Config.LLM_HEDGE_PERCENTILE))
+            # Don't add load when the limiter is saturated
+            if done or (limited and not self.limiter.try_acquire()):
+                return await primary
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        hedge = asyncio.ensure_future(self._attempt(request, limited, acquired=True))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        LLM_HEDGES.inc(winner="hedge" if task is hedge else "primary")
+                        return task.result()
+            raise primary.exception() # type: ignore
+        finally:
+            for task in (primary, hedge):
+                task.cancel()
+
+    async def call(self, request: Callable[[], Awaitable], hedge: bool = False, limited: bool = True):
+        """Await request() under the concurrency limit with retries; hedge applies to idempotent calls only.
+
+        limited=False skips admission for callers that already hold a slot (e.g. a stream).
+        """
+        attempt = 0
+        while True:
+            try:
+                if hedge and self.hedge:
+                    return await self._hedged(request, limited)
+                return await self._attempt(request, limited)
+            except Exception as e:
+                reason = classify(e)
+                if reason is None:
+                    raise
+                delay = self._backoff(attempt, e)
+                LLM_RETRIES.inc(reason=reason)
+                logger.warning(f"Groq call failed ({reason}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def call_sync(self, request: Callable):
+        """Blocking variant of call() for threads; never hedged."""
+        attempt = 0
+        while True:
+            self.limiter.acquire_sync()
+            started = time.perf_counter()
+            try:
+                result = request()
+            except Exception as e:
+                self.limiter.release()
+                self._record(started, e)
+                reason = classify(e)
+                if reason is None:
+                    raise
+                delay = self._backoff(attempt, e)
+                LLM_RETRIES.inc(reason=reason)
+                logger.warning(f"Groq call failed ({reason}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.release()
+            self._record(started)
+            return result
@@ -18,21 +18,108 @@
 #         return response.choices[0].message.content
 
 
-from groq import Groq
+from typing import AsyncIterator
 from app.config import Config
+from app.services.llm_cache import LLMCache
+from app.services.llm_scheduler import LLMScheduler
+from app.services.metrics import LLM_CALLS, record_usage, timed
+
+SYSTEM_PROMPT = "You are a skill recommendation assistant."
 
 class LLMService:
     def __init__(self):
-        self.client = Groq(api_key=Config.GROQ_API_KEY)
-
-    def generate(self, prompt: str) -> str:
-        """Generate text using Groq's LLM."""
-        response = self.client.chat.completions.create(
-            model=Config.GROQ_MODEL,  # Use grok-llama-3.3-70b-versatile
-            messages=[
-                {"role": "system", "content": "You are a skill recommendation assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=500
-        )
-        return response.choices[0].message.content # type: ignore
\ No newline at end of file
+        from groq import AsyncGroq, Groq  # Deferred with the rest of the engine's start-up cost
+        # Retries are owned by the scheduler, which also paces them against the concurrency limit
+        self.client = Groq(api_key=Config.GROQ_API_KEY, timeout=Config.LLM_TIMEOUT_SECONDS, max_retries=0)
+        self.async_client = AsyncGroq(api_key=Config.GROQ_API_KEY, timeout=Config.LLM_TIMEOUT_SECONDS, max_retries=0)
+        self.cache = LLMCache() if Config.LLM_CACHE_ENABLED else None
+        self.scheduler = LLMScheduler()
+
+    def _messages(self, prompt: str) -> list:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _cache_key(self, prompt: str, max_tokens: int, json_mode: bool = False) -> str:
+        return LLMCache.make_key(Config.GROQ_MODEL, SYSTEM_PROMPT, prompt, max_tokens, "json_object" if json_mode else "")
+
+    def generate(self, prompt: str, max_tokens: int = 500, use_cache: bool = True) -> str:
+        """Generate text using Groq's LLM, serving byte-identical prompts from the cache."""
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = self._cache_key(prompt, max_tokens)
+            cached = self.cache.get(key) # type: ignore
+            if cached is not None:
+                LLM_CALLS.inc(method="generate", cache="hit")
+                return cached
+        LLM_CALLS.inc(method="generate", cache="miss")
+        with timed("llm_generate"):
+            response = self.scheduler.call_sync(lambda: self.client.chat.completions.create(
+                model=Config.GROQ_MODEL,  # Use grok-llama-3.3-70b-versatile
+                messages=self._messages(prompt), # type: ignore
+                max_tokens=max_tokens
+            ))
+        record_usage("generate", response.usage)
+        content = response.choices[0].message.content
+        if use_cache and content:
+            self.cache.set(key, content) # type: ignore
+        return content # type: ignore
+
+    async def agenerate(self, prompt: str, max_tokens: int = 500, use_cache: bool = True, json_mode: bool = False) -> str:
+        """Generate text using Groq's LLM without blocking the event loop.
+
+        json_mode asks Groq for a syntactically valid JSON object; the prompt must mention JSON.
+        """
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = self._cache_key(prompt, max_tokens, json_mode)
+            cached = await self.cache.aget(key) # type: ignore
+            if cached is not None:
+                LLM_CALLS.inc(method="agenerate", cache="hit")
+                return cached
+        LLM_CALLS.inc(method="agenerate", cache="miss")
+        with timed("llm_generate"):
+            response = await self.scheduler.call(lambda: self.async_client.chat.completions.create(
+                model=Config.GROQ_MODEL,
+                messages=self._messages(prompt), # type: ignore
+                max_tokens=max_tokens,
+                **({"response_format": {"type": "json_object"}} if json_mode else {})
+            ), hedge=True)
+        record_usage("agenerate", response.usage)
+        content = response.choices[0].message.content
+        if use_cache and content:
+            await self.cache.aset(key, content) # type: ignore
+        return content # type: ignore
+
+    async def astream(self, prompt: str, max_tokens: int = 500, use_cache: bool = True) -> AsyncIterator[str]:
+        """Stream completion text deltas as Groq produces them; cache hits arrive as a single delta."""
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            key = self._cache_key(prompt, max_tokens)
+            cached = await self.cache.aget(key) # type: ignore
+            if cached is not None:
+                LLM_CALLS.inc(method="astream", cache="hit")
+                yield cached
+                return
+        LLM_CALLS.inc(method="astream", cache="miss")
+        # The stream holds its concurrency slot until the last chunk; only opening it is retried
+        async with self.scheduler.limiter.slot():
+            with timed("llm_stream"):
+                stream = await self.scheduler.call(lambda: self.async_client.chat.completions.create(
+                    model=Config.GROQ_MODEL,
+                    messages=self._messages(prompt), # type: ignore
+                    max_tokens=max_tokens,
+                    stream=True
+                ), limited=False)
+                parts = []
+                async for chunk in stream: # type: ignore
+                    # Groq reports usage on the final chunk under x_groq
+                    x_groq = getattr(chunk, "x_groq", None)
+                    record_usage("astream", getattr(chunk, "usage", None) or getattr(x_groq, "usage", None))
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        if use_cache and parts:
+            await self.cache.aset(key, "".join(parts)) # type: ignore
@@ -0,0 +1,212 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds, from sub-millisecond lookups up to slow LLM round trips
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels[name] for name in self.labelnames), 0.0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Gauge:
+    """Point-in-time value with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[tuple(labels[name] for name in self.labelnames)] = value
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(labels[name] for name in self.labelnames), 0.0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(tuple(labels[name] for name in self.labelnames))
+            return series[2] if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+STAGE_SECONDS = Histogram(
+    "skill_stage_duration_seconds",
+    "Wall-clock time spent in each recommendation pipeline stage.",
+    ("stage",)
+)
+LLM_TOKENS = Counter(
+    "skill_llm_tokens_total",
+    "Groq token usage reported on completions, by call method and token type.",
+    ("method", "type")
+)
+LLM_CALLS = Counter(
+    "skill_llm_calls_total",
+    "LLM calls by method and whether they were served from the response cache.",
+    ("method", "cache")
+)
+JSON_PARSE = Counter(
+    "skill_json_parse_total",
+    "Parses of LLM JSON output by call site and outcome (ok or fallback).",
+    ("site", "outcome")
+)
+LLM_RETRIES = Counter(
+    "skill_llm_retries_total",
+    "Groq attempts retried after a retryable failure, by reason.",
+    ("reason",)
+)
+LLM_HEDGES = Counter(
+    "skill_llm_hedges_total",
+    "Hedged duplicate Groq requests, by which attempt answered first.",
+    ("winner",)
+)
+LLM_CONCURRENCY = Gauge(
+    "skill_llm_concurrency",
+    "Adaptive Groq concurrency limit and current in-flight requests.",
+    ("kind",)
+)
+REGISTRY = [STAGE_SECONDS, LLM_TOKENS, LLM_CALLS, JSON_PARSE, LLM_RETRIES, LLM_HEDGES, LLM_CONCURRENCY]
+
+def render_metrics() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+class RequestTiming:
+    """Per-request accumulation of stage durations, for the Server-Timing response header."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # stage -> [total seconds, calls]
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def header(self) -> str:
+        """Server-Timing value; stages that ran concurrently can sum to more than the total."""
+        with self._lock:
+            parts = [
+                f'{stage};dur={seconds * 1000:.1f};desc="{calls} calls"'
+                for stage, (seconds, calls) in self.stages.items()
+            ]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+_request_timing = contextvars.ContextVar("request_timing", default=None)
+
+def start_request_timing() -> RequestTiming:
+    """Collect spans recorded in this context (and the tasks and threads it spawns) into a new RequestTiming."""
+    timing = RequestTiming()
+    _request_timing.set(timing)
+    return timing
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(stage, seconds)
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of the with-block under stage, whether or not it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+def record_usage(method: str, usage):
+    """Add a completion's prompt and completion token counts, if the response reported any."""
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.inc(tokens, method=method, type=kind)
@@ -1,29 +1,216 @@
-import chromadb
-from sentence_transformers import SentenceTransformer
+import hashlib
+import logging
+import time
+import numpy as np
 from app.config import Config
+from app.services.embedding_cache import EmbeddingCache
+from app.services.encoder import load_encoder
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_server import EmbeddingClient
+from app.services.metrics import timed
+from app.data.numpy_index import NumpyIndex
+from app.data.lexical_index import LexicalIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 class RAGService:
-    def __init__(self):
-        self.client = chromadb.PersistentClient(path=Config.CHROMA_DB_PATH)
-        self.collection = self.client.get_or_create_collection(name="skills")
-        self.encoder = SentenceTransformer("all-MiniLM-L6-v2")
+    def __init__(self, use_server: bool = True):
+        """With EMBEDDING_SERVER_SOCKET set (and use_server), encoding is delegated to the shared
+        embedding server, and with EMBEDDING_SERVER_QUERY so are vector and lexical queries; this
+        process then loads neither the encoder nor the vector store.
+        """
+        self.server = EmbeddingClient() if use_server and Config.EMBEDDING_SERVER_SOCKET else None
+        remote_query = self.server is not None and Config.EMBEDDING_SERVER_QUERY
+        self.client = self.collection = None
+        if not remote_query:
+            import chromadb  # Deferred: importing chromadb adds over a second to process start-up
+            self.client = chromadb.PersistentClient(path=Config.CHROMA_DB_PATH)
+            self.collection = self.client.get_or_create_collection(name="skills")
+        self.encoder = self.encoder_id = self.embedding_cache = self.batcher = None
+        if self.server is None:
+            self.encoder, self.encoder_id = load_encoder()
+            self.embedding_cache = (
+                EmbeddingCache(self.encoder_id, self.encoder.get_sentence_embedding_dimension()) # type: ignore
+                if Config.EMBEDDING_CACHE_ENABLED else None
+            )
+            self.batcher = EmbeddingBatcher(self._encode_model) if Config.EMBEDDING_BATCH_ENABLED else None
+        self.index = NumpyIndex() if Config.VECTOR_BACKEND == "numpy" and not remote_query else None
+        self.lexical_index = LexicalIndex() if Config.HYBRID_SEARCH_ENABLED and not remote_query else None
+
+    def warmup(self):
+        """Run a dummy encode and query so the first real request doesn't pay for lazy initialisation."""
+        if self.server is not None:
+            info = self.server.wait_ready()
+            logger.info(f"Using embedding server at {self.server.socket_path} ({info.get('encoder_id')})")
+            if self.collection is None:
+                return
+        embedding = self.encode(["warmup"])[0]
+        if self.index is not None:
+            for framework in self.index.partitions:
+                self.index.query(embedding, framework, n_results=1)
+        elif self.collection.count() > 0: # type: ignore
+            self.collection.query(query_embeddings=[embedding.tolist()], n_results=1) # type: ignore
+
+    def _encode_model(self, texts: list) -> np.ndarray:
+        return np.asarray(self.encoder.encode(texts), dtype=np.float32)
+
+    def _run_encoder(self, texts: list) -> np.ndarray:
+        """Run the model on texts, through the micro-batcher when enabled."""
+        if self.batcher is None:
+            return self._encode_model(texts)
+        return self.batcher.encode(texts)
 
-    def query(self, query_text: str, framework: str, n_results: int = 5):
+    def encode(self, texts: list) -> np.ndarray:
+        """Encode texts to float32 vectors, only running the model for texts not already cached."""
+        with timed("encode"):
+            if self.server is not None:
+                return self.server.encode(texts)
+            return self._encode_cached(texts)
+
+    def _encode_cached(self, texts: list) -> np.ndarray:
+        if self.embedding_cache is None:
+            return self._run_encoder(texts)
+        cached = self.embedding_cache.get_many(texts)
+        misses = [i for i, vector in enumerate(cached) if vector is None]
+        if misses:
+            miss_texts = list(dict.fromkeys(texts[i] for i in misses))
+            started = time.perf_counter()
+            encoded = self._run_encoder(miss_texts)
+            self.embedding_cache.put_many(miss_texts, encoded, time.perf_counter() - started)
+            by_text = dict(zip(miss_texts, encoded))
+            for i in misses:
+                cached[i] = by_text[texts[i]]
+        return np.stack(cached) if cached else np.zeros((0, self.embedding_cache.dim), dtype=np.float32)
+
+    def query(self, query_text: str, framework: str, n_results: int = 5, exact_text: str = None): # type: ignore
         """Query the vector database for relevant skills."""
-        query_embedding = self.encoder.encode(query_text).tolist()
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where={"framework": framework}
-        )
-        return results["metadatas"][0] if results["metadatas"] else []
-
-    def add_documents(self, documents: list, metadatas: list):
-        """Add documents to the vector database."""
-        embeddings = self.encoder.encode([doc["text"] for doc in documents]).tolist()
-        self.collection.add(
-            documents=[doc["text"] for doc in documents],
-            embeddings=embeddings,
-            metadatas=metadatas,
-            ids=[f"doc_{i}" for i in range(len(documents))]
-        )
\ No newline at end of file
+        return self.query_batch([query_text], framework, n_results, [exact_text] if exact_text else None)[0]
+
+    def query_batch(self, query_texts: list, framework: str, n_results: int = 5, exact_texts: list = None) -> list: # type: ignore
+        """Query several texts against one framework with a single encode and search call.
+
+        With hybrid search enabled, a query that is itself an exact skill name is answered from the
+        lexical index without encoding; the others fuse BM25 and vector hits by reciprocal rank.
+        exact_texts gives a bare-name probe per query for callers that wrap it (e.g. the job title)
+        in a longer template; a probe hit is fused in with the dense and BM25 rankings rather than
+        replacing them, since the template carries context the bare name does not.
+        """
+        if self.server is not None and self.collection is None:
+            with timed("remote_query"):
+                return self.server.query_batch(query_texts, framework, n_results, exact_texts)
+        if self.lexical_index is None:
+            return self._dense_query_batch(query_texts, framework, n_results)
+        results = [None] * len(query_texts)
+        probe_hits = {}
+        dense_positions = []
+        with timed("lexical_search"):
+            for i, text in enumerate(query_texts):
+                probe = exact_texts[i] if exact_texts and exact_texts[i] else text
+                exact = self.lexical_index.exact(probe, framework)
+                if exact and probe == text:
+                    results[i] = self._fuse([exact, self.lexical_index.search(text, framework, n_results)], n_results)
+                else:
+                    if exact:
+                        probe_hits[i] = exact
+                    dense_positions.append(i)
+        if dense_positions:
+            dense_texts = [query_texts[i] for i in dense_positions]
+            dense_results = self._dense_query_batch(dense_texts, framework, n_results)
+            with timed("lexical_search"):
+                for i, text, dense in zip(dense_positions, dense_texts, dense_results):
+                    rankings = [dense, self.lexical_index.search(text, framework, n_results)]
+                    results[i] = self._fuse([probe_hits[i]] + rankings if i in probe_hits else rankings, n_results)
+        return results
+
+    def _dense_query_batch(self, query_texts: list, framework: str, n_results: int) -> list:
+        embeddings = self.encode(query_texts)
+        with timed("vector_search"):
+            if self.index is not None:
+                return self.index.query_batch(embeddings, framework, n_results)
+            results = self.collection.query(
+                query_embeddings=embeddings.tolist(),
+                n_results=n_results,
+                where={"framework": framework}
+            )
+        return results["metadatas"] if results["metadatas"] else [[] for _ in query_texts]
+
+    @staticmethod
+    def _fuse(rankings: list, n_results: int) -> list:
+        """Reciprocal-rank fusion of several ranked metadata lists, keyed by element id."""
+        scores, metadatas = {}, {}
+        for ranking in rankings:
+            for rank, meta in enumerate(ranking):
+                key = meta.get("element_id") or meta.get("skill") or id(meta)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (Config.RRF_K + rank + 1)
+                metadatas.setdefault(key, meta)
+        ranked = sorted(scores, key=scores.get, reverse=True) # type: ignore
+        return [metadatas[key] for key in ranked[:n_results]]
+
+    def add_documents(self, documents: list, metadatas: list, ids: list = None, batch_size: int = None): # type: ignore
+        """Upsert documents into the vector database, encoding and writing one fixed-size batch at a time.
+
+        Writes are upserts keyed by id, so re-running an interrupted ingestion is safe.
+        """
+        if ids is None:
+            ids = [hashlib.sha1(doc["text"].encode("utf-8")).hexdigest() for doc in documents]
+        batch_size = min(batch_size or Config.INGEST_BATCH_SIZE, self.client.get_max_batch_size())
+        for start in range(0, len(documents), batch_size):
+            texts = [doc["text"] for doc in documents[start:start + batch_size]]
+            embeddings = self.encode(texts)
+            self.collection.upsert(
+                documents=texts,
+                embeddings=embeddings.tolist(),
+                metadatas=metadatas[start:start + batch_size],
+                ids=ids[start:start + batch_size]
+            )
+
+    def get_content_hashes(self, framework: str, page_size: int = 5000) -> dict:
+        """Return {id: content_hash} for every stored record of a framework (None for legacy records)."""
+        hashes = {}
+        offset = 0
+        while True:
+            page = self.collection.get(
+                where={"framework": framework},
+                include=["metadatas"],
+                limit=page_size,
+                offset=offset
+            )
+            for doc_id, meta in zip(page["ids"], page["metadatas"] or []):
+                hashes[doc_id] = (meta or {}).get("content_hash")
+            if len(page["ids"]) < page_size:
+                return hashes
+            offset += page_size
+
+    def delete_documents(self, ids: list, batch_size: int = None): # type: ignore
+        """Delete documents by id in batches."""
+        batch_size = min(batch_size or Config.INGEST_BATCH_SIZE, self.client.get_max_batch_size())
+        for start in range(0, len(ids), batch_size):
+            self.collection.delete(ids=ids[start:start + batch_size])
+
+    def export_index(self, frameworks: list, page_size: int = 5000):
+        """Snapshot the collection into per-framework NumPy and lexical index partitions."""
+        for framework in frameworks:
+            ids, embeddings, documents, metadatas = [], [], [], []
+            offset = 0
+            while True:
+                page = self.collection.get(
+                    where={"framework": framework},
+                    include=["embeddings", "documents", "metadatas"],
+                    limit=page_size,
+                    offset=offset
+                )
+                ids.extend(page["ids"])
+                embeddings.extend(page["embeddings"]) # type: ignore
+                documents.extend(page["documents"]) # type: ignore
+                metadatas.extend(page["metadatas"]) # type: ignore
+                if len(page["ids"]) < page_size:
+                    break
+                offset += page_size
+            if ids:
+                NumpyIndex.write_partition(Config.NUMPY_INDEX_PATH, framework, ids, np.asarray(embeddings), metadatas)
+                LexicalIndex.write_partition(Config.LEXICAL_INDEX_PATH, framework, ids, documents, metadatas)
+        if self.index is not None:
+            self.index.load()
+        if self.lexical_index is not None:
+            self.lexical_index.load()
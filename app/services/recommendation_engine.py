@@ -1,115 +1,104 @@
+from app.config import Config
 from app.core.job_normalizer import JobNormalizer
+from app.core.skill_categorizer import SkillCategorizer
 from app.services.rag_service import RAGService
 from app.services.llm_service import LLMService
-from app.api.models import SkillRecommendationResponse, Skill, FrameworkSkills
+from app.services.metrics import JSON_PARSE, timed
+from app.data.occupation_profiles import OccupationProfiles
+from app.data.skill_graph import SkillGraph
+from app.api.models import SkillRecommendationResponse, Skill, FrameworkSkills, GeneratedRecommendation
+from pydantic import ValidationError
+from typing import AsyncIterator, Optional
+import asyncio
 import json
 import logging
+import re
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FRAMEWORKS = ["O*NET", "ESCO"]
+RAG_RESULTS = 12
+
+# Map domain to country for framework selection
+DOMAIN_TO_COUNTRY = {
+    "USA": "USA",
+    "US": "USA",
+    "United States": "USA",
+    "EU": "EU",
+    "Europe": "EU",
+    "European Union": "EU",
+    "India": "India",
+    "Singapore": "Singapore",
+    "Australia": "Australia",
+    "Canada": "Canada",
+    "UK": "UK",
+    "United Kingdom": "UK"
+}
+_COUNTRY_BY_ALIAS = {" ".join(alias.split()).casefold(): country for alias, country in DOMAIN_TO_COUNTRY.items()}
+
+def country_for_domain(domain: str) -> str:
+    """Map a domain to its country, ignoring case and extra whitespace; unknown domains map to themselves."""
+    return _COUNTRY_BY_ALIAS.get(" ".join(domain.split()).casefold(), domain)
+
 class RecommendationEngine:
     def __init__(self):
         self.normalizer = JobNormalizer()
         self.rag_service = RAGService()
         self.llm_service = LLMService()
+        # One categorizer per process, so its memo and local classifier serve every request
+        self.categorizer = SkillCategorizer(self.llm_service, self.rag_service)
+        self.profiles = OccupationProfiles.load()
+        self.skill_graph = SkillGraph.load()
+
+    def warmup(self):
+        """Load the embedding model and vector collection ahead of the first request."""
+        self.rag_service.warmup()
+        logger.info("Warmed up RAG service")
 
     def get_recommendations(self, role: str, domain: str, industry: str): # type: ignore
-        """Generate skill recommendations using O*NET and ESCO, with LLM-assigned per-skill proficiencies."""
-        frameworks = ["O*NET", "ESCO"]
-        framework_skills = []
-        
-        # Map domain to country for framework selection
-        domain_to_country = {
-            "USA": "USA",
-            "US": "USA",
-            "United States": "USA",
-            "EU": "EU",
-            "Europe": "EU",
-            "European Union": "EU",
-            "India": "India",
-            "Singapore": "Singapore",
-            "Australia": "Australia",
-            "Canada": "Canada",
-            "UK": "UK",
-            "United Kingdom": "UK"
-        }
-        country = domain_to_country.get(domain, domain)
+        """Synchronous wrapper around aget_recommendations for scripts and tests."""
+        return asyncio.run(self.aget_recommendations(role, domain, industry))
+
+    async def aprefetch(self, jobs: list) -> dict:
+        """Run retrieval for many (role, industry) pairs with one batched encode and search per framework.
+
+        The returned mapping can be passed to aget_recommendations(prefetched=...) so batch items
+        skip their own encode and vector query.
+        """
+        prefetched = {}
+        for framework in FRAMEWORKS:
+            queries = {}  # query -> bare role, the exact skill-name probe
+            for role, industry in jobs:
+                with timed("normalize"):
+                    code = self.normalizer.occupation_code(role, framework)
+                if not self._profile_candidates(framework, code):
+                    queries.setdefault(self._build_query(framework, code or role.lower().strip(), role, industry), role)
+            if not queries:
+                continue
+            results = await asyncio.to_thread(
+                self.rag_service.query_batch, list(queries), framework, RAG_RESULTS, list(queries.values())
+            )
+            prefetched.update({(framework, query): result for query, result in zip(queries, results)})
+        logger.info(f"Prefetched retrieval for {len(jobs)} jobs")
+        return prefetched
+
+    async def aget_recommendations(self, role: str, domain: str, industry: str, prefetched: dict = None): # type: ignore
+        """Generate skill recommendations using O*NET and ESCO, with LLM-assigned per-skill proficiencies.
+
+        The job description and each framework branch run concurrently, so wall-clock time
+        tracks the slowest branch rather than the sum of all LLM round trips.
+        """
+        country = country_for_domain(domain)
         logger.info(f"Processing recommendations for role: {role}, domain: {domain}, industry: {industry}")
-        
-        # Generate job description based on role, domain, and industry
-        job_description_prompt = (
-            f"Provide a detailed and professional job description for a {role} position in the {industry} industry, "
-            f"specifically for the {domain} region/market. Include key responsibilities, typical work environment, "
-            f"and what makes this role important in the {industry} sector. Keep it concise (3-4 sentences)."
-        )
-        job_description = self.llm_service.generate(job_description_prompt)
-        logger.info(f"Generated job description for {role} in {industry}")
 
-        for framework in frameworks:
-            # Normalize job title
-            normalized_title = self.normalizer.normalize(role, framework)
-            logger.info(f"Normalized job title for {framework}: {role} -> {normalized_title}")
-
-            # Get candidate skills from RAG
-            query = f"Skills for {normalized_title} {role} role in {industry} industry in {framework}"
-            rag_results = self.rag_service.query(query, framework, n_results=12)
-            candidate_skills = [meta.get("skill", meta.get("name", "")) for meta in rag_results if "skill" in meta or "name" in meta]
-            logger.info(f"RAG candidates for {framework}: {len(candidate_skills)} skills")
-
-            # If insufficient RAG results, supplement with LLM-generated candidates
-            if len(candidate_skills) < 6:
-                logger.info(f"Supplementing RAG with LLM for {framework}")
-                base_prompt = (
-                    f"List 8-10 candidate skills for a {role} role in {industry} industry using {framework}. "
-                    "Focus on core hard and soft skills. Output comma-separated names only."
-                )
-                llm_candidates_str = self.llm_service.generate(base_prompt)
-                llm_candidates = self._parse_llm_skills(llm_candidates_str)
-                candidate_skills.extend(llm_candidates)
-                candidate_skills = list(set(candidate_skills))[:12]  # Dedupe and limit
-
-            # LLM prompt for categorization and per-skill proficiency assignment
-            skills_list_str = ", ".join(candidate_skills) # type: ignore
-            llm_prompt = (
-                f"For a {role} role in {industry} industry, take these {framework} candidate skills: {skills_list_str}. "
-                "Categorize into hard (technical) and soft (interpersonal) skills. "
-                "Assign realistic proficiency levels (Beginner, Intermediate, Advanced, Expert) per skill based on typical role requirements in the industry. "
-                f"Consider the specific demands of {industry} industry for this {role} position. "
-                "Limit to 8-10 hard and 2-4 soft. Output ONLY valid JSON: "
-                "{{\"hard_skills\": [{\"name\": \"Skill Name\", \"proficiency\": \"Level\"}, ...], "
-                "\"soft_skills\": [{\"name\": \"Skill Name\", \"proficiency\": \"Level\"}, ...]}}"
+        if Config.LLM_CONSOLIDATED_ENABLED:
+            job_description, framework_skills = await self._consolidated_recommendations(role, domain, industry, prefetched)
+        else:
+            job_description, *framework_skills = await asyncio.gather(
+                self._generate_job_description(role, domain, industry),
+                *(self._get_framework_skills(framework, role, industry, prefetched) for framework in FRAMEWORKS)
             )
-            llm_response = self.llm_service.generate(llm_prompt)
-            
-            # Parse JSON from LLM response
-            try:
-                parsed = json.loads(llm_response.strip())
-                hard_skills_data = parsed.get("hard_skills", [])
-                soft_skills_data = parsed.get("soft_skills", [])
-                logger.info(f"Parsed {len(hard_skills_data)} hard and {len(soft_skills_data)} soft skills for {framework}")
-            except json.JSONDecodeError:
-                logger.warning(f"JSON parse failed for {framework}, using fallback")
-                # Fallback: simple list without category/proficiency (rare)
-                fallback_skills = [{"name": skill, "proficiency": "Intermediate"} for skill in candidate_skills[:8]]
-                hard_skills_data = fallback_skills[:6]  # Assume first as hard
-                soft_skills_data = fallback_skills[6:] if len(fallback_skills) > 6 else []
-
-            # Convert to Pydantic models with category
-            hard_skills_models = [
-                Skill(name=skill["name"], category="Hard", proficiency=skill.get("proficiency", "Intermediate"))
-                for skill in hard_skills_data
-            ]
-            soft_skills_models = [
-                Skill(name=skill["name"], category="Soft", proficiency=skill.get("proficiency", "Intermediate"))
-                for skill in soft_skills_data
-            ]
-
-            framework_skills.append(FrameworkSkills(
-                framework=framework,
-                hard_skills=hard_skills_models,
-                soft_skills=soft_skills_models
-            ))
 
         return SkillRecommendationResponse(
             role=role,
@@ -120,6 +109,264 @@ class RecommendationEngine:
             skills=framework_skills
         )
 
+    async def astream_recommendations(self, role: str, domain: str, industry: str) -> AsyncIterator[tuple]:
+        """Yield (event, payload) pairs as partial results become available.
+
+        Emits "job_description_delta" ({"delta": str}) for each streamed description token,
+        "framework" (FrameworkSkills) as soon as a framework branch is parsed, and finally
+        "complete" (SkillRecommendationResponse).
+        """
+        queue = asyncio.Queue()
+
+        async def describe() -> str:
+            parts = []
+            async for delta in self.llm_service.astream(self._job_description_prompt(role, domain, industry)):
+                parts.append(delta)
+                await queue.put(("job_description_delta", {"delta": delta}))
+            return "".join(parts)
+
+        async def framework_branch(framework: str) -> FrameworkSkills:
+            skills = await self._get_framework_skills(framework, role, industry)
+            await queue.put(("framework", skills))
+            return skills
+
+        async def produce():
+            try:
+                job_description, *framework_skills = await asyncio.gather(
+                    describe(), *(framework_branch(framework) for framework in FRAMEWORKS)
+                )
+                await queue.put(("complete", SkillRecommendationResponse(
+                    role=role,
+                    domain=domain,
+                    industry=industry,
+                    country=country_for_domain(domain),
+                    job_description=job_description,
+                    skills=framework_skills
+                )))
+            except Exception as e:
+                await queue.put(("error", e))
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                event, payload = await queue.get()
+                if event == "error":
+                    raise payload
+                yield event, payload
+                if event == "complete":
+                    return
+        finally:
+            producer.cancel()
+
+    async def _consolidated_recommendations(self, role: str, domain: str, industry: str, prefetched: dict = None) -> tuple: # type: ignore
+        """Job description and every framework's skills from one JSON-mode completion.
+
+        Sparse candidate lists are topped up inside the same prompt instead of with separate
+        supplement calls. A response that fails validation falls back to the per-branch calls,
+        reusing the candidates already retrieved.
+        """
+        candidates = await asyncio.gather(*(
+            self._candidate_skills(framework, role, industry, prefetched, supplement=False) for framework in FRAMEWORKS
+        ))
+        prompt = self._consolidated_prompt(role, domain, industry, dict(zip(FRAMEWORKS, candidates)))
+        response = await self.llm_service.agenerate(prompt, max_tokens=Config.LLM_CONSOLIDATED_MAX_TOKENS, json_mode=True)
+        parsed = self._parse_consolidated(response)
+        if parsed is not None:
+            return parsed
+
+        async def framework_branch(framework: str, candidate_skills: list) -> FrameworkSkills:
+            candidate_skills = await self._supplement_candidates(framework, role, industry, candidate_skills)
+            return await self._get_framework_skills(framework, role, industry, candidate_skills=candidate_skills)
+
+        job_description, *framework_skills = await asyncio.gather(
+            self._generate_job_description(role, domain, industry),
+            *(framework_branch(framework, candidate_skills) for framework, candidate_skills in zip(FRAMEWORKS, candidates))
+        )
+        return job_description, framework_skills
+
+    def _consolidated_prompt(self, role: str, domain: str, industry: str, candidates: dict) -> str:
+        """One compact prompt: the role context and output format are stated once for all branches."""
+        candidate_lines = "\n".join(
+            f"{framework} candidates: {', '.join(skills) if skills else '(none)'}" for framework, skills in candidates.items()
+        )
+        return (
+            f"Role: {role}. Industry: {industry}. Region/market: {domain}.\n"
+            "Return JSON {\"job_description\": str, \"frameworks\": [{\"framework\": str, "
+            "\"hard_skills\": [{\"name\": str, \"proficiency\": str}], \"soft_skills\": [same]}]} "
+            f"with one entry each for {', '.join(candidates)}.\n"
+            "job_description: 3-4 professional sentences on key responsibilities, work environment and why the role "
+            f"matters in {industry}.\n"
+            "Per framework: sort its candidates into 8-10 hard (technical) and 2-4 soft (interpersonal) skills, adding "
+            "typical skills if it has under 6; proficiency is Beginner, Intermediate, Advanced or Expert for this role.\n"
+            f"{candidate_lines}"
+        )
+
+    def _parse_consolidated(self, response: str) -> Optional[tuple]:
+        """Validate a consolidated completion into (job description, [FrameworkSkills]), or None."""
+        try:
+            with timed("json_parse"):
+                parsed = GeneratedRecommendation.model_validate_json((response or "").strip())
+        except ValidationError as e:
+            JSON_PARSE.inc(site="consolidated", outcome="fallback")
+            logger.warning(f"Consolidated response failed validation, using per-branch calls: {e.error_count()} errors")
+            return None
+        by_key = {re.sub(r"[^a-z]", "", entry.framework.lower()): entry for entry in parsed.frameworks}
+        entries = [by_key.get(re.sub(r"[^a-z]", "", framework.lower())) for framework in FRAMEWORKS]
+        if not parsed.job_description.strip() or any(entry is None for entry in entries):
+            JSON_PARSE.inc(site="consolidated", outcome="fallback")
+            logger.warning("Consolidated response is missing the job description or a framework, using per-branch calls")
+            return None
+        JSON_PARSE.inc(site="consolidated", outcome="ok")
+        framework_skills = [
+            FrameworkSkills(
+                framework=framework,
+                hard_skills=[Skill(name=skill.name, category="Hard", proficiency=skill.proficiency) for skill in entry.hard_skills], # type: ignore
+                soft_skills=[Skill(name=skill.name, category="Soft", proficiency=skill.proficiency) for skill in entry.soft_skills] # type: ignore
+            )
+            for framework, entry in zip(FRAMEWORKS, entries)
+        ]
+        return parsed.job_description.strip(), framework_skills
+
+    def _job_description_prompt(self, role: str, domain: str, industry: str) -> str:
+        return (
+            f"Provide a detailed and professional job description for a {role} position in the {industry} industry, "
+            f"specifically for the {domain} region/market. Include key responsibilities, typical work environment, "
+            f"and what makes this role important in the {industry} sector. Keep it concise (3-4 sentences)."
+        )
+
+    async def _generate_job_description(self, role: str, domain: str, industry: str) -> str:
+        """Generate job description based on role, domain, and industry."""
+        job_description = await self.llm_service.agenerate(self._job_description_prompt(role, domain, industry))
+        logger.info(f"Generated job description for {role} in {industry}")
+        return job_description
+
+    def _build_query(self, framework: str, normalized_title: str, role: str, industry: str) -> str:
+        """Build the retrieval query for one framework from the normalized job title."""
+        return f"Skills for {normalized_title} {role} role in {industry} industry in {framework}"
+
+    def _profile_candidates(self, framework: str, code: str) -> list:
+        """Ranked candidates from the precomputed O*NET profile when the title unambiguously resolved to a SOC code."""
+        if framework != "O*NET" or self.profiles is None or code is None or code not in self.profiles:
+            return []
+        return [candidate["name"] for candidate in self.profiles.candidates(code, RAG_RESULTS)]
+
+    async def _candidate_skills(self, framework: str, role: str, industry: str, prefetched: dict = None, supplement: bool = True) -> list: # type: ignore
+        """Collect candidate skill names from the occupation profile, or RAG plus LLM supplementation."""
+        # Normalize job title
+        with timed("normalize"):
+            code = self.normalizer.occupation_code(role, framework)
+        normalized_title = code or role.lower().strip()
+        logger.info(f"Normalized job title for {framework}: {role} -> {normalized_title}")
+
+        # Only an unambiguous occupation skips the embedding query and the supplement call;
+        # generic titles that tie across occupations keep the RAG path
+        candidate_skills = self._profile_candidates(framework, code)
+        if candidate_skills:
+            logger.info(f"Profile candidates for {framework} {normalized_title}: {len(candidate_skills)} skills")
+            return candidate_skills
+
+        # Get candidate skills from RAG (encode + vector query are blocking, so run them off the loop)
+        query = self._build_query(framework, normalized_title, role, industry)
+        if prefetched is not None and (framework, query) in prefetched:
+            rag_results = prefetched[(framework, query)]
+        else:
+            # The templated query never equals a skill name, so the bare role is the exact-match probe
+            rag_results = await asyncio.to_thread(self.rag_service.query, query, framework, RAG_RESULTS, role)
+        candidate_skills = [meta.get("skill", meta.get("name", "")) for meta in rag_results if "skill" in meta or "name" in meta]
+        logger.info(f"RAG candidates for {framework}: {len(candidate_skills)} skills")
+
+        # Enrich sparse ESCO results from related skills before falling back to the LLM
+        if len(candidate_skills) < 6 and framework == "ESCO" and self.skill_graph is not None:
+            seeds = [meta["element_id"] for meta in rag_results if meta.get("element_id")]
+            candidate_skills = self._graph_candidates(seeds, candidate_skills)
+            logger.info(f"Graph-enriched candidates for {framework}: {len(candidate_skills)} skills")
+
+        if supplement:
+            candidate_skills = await self._supplement_candidates(framework, role, industry, candidate_skills)
+        return candidate_skills
+
+    async def _supplement_candidates(self, framework: str, role: str, industry: str, candidate_skills: list) -> list:
+        """Top up a sparse candidate list with LLM-generated skill names."""
+        # If insufficient RAG results, supplement with LLM-generated candidates
+        if len(candidate_skills) < 6:
+            logger.info(f"Supplementing RAG with LLM for {framework}")
+            base_prompt = (
+                f"List 8-10 candidate skills for a {role} role in {industry} industry using {framework}. "
+                "Focus on core hard and soft skills. Output comma-separated names only."
+            )
+            llm_candidates_str = await self.llm_service.agenerate(base_prompt)
+            llm_candidates = self._parse_llm_skills(llm_candidates_str)
+            candidate_skills.extend(llm_candidates)
+            candidate_skills = list(set(candidate_skills))[:12]  # Dedupe and limit
+        return candidate_skills
+
+    def _graph_candidates(self, seeds: list, candidate_skills: list, limit: int = 12) -> list:
+        """Top up candidates with related skills of the seeds, then skills grouped alongside them."""
+        related = self.skill_graph.expand(seeds, depth=2, limit=limit)
+        for seed in seeds:
+            if len(related) >= limit:
+                break
+            related.extend(self.skill_graph.siblings(seed, limit))
+        candidates = list(candidate_skills)
+        for uri in related:
+            name = self.skill_graph.label(uri)
+            if name and name not in candidates:
+                candidates.append(name)
+                if len(candidates) >= limit:
+                    break
+        return candidates
+
+    async def _get_framework_skills(self, framework: str, role: str, industry: str, prefetched: dict = None, candidate_skills: list = None) -> FrameworkSkills: # type: ignore
+        """Retrieve, supplement and categorize candidate skills for a single framework."""
+        if candidate_skills is None:
+            candidate_skills = await self._candidate_skills(framework, role, industry, prefetched)
+
+        # LLM prompt for categorization and per-skill proficiency assignment
+        skills_list_str = ", ".join(candidate_skills) # type: ignore
+        llm_prompt = (
+            f"For a {role} role in {industry} industry, take these {framework} candidate skills: {skills_list_str}. "
+            "Categorize into hard (technical) and soft (interpersonal) skills. "
+            "Assign realistic proficiency levels (Beginner, Intermediate, Advanced, Expert) per skill based on typical role requirements in the industry. "
+            f"Consider the specific demands of {industry} industry for this {role} position. "
+            "Limit to 8-10 hard and 2-4 soft. Output ONLY valid JSON: "
+            "{{\"hard_skills\": [{\"name\": \"Skill Name\", \"proficiency\": \"Level\"}, ...], "
+            "\"soft_skills\": [{\"name\": \"Skill Name\", \"proficiency\": \"Level\"}, ...]}}"
+        )
+        llm_response = await self.llm_service.agenerate(llm_prompt)
+        
+        # Parse JSON from LLM response
+        try:
+            with timed("json_parse"):
+                parsed = json.loads(llm_response.strip())
+            hard_skills_data = parsed.get("hard_skills", [])
+            soft_skills_data = parsed.get("soft_skills", [])
+            JSON_PARSE.inc(site="framework_skills", outcome="ok")
+            logger.info(f"Parsed {len(hard_skills_data)} hard and {len(soft_skills_data)} soft skills for {framework}")
+        except json.JSONDecodeError:
+            JSON_PARSE.inc(site="framework_skills", outcome="fallback")
+            logger.warning(f"JSON parse failed for {framework}, categorizing candidates with SkillCategorizer")
+            # Memoized and locally classified skills need no LLM call; the rest share one batched call
+            hard_skills_data, soft_skills_data = await asyncio.to_thread(
+                self.categorizer.categorize, [{"name": skill} for skill in candidate_skills[:14]] # type: ignore
+            )
+            hard_skills_data, soft_skills_data = hard_skills_data[:10], soft_skills_data[:4]
+
+        # Convert to Pydantic models with category
+        hard_skills_models = [
+            Skill(name=skill["name"], category="Hard", proficiency=skill.get("proficiency", "Intermediate"))
+            for skill in hard_skills_data
+        ]
+        soft_skills_models = [
+            Skill(name=skill["name"], category="Soft", proficiency=skill.get("proficiency", "Intermediate"))
+            for skill in soft_skills_data
+        ]
+
+        return FrameworkSkills(
+            framework=framework,
+            hard_skills=hard_skills_models,
+            soft_skills=soft_skills_models
+        )
+
     def _parse_llm_skills(self, response: str) -> list:
         """Parse comma-separated skills from LLM."""
         import re
@@ -131,6 +378,11 @@ class RecommendationEngine:
         prompt = f"Provide a detailed job description for a {job_title}."
         return self.llm_service.generate(prompt)
 
+    async def aget_job_description(self, job_title: str) -> str:
+        """Generate job description using LLM without blocking the event loop."""
+        prompt = f"Provide a detailed job description for a {job_title}."
+        return await self.llm_service.agenerate(prompt)
+
 
 # from app.core.job_normalizer import JobNormalizer
 # from app.core.skill_categorizer import SkillCategorizer
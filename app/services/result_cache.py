@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from app.config import Config
+from app.services.recommendation_engine import DOMAIN_TO_COUNTRY
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_DOMAIN_ALIASES = {alias.casefold(): country.casefold() for alias, country in DOMAIN_TO_COUNTRY.items()}
+
+def _normalize_text(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+def normalize_request_key(role: str, domain: str, industry: str) -> tuple:
+    """Build a cache key that ignores case, extra whitespace and domain aliases (US == United States)."""
+    domain_norm = _normalize_text(domain)
+    return (_normalize_text(role), _DOMAIN_ALIASES.get(domain_norm, domain_norm), _normalize_text(industry))
+
+class ResultCache:
+    """TTL/LRU cache of recommendation responses with single-flight de-duplication of in-flight work."""
+
+    def __init__(self, ttl: int = None, max_entries: int = None): # type: ignore
+        self.ttl = ttl if ttl is not None else Config.RESULT_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else Config.RESULT_CACHE_MAX_ENTRIES
+        self._entries = OrderedDict()  # key -> (created_at, value)
+        self._inflight = {}  # key -> asyncio.Task
+        self._waiters = {}  # key -> callers awaiting the in-flight task
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: tuple):
+        """Return a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if self.ttl > 0 and time.monotonic() - created_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: tuple, compute: Callable[[], Awaitable]):
+        """Serve from cache, join an identical in-flight computation, or start a new one.
+
+        A cancelled caller leaves the computation running for the other callers waiting on it,
+        and cancels it when it was the last one.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            generation = self._generation
+            task.add_done_callback(lambda t: self._on_done(key, t, generation))
+        else:
+            self.coalesced += 1
+        # Shield so a disconnecting caller doesn't cancel work other callers are waiting on
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and self._inflight.get(key) is task:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _on_done(self, key: tuple, task: asyncio.Task, generation: int):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Skip results that were invalidated while still in flight
+        if task.cancelled() or task.exception() is not None or generation != self._generation:
+            return
+        self.set(key, task.result())
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation; capture it before computing a value to set() later."""
+        return self._generation
+
+    def set_if_current(self, key: tuple, value, generation: int) -> bool:
+        """set() unless the cache was invalidated since `generation` was read."""
+        if generation != self._generation:
+            return False
+        self.set(key, value)
+        return True
+
+    def invalidate(self, key: Optional[tuple] = None) -> int:
+        """Drop one entry, or every entry when no key is given. Returns the number removed."""
+        self._generation += 1
+        if key is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            removed = 1 if self._entries.pop(key, None) is not None else 0
+        logger.info(f"Invalidated {removed} cached recommendation(s)")
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight)
+        }
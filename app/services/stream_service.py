@@ -0,0 +1,53 @@
+import json
+import logging
+from typing import AsyncIterator
+from pydantic import BaseModel
+from app.api.models import JobRequest, SkillRecommendationResponse
+from app.services.recommendation_engine import RecommendationEngine, country_for_domain
+from app.services.result_cache import ResultCache, normalize_request_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def format_sse(event: str, payload) -> str:
+    """Encode one server-sent event; pydantic payloads use their normal JSON form."""
+    data = payload.model_dump_json() if isinstance(payload, BaseModel) else json.dumps(payload)
+    return f"event: {event}\ndata: {data}\n\n"
+
+async def stream_recommendation_events(
+    request: JobRequest,
+    engine: RecommendationEngine,
+    cache: ResultCache
+) -> AsyncIterator[str]:
+    """Stream job-description deltas, per-framework skills and the final response as SSE.
+
+    A cached response is replayed through the same events so clients handle one format.
+    """
+    key = normalize_request_key(request.role, request.domain, request.industry)
+    echo = {
+        "role": request.role,
+        "domain": request.domain,
+        "industry": request.industry,
+        "country": country_for_domain(request.domain)
+    }
+
+    cached = cache.get(key)
+    if cached is not None:
+        response: SkillRecommendationResponse = cached.model_copy(update=echo)
+        yield format_sse("job_description_delta", {"delta": response.job_description})
+        for framework_skills in response.skills:
+            yield format_sse("framework", framework_skills)
+        yield format_sse("complete", response)
+        return
+
+    generation = cache.generation
+    try:
+        async for event, payload in engine.astream_recommendations(request.role, request.domain, request.industry):
+            if event == "complete":
+                # Don't write back a result computed across an invalidation
+                cache.set_if_current(key, payload, generation)
+                payload = payload.model_copy(update=echo)
+            yield format_sse(event, payload)
+    except Exception as e:
+        logger.error(f"Streaming recommendation failed for {request.role}: {str(e)}")
+        yield format_sse("error", {"detail": str(e)})
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+JOB_DESCRIPTION = (
+    "The role owns the design and delivery of data-driven solutions, working with stakeholders to "
+    "translate business questions into analyses, building and maintaining pipelines and models, and "
+    "communicating results clearly to technical and non-technical audiences."
+)
+FRAMEWORK_SKILLS = {
+    "hard_skills": [
+        {"name": "Python", "proficiency": "Advanced"},
+        {"name": "SQL", "proficiency": "Advanced"},
+        {"name": "Statistics", "proficiency": "Intermediate"},
+        {"name": "Machine Learning", "proficiency": "Advanced"},
+        {"name": "Data Visualization", "proficiency": "Intermediate"},
+        {"name": "Cloud Computing", "proficiency": "Intermediate"},
+        {"name": "Data Warehousing", "proficiency": "Intermediate"},
+        {"name": "Version Control", "proficiency": "Intermediate"}
+    ],
+    "soft_skills": [
+        {"name": "Communication", "proficiency": "Advanced"},
+        {"name": "Critical Thinking", "proficiency": "Advanced"},
+        {"name": "Teamwork", "proficiency": "Intermediate"}
+    ]
+}
+
+# (prompt substring, response) pairs checked in order; the last entry is the fallback
+DEFAULT_RESPONSES = [
+    ("\"job_description\"", json.dumps({
+        "job_description": JOB_DESCRIPTION,
+        "frameworks": [{"framework": framework, **FRAMEWORK_SKILLS} for framework in ("O*NET", "ESCO")]
+    })),
+    ("\"hard_skills\"", json.dumps(FRAMEWORK_SKILLS)),
+    ("\"Hard\" or \"Soft\"", json.dumps({"Python": "Hard", "Teamwork": "Soft"})),
+    ("comma-separated", "Python, SQL, Statistics, Machine Learning, Data Visualization, Communication, Teamwork, Problem Solving"),
+    ("", JOB_DESCRIPTION)
+]
+
+def create_app(latency_ms: float = 300.0, jitter_ms: float = 50.0, responses: list = None, chunk_delay_ms: float = 5.0, # type: ignore
+               max_concurrency: int = 0, retry_after: float = 1.0, slow_rate: float = 0.0, slow_ms: float = 0.0) -> FastAPI:
+    """A Groq/OpenAI-compatible chat completions endpoint with canned responses and simulated latency.
+
+    max_concurrency > 0 answers requests beyond that many in flight with 429 and a Retry-After
+    of retry_after seconds, like Groq's rate limiter. slow_rate of the requests take slow_ms
+    longer, to exercise tail-latency handling.
+    """
+    responses = responses or DEFAULT_RESPONSES
+    app = FastAPI(title="Fake Groq")
+    app.state.requests = 0
+    app.state.inflight = 0
+    app.state.max_inflight = 0
+    app.state.rate_limited = 0
+
+    def pick_response(prompt: str) -> str:
+        for needle, response in responses:
+            if needle in prompt:
+                return response
+        return responses[-1][1]
+
+    async def wait():
+        delay = latency_ms + random.uniform(-jitter_ms, jitter_ms) + (slow_ms if random.random() < slow_rate else 0.0)
+        await asyncio.sleep(max(0.0, delay) / 1000.0)
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        if max_concurrency and app.state.inflight >= max_concurrency:
+            app.state.rate_limited += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(retry_after)},
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+            )
+        app.state.inflight += 1
+        app.state.max_inflight = max(app.state.max_inflight, app.state.inflight)
+        prompt = body["messages"][-1]["content"]
+        content = pick_response(prompt)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        usage = {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()),
+                 "total_tokens": len(prompt.split()) + len(content.split())}
+        if body.get("stream"):
+            async def events():
+                try:
+                    await wait()
+                finally:
+                    app.state.inflight -= 1
+                words = content.split(" ")
+                for i, word in enumerate(words):
+                    delta = word if i == len(words) - 1 else word + " "
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": body["model"],
+                        "choices": [{"index": 0, "delta": {"role": "assistant", "content": delta}, "finish_reason": None}]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(chunk_delay_ms / 1000.0)
+                done = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": body["model"],
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    "x_groq": {"id": completion_id, "usage": usage}
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+        try:
+            await wait()
+        finally:
+            app.state.inflight -= 1
+        return {
+            "id": completion_id, "object": "chat.completion", "created": created, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        }
+
+    return app
+
+class BackgroundServer:
+    """Run an ASGI app with uvicorn on a daemon thread for the duration of a with-block."""
+
+    def __init__(self, app, port: int, host: str = "127.0.0.1"):
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self.url = f"http://{host}:{port}"
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError(f"Server on {self.url} failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve a fake Groq chat completions API.")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--max-concurrency", type=int, default=0, help="Answer 429 beyond this many in-flight requests")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of requests that take --slow-ms longer")
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    print(f"Set GROQ_BASE_URL=http://127.0.0.1:{args.port} to use this server")
+    app = create_app(args.latency_ms, args.jitter_ms, max_concurrency=args.max_concurrency,
+                     slow_rate=args.slow_rate, slow_ms=args.slow_ms)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
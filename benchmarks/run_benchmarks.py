@@ -0,0 +1,225 @@
+"""Offline performance benchmarks: ingestion, retrieval and end-to-end /recommend-skills.
+
+LLM calls go to a local fake Groq server (benchmarks/fake_groq.py) with configurable latency,
+and every index, cache and vector database lives in a scratch work directory, so runs are
+repeatable and never touch Groq or the deployed data. The O*NET/ESCO source files are read
+from ONET_DATA_PATH / ESCO_DATA_PATH as usual.
+
+    python -m benchmarks.run_benchmarks --suites ingest,retrieval,e2e --concurrency 1,8,32
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from benchmarks.fake_groq import BackgroundServer, create_app
+from benchmarks.workload import generate_jobs, generate_queries
+
+def summarize(latencies: list) -> dict:
+    """Latency percentiles in milliseconds."""
+    if not latencies:
+        return {"count": 0}
+    values = np.asarray(latencies) * 1000
+    return {
+        "count": len(values),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3)
+    }
+
+def configure_environment(args):
+    """Point every writable path at the work directory; must run before any app module is imported."""
+    workdir = args.workdir or tempfile.mkdtemp(prefix="skill-bench-")
+    os.environ["CHROMA_DB_PATH"] = os.path.join(workdir, "vector_db")
+    os.environ["INDEX_PATH"] = os.path.join(workdir, "indexes")
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "cache", "llm_cache.sqlite3")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(workdir, "cache", "embeddings")
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.llm_cache else "false"
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{args.groq_port}"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    return workdir
+
+def bench_ingest() -> dict:
+    from app.data.vector_store import VectorStore
+    from app.core.title_index import TitleIndex
+    from app.data.occupation_profiles import OccupationProfiles
+    from app.data.skill_graph import SkillGraph
+    vector_store = VectorStore()
+    started = time.perf_counter()
+    vector_store.initialize(full_rebuild=True)
+    full_seconds = time.perf_counter() - started
+    documents = vector_store.rag_service.collection.count()
+    started = time.perf_counter()
+    vector_store.initialize()
+    incremental_seconds = time.perf_counter() - started
+    # Untimed: the lookup structures the engine loads at startup
+    TitleIndex.build(vector_store.loader).save()
+    OccupationProfiles.build(vector_store.loader).save()
+    SkillGraph.build(vector_store.loader).save()
+    return {
+        "documents": documents,
+        "full_rebuild_seconds": round(full_seconds, 3),
+        "docs_per_second": round(documents / full_seconds, 1) if full_seconds else None,
+        "incremental_noop_seconds": round(incremental_seconds, 3)
+    }
+
+def bench_retrieval(count: int, n_results: int) -> dict:
+    from app.services.rag_service import RAGService
+    rag_service = RAGService()
+    queries = generate_queries(count)
+    results = {}
+    # The second pass repeats the same texts, so it measures the embedding-cache hit path
+    for label in ("cold", "warm"):
+        latencies = []
+        started = time.perf_counter()
+        for text, framework in queries:
+            query_started = time.perf_counter()
+            rag_service.query(text, framework, n_results)
+            latencies.append(time.perf_counter() - query_started)
+        elapsed = time.perf_counter() - started
+        results[label] = {**summarize(latencies), "queries_per_second": round(len(queries) / elapsed, 1)}
+    return results
+
+async def drive(url: str, jobs: list, concurrency: int) -> dict:
+    import httpx
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+    async with httpx.AsyncClient(base_url=url, timeout=300) as client:
+        await client.delete("/admin/cache")
+
+        async def one(job):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/recommend-skills", json=job)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(job) for job in jobs))
+        elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        **summarize(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else None
+    }
+
+def wait_ready(url: str, timeout: float = 600.0) -> float:
+    """Poll /ready until the background warmup finishes; returns the seconds waited."""
+    import httpx
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        response = httpx.get(f"{url}/ready")
+        if response.status_code == 200:
+            return time.perf_counter() - started
+        if response.json().get("status") == "failed":
+            raise RuntimeError(f"Engine warmup failed: {response.json().get('detail')}")
+        time.sleep(0.1)
+    raise TimeoutError(f"{url} was not ready after {timeout} seconds")
+
+def bench_e2e(concurrency_levels: list, count: int, repeat_ratio: float, app_port: int) -> list:
+    from app.main import app
+    results = []
+    with BackgroundServer(app, app_port) as server:
+        print(f"e2e: ready after {wait_ready(server.url):.2f}s")
+        for concurrency in concurrency_levels:
+            jobs = generate_jobs(count, repeat_ratio=repeat_ratio, seed=concurrency)
+            results.append(asyncio.run(drive(server.url, jobs, concurrency)))
+            print(json.dumps(results[-1]))
+    return results
+
+def compare(current: dict, baseline: dict):
+    """Print percentage changes of the headline numbers against an earlier run."""
+    def delta(new, old):
+        return f"{new} ({(new - old) / old * 100:+.1f}%)" if isinstance(new, (int, float)) and old else str(new)
+    results, previous = current["results"], baseline["results"]
+    if "ingest" in results and "ingest" in previous:
+        print("ingest docs/s:", delta(results["ingest"]["docs_per_second"], previous["ingest"]["docs_per_second"]))
+    for label in ("cold", "warm"):
+        if label in results.get("retrieval", {}) and label in previous.get("retrieval", {}):
+            print(f"retrieval {label} p95 ms:", delta(results["retrieval"][label]["p95_ms"], previous["retrieval"][label]["p95_ms"]))
+    old_levels = {level["concurrency"]: level for level in previous.get("e2e", [])}
+    for level in results.get("e2e", []):
+        old = old_levels.get(level["concurrency"])
+        if old and level.get("count") and old.get("count"):
+            print(
+                f"e2e c={level['concurrency']}: p50 {delta(level['p50_ms'], old['p50_ms'])} ms, "
+                f"p99 {delta(level['p99_ms'], old['p99_ms'])} ms, rps {delta(level['requests_per_second'], old['requests_per_second'])}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline ingestion, retrieval and end-to-end benchmarks.")
+    parser.add_argument("--suites", default="ingest,retrieval,e2e", help="Comma-separated subset of ingest,retrieval,e2e")
+    parser.add_argument("--workdir", help="Scratch directory for the vector DB, indexes and caches (default: a new temp dir)")
+    parser.add_argument("--queries", type=int, default=200, help="Retrieval queries per pass")
+    parser.add_argument("--requests", type=int, default=200, help="/recommend-skills requests per concurrency level")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--repeat-ratio", type=float, default=0.2, help="Share of repeated requests in the workload")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--llm-max-concurrency", type=int, default=0, help="Fake Groq answers 429 beyond this many in-flight calls")
+    parser.add_argument("--llm-slow-rate", type=float, default=0.0, help="Share of fake Groq calls that take --llm-slow-ms longer")
+    parser.add_argument("--llm-slow-ms", type=float, default=0.0)
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache enabled")
+    parser.add_argument("--groq-port", type=int, default=8900)
+    parser.add_argument("--app-port", type=int, default=8901)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args()
+    suites = [suite.strip() for suite in args.suites.split(",") if suite.strip()]
+    workdir = configure_environment(args)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=project_root, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "config": {**vars(args), "workdir": workdir},
+        "results": {}
+    }
+    fake_groq = create_app(args.llm_latency_ms, args.llm_jitter_ms, max_concurrency=args.llm_max_concurrency,
+                           slow_rate=args.llm_slow_rate, slow_ms=args.llm_slow_ms)
+    with BackgroundServer(fake_groq, args.groq_port):
+        if "ingest" in suites:
+            report["results"]["ingest"] = bench_ingest()
+            print("ingest:", json.dumps(report["results"]["ingest"]))
+        if "retrieval" in suites:
+            report["results"]["retrieval"] = bench_retrieval(args.queries, 12)
+            print("retrieval:", json.dumps(report["results"]["retrieval"]))
+        if "e2e" in suites:
+            levels = [int(level) for level in args.concurrency.split(",")]
+            report["results"]["e2e"] = bench_e2e(levels, args.requests, args.repeat_ratio, args.app_port)
+        report["results"]["fake_groq"] = {
+            "requests": fake_groq.state.requests,
+            "rate_limited": fake_groq.state.rate_limited,
+            "max_inflight": fake_groq.state.max_inflight
+        }
+
+    output = args.output or os.path.join(project_root, "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
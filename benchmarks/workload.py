@@ -0,0 +1,40 @@
+import random
+
+ROLES = [
+    "Data Scientist", "Software Engineer", "Registered Nurse", "Financial Analyst", "Marketing Manager",
+    "Mechanical Engineer", "Accountant", "Sales Representative", "Graphic Designer", "Project Manager",
+    "Web Developer", "Pharmacist", "Electrician", "Human Resources Specialist", "Civil Engineer",
+    "Database Administrator", "Teacher", "Logistics Coordinator", "Chef", "Customer Service Representative"
+]
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Principal "]
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing", "Education", "Energy", "Logistics"]
+# Region values the API maps to a country (see DOMAIN_TO_COUNTRY), including alias spellings
+DOMAINS = ["USA", "US", "United States", "Europe", "EU", "India", "Singapore", "Australia", "Canada", "UK"]
+
+def generate_jobs(count: int, repeat_ratio: float = 0.2, seed: int = 0) -> list:
+    """Return count {"role", "domain", "industry"} requests.
+
+    About repeat_ratio of them repeat an earlier request, so cache effects show up at a
+    controlled rate; the rest combine seniority, role, domain and industry.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        if jobs and rng.random() < repeat_ratio:
+            jobs.append(dict(rng.choice(jobs)))
+            continue
+        jobs.append({
+            "role": rng.choice(SENIORITY) + rng.choice(ROLES),
+            "domain": rng.choice(DOMAINS),
+            "industry": rng.choice(INDUSTRIES)
+        })
+    return jobs
+
+def generate_queries(count: int, seed: int = 0) -> list:
+    """Retrieval queries shaped like the engine's: (query text, framework)."""
+    rng = random.Random(seed)
+    queries = []
+    for job in generate_jobs(count, repeat_ratio=0.0, seed=seed):
+        framework = rng.choice(["O*NET", "ESCO"])
+        queries.append((f"Skills for {job['role']} {job['role']} role in {job['industry']} industry in {framework}", framework))
+    return queries
@@ -0,0 +1,30 @@
+import os
+import sys
+import argparse
+import logging
+
+# Add project root to PYTHONPATH
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+from app.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX with int8 dynamic quantization.")
+    parser.add_argument("output_dir", help="Directory to save the exported model to (use it as EMBEDDING_MODEL)")
+    parser.add_argument("--target", default="avx2", choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+                        help="CPU instruction set to quantize for")
+    args = parser.parse_args()
+    model = SentenceTransformer(Config.EMBEDDING_MODEL, device="cpu", backend="onnx")
+    model.save(args.output_dir)
+    export_dynamic_quantized_onnx_model(model, args.target, args.output_dir)
+    exported = sorted(name for name in os.listdir(os.path.join(args.output_dir, "onnx")) if args.target in name)
+    logger.info(f"Exported {exported} to {args.output_dir}; set EMBEDDING_ONNX_FILE=onnx/<file> and EMBEDDING_BACKEND=onnx")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import argparse
+import subprocess
+import time
+
+# Add project root to PYTHONPATH
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+# Modules that must only be imported when the engine is built, not when app.main is imported
+DEFERRED_MODULES = ["torch", "transformers", "sentence_transformers", "chromadb", "onnxruntime", "groq"]
+
+def import_profile(module: str) -> list:
+    """Run `python -X importtime -c "import <module>"` in a fresh interpreter.
+
+    Returns (self_us, cumulative_us, name) rows in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+def imported_modules(module: str) -> set:
+    """Top-level packages present in sys.modules after importing module in a fresh interpreter."""
+    code = f"import sys, {module}; print('\\n'.join(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True)
+    return set(result.stdout.split())
+
+def engine_phases() -> list:
+    """Wall-clock time of each start-up phase when the engine is built in this process."""
+    phases = []
+    started = time.perf_counter()
+    import app.main
+    phases.append(("import app.main", time.perf_counter() - started))
+    from app.services.recommendation_engine import RecommendationEngine
+    started = time.perf_counter()
+    engine = RecommendationEngine()
+    phases.append(("RecommendationEngine()", time.perf_counter() - started))
+    started = time.perf_counter()
+    engine.warmup()
+    phases.append(("engine.warmup()", time.perf_counter() - started))
+    return phases
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile service start-up: import-time breakdown and engine load phases.")
+    parser.add_argument("--module", default="app.main", help="Module whose import is profiled")
+    parser.add_argument("--top", type=int, default=25, help="Number of slowest imports to list")
+    parser.add_argument("--engine", action="store_true", help="Also time engine construction and warmup")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if importing the module pulls in any deferred heavy dependency")
+    args = parser.parse_args()
+
+    rows = import_profile(args.module)
+    total = next((cumulative for _, cumulative, name in rows if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms across {len(rows)} modules\n")
+    print("Slowest top-level packages (ms, summed over their modules):")
+    packages = {}
+    for self_us, _, name in rows:
+        packages[name.split(".")[0]] = packages.get(name.split(".")[0], 0) + self_us
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:9.1f}  {package}")
+    print("\nSlowest modules (self ms / cumulative ms):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+    loaded = sorted(imported_modules(args.module) & set(DEFERRED_MODULES))
+    print(f"\nDeferred dependencies loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.engine:
+        print("\nEngine start-up phases:")
+        for phase, seconds in engine_phases():
+            print(f"  {seconds:9.3f} s  {phase}")
+
+    if args.check and loaded:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
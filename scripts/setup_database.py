@@ -9,6 +9,7 @@
 #     main()
 import sys
 import os
+import argparse
 import logging
 
 # Add project root to PYTHONPATH
@@ -17,6 +18,10 @@ sys.path.insert(0, project_root)
 
 try:
     from app.data.vector_store import VectorStore
+    from app.core.title_index import TitleIndex
+    from app.data.occupation_profiles import OccupationProfiles
+    from app.core.skill_classifier import SkillTypeClassifier
+    from app.data.skill_graph import SkillGraph
 except ImportError as e:
     print(f"Error importing VectorStore: {e}")
     sys.exit(1)
@@ -25,10 +30,21 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def main():
+    parser = argparse.ArgumentParser(description="Sync framework skills into the vector database.")
+    parser.add_argument("--full", action="store_true", help="Drop the collection and re-embed everything")
+    args = parser.parse_args()
     try:
         vector_store = VectorStore()
-        vector_store.initialize()
+        vector_store.initialize(full_rebuild=args.full)
         logger.info("Vector database initialized successfully.")
+        TitleIndex.build(vector_store.loader).save()
+        logger.info("Job title index built successfully.")
+        OccupationProfiles.build(vector_store.loader).save()
+        logger.info("Occupation skill profiles built successfully.")
+        SkillGraph.build(vector_store.loader).save()
+        logger.info("ESCO skill graph built successfully.")
+        SkillTypeClassifier.build(vector_store.loader, vector_store.rag_service).save()
+        logger.info("Skill classifier built successfully.")
     except Exception as e:
         logger.error(f"Failed to initialize vector database: {str(e)}")
         sys.exit(1)
@@ -0,0 +1,33 @@
+import asyncio
+import json
+from app.api.models import JobRequest, SkillRecommendationResponse
+from app.services.batch_service import stream_batch_recommendations
+from app.services.result_cache import ResultCache, normalize_request_key
+
+class FailingPrefetchEngine:
+    def __init__(self):
+        self.prefetched = []
+
+    async def aprefetch(self, jobs):
+        self.prefetched.extend(jobs)
+        raise RuntimeError("index unavailable")
+
+def test_cached_items_stream_first_and_prefetch_failures_are_per_item():
+    cache = ResultCache(ttl=60, max_entries=10)
+    cached = SkillRecommendationResponse(
+        role="Nurse", domain="USA", industry="Health", country="USA", job_description="Cares.", skills=[]
+    )
+    cache.set(normalize_request_key("Nurse", "USA", "Health"), cached)
+    engine = FailingPrefetchEngine()
+    requests = [
+        JobRequest(role="Data Scientist", domain="US", industry="Tech"),
+        JobRequest(role="nurse", domain="United States", industry="Health")
+    ]
+
+    async def collect():
+        return [json.loads(line) async for line in stream_batch_recommendations(requests, engine, cache)] # type: ignore
+
+    items = asyncio.run(collect())
+    assert items[0]["index"] == 1 and items[0]["result"]["role"] == "nurse" and items[0]["result"]["country"] == "USA"
+    assert items[1]["index"] == 0 and items[1]["result"] is None and "index unavailable" in items[1]["error"]
+    assert engine.prefetched == [("Data Scientist", "Tech")]
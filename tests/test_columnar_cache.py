@@ -0,0 +1,47 @@
+import os
+import numpy as np
+import pandas as pd
+from app.data.columnar_cache import ColumnarCache
+
+def write_source(path, rows):
+    pd.DataFrame(rows, columns=["code", "name", "value"]).to_csv(path, sep="\t", index=False)
+
+def test_snapshot_roundtrip_keeps_values_and_missing_entries(tmp_path):
+    source = str(tmp_path / "skills.txt")
+    write_source(source, [["15-2051.00", "Python", 4.5], ["15-2051.00", None, 3.0], ["29-1141.00", "Python", None]])
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    build = lambda: pd.read_csv(source, sep="\t")
+    first = cache.get("skills", [source], build)
+    second = cache.get("skills", [source], lambda: (_ for _ in ()).throw(AssertionError("rebuilt")))
+    pd.testing.assert_frame_equal(first, second)
+    assert second["name"].isna().tolist() == [False, True, False]
+    assert np.isnan(second["value"].iloc[2])
+
+def test_changed_source_rebuilds_but_touch_does_not(tmp_path):
+    source = str(tmp_path / "skills.txt")
+    missing = str(tmp_path / "descriptions.txt")
+    write_source(source, [["15-2051.00", "Python", 4.5]])
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    builds = []
+    def build():
+        builds.append(1)
+        return pd.read_csv(source, sep="\t")
+    cache.get("skills", [source, missing], build)
+    os.utime(source)
+    cache.get("skills", [source, missing], build)
+    assert len(builds) == 1
+    write_source(source, [["15-2051.00", "SQL", 4.5]])
+    assert cache.get("skills", [source, missing], build)["name"].tolist() == ["SQL"]
+    assert len(builds) == 2
+
+def test_empty_frames_are_not_snapshotted(tmp_path):
+    source = str(tmp_path / "skills.txt")
+    write_source(source, [])
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    builds = []
+    def build():
+        builds.append(1)
+        return pd.DataFrame()
+    cache.get("skills", [source], build)
+    cache.get("skills", [source], build)
+    assert len(builds) == 2
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from app.services.recommendation_engine import FRAMEWORKS, RecommendationEngine
+
+SKILLS = {
+    "hard_skills": [{"name": "Python", "proficiency": "Advanced"}],
+    "soft_skills": [{"name": "Teamwork"}]
+}
+
+class FakeLLM:
+    def __init__(self, consolidated: str):
+        self.consolidated = consolidated
+        self.calls = []
+
+    async def agenerate(self, prompt, max_tokens=500, use_cache=True, json_mode=False):
+        self.calls.append((prompt, json_mode))
+        if json_mode:
+            return self.consolidated
+        if "\"hard_skills\"" in prompt:
+            return json.dumps(SKILLS)
+        if "comma-separated" in prompt:
+            return "Python, SQL, Statistics, Teamwork, Communication, Leadership"
+        return "A description."
+
+def make_engine(consolidated: str) -> RecommendationEngine:
+    engine = RecommendationEngine.__new__(RecommendationEngine)
+    engine.llm_service = FakeLLM(consolidated)
+
+    async def candidate_skills(framework, role, industry, prefetched=None, supplement=True):
+        return ["Python", "Teamwork"]
+
+    engine._candidate_skills = candidate_skills
+    return engine
+
+def test_one_json_mode_call_covers_description_and_frameworks(monkeypatch):
+    monkeypatch.setattr("app.config.Config.LLM_CONSOLIDATED_ENABLED", True)
+    response = json.dumps({
+        "job_description": "Builds models.",
+        "frameworks": [{"framework": "ESCO", **SKILLS}, {"framework": "ONET", **SKILLS}]
+    })
+    engine = make_engine(response)
+    result = asyncio.run(engine.aget_recommendations("Data Scientist", "US", "Technology"))
+    assert len(engine.llm_service.calls) == 1 and engine.llm_service.calls[0][1]
+    assert result.job_description == "Builds models."
+    assert [skills.framework for skills in result.skills] == FRAMEWORKS
+    assert result.skills[0].hard_skills[0].category == "Hard"
+    assert result.skills[0].soft_skills[0].proficiency == "Intermediate"
+
+def test_invalid_response_falls_back_to_per_branch_calls(monkeypatch):
+    monkeypatch.setattr("app.config.Config.LLM_CONSOLIDATED_ENABLED", True)
+    engine = make_engine("{\"job_description\": \"Builds models.\"")
+    result = asyncio.run(engine.aget_recommendations("Data Scientist", "US", "Technology"))
+    prompts = [prompt for prompt, _ in engine.llm_service.calls]
+    # Consolidated attempt, one supplement and one categorization per framework, and the description
+    assert len(prompts) == 6
+    assert result.job_description == "A description."
+    assert all(skills.hard_skills[0].name == "Python" for skills in result.skills)
+
+def test_missing_framework_is_rejected():
+    engine = make_engine("")
+    response = json.dumps({"job_description": "Builds models.", "frameworks": [{"framework": "O*NET", **SKILLS}]})
+    assert engine._parse_consolidated(response) is None
+    assert engine._parse_consolidated(None) is None # type: ignore
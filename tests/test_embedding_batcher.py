@@ -0,0 +1,49 @@
+import threading
+import numpy as np
+import pytest
+from app.services.embedding_batcher import EmbeddingBatcher
+
+def fake_encode(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+    return encode
+
+def run_concurrently(batcher, inputs):
+    results = [None] * len(inputs)
+    barrier = threading.Barrier(len(inputs))
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher.encode(inputs[i])
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_calls_share_a_batch_and_get_their_own_rows():
+    calls = []
+    batcher = EmbeddingBatcher(fake_encode(calls), window_ms=200, max_batch=64)
+    inputs = [["a"], ["bb", "ccc"], ["dddd"]]
+    results = run_concurrently(batcher, inputs)
+    assert len(calls) == 1 and sorted(calls[0]) == ["a", "bb", "ccc", "dddd"]
+    for texts, vectors in zip(inputs, results):
+        assert vectors[:, 0].tolist() == [len(text) for text in texts]
+    stats = batcher.stats()
+    assert stats["batches"] == 1 and stats["requests"] == 3 and stats["batch_sizes"]["<=4"] == 1
+
+def test_full_batches_flush_early_and_large_calls_bypass():
+    calls = []
+    batcher = EmbeddingBatcher(fake_encode(calls), window_ms=10000, max_batch=2)
+    run_concurrently(batcher, [["a"], ["b"]])
+    assert len(calls) == 1
+    batcher.encode(["x", "y", "z"])
+    assert calls[-1] == ["x", "y", "z"] and batcher.stats()["batches"] == 1
+
+def test_encode_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model crashed")
+    batcher = EmbeddingBatcher(failing, window_ms=1, max_batch=8)
+    with pytest.raises(RuntimeError):
+        batcher.encode(["a"])
@@ -0,0 +1,65 @@
+import multiprocessing
+import numpy as np
+from app.services.embedding_cache import EmbeddingCache
+
+def make_cache(tmp_path, **kwargs):
+    return EmbeddingCache("all-MiniLM-L6-v2", 4, path=str(tmp_path), **kwargs)
+
+def test_roundtrip_across_restarts(tmp_path):
+    vectors = np.array([[1, 0, 0, 0], [0, 0.5, 0.5, 0]], dtype=np.float32)
+    cache = make_cache(tmp_path, memory_items=1)
+    assert cache.get_many(["python", "sql"]) == [None, None]
+    cache.put_many(["python", "sql"], vectors, encode_seconds=0.2)
+
+    reopened = make_cache(tmp_path)
+    found = reopened.get_many(["sql", "python", "java"])
+    np.testing.assert_allclose(found[0], vectors[1])
+    np.testing.assert_allclose(found[1], vectors[0])
+    assert found[2] is None
+    assert reopened.stats()["hits_disk"] == 2
+    assert reopened.stats()["disk_items"] == 2
+
+def test_model_name_is_part_of_the_key(tmp_path):
+    make_cache(tmp_path).put_many(["python"], np.ones((1, 4), dtype=np.float32))
+    other = EmbeddingCache("other-model", 4, path=str(tmp_path))
+    assert other.get_many(["python"]) == [None]
+
+def test_torn_write_is_ignored(tmp_path):
+    cache = make_cache(tmp_path, dtype="float32")
+    cache.put_many(["python"], np.ones((1, 4), dtype=np.float32))
+    with open(cache.index_file, "ab") as f:
+        f.write(b"x" * EmbeddingCache.DIGEST_SIZE)  # digest whose vector never landed
+    reopened = make_cache(tmp_path, dtype="float32")
+    assert reopened.stats()["disk_items"] == 1
+    reopened.put_many(["sql"], np.full((1, 4), 2, dtype=np.float32))
+    np.testing.assert_allclose(make_cache(tmp_path, dtype="float32").get_many(["sql"])[0], [2, 2, 2, 2])
+
+def test_stats_estimate_time_saved(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put_many(["a", "b"], np.ones((2, 4), dtype=np.float32), encode_seconds=1.0)
+    cache.get_many(["a", "b"])
+    stats = cache.stats()
+    assert stats["hits_memory"] == 2
+    assert stats["encode_seconds_saved"] == 1.0
+
+def _write_from_process(path: str, prefix: str):
+    cache = EmbeddingCache("all-MiniLM-L6-v2", 4, path=path)
+    for start in range(0, 300, 3):
+        texts = [f"{name}-{i}" for i in range(start, start + 3) for name in (prefix, "shared")]
+        cache.put_many(texts, np.array([[float(text.split("-")[1])] * 4 for text in texts], dtype=np.float32))
+
+def test_two_processes_append_to_the_same_files(tmp_path):
+    reader = make_cache(tmp_path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_write_from_process, args=(str(tmp_path), prefix)) for prefix in ("a", "b")]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    texts = [f"{name}-{i}" for i in range(300) for name in ("a", "b", "shared")]
+    for cache in (reader, make_cache(tmp_path)):  # rows written elsewhere, seen live and after reopening
+        found = cache.get_many(texts)
+        assert all(vector is not None and vector[0] == float(text.split("-")[1]) for text, vector in zip(texts, found))
+        assert cache.stats()["disk_items"] == len(texts)
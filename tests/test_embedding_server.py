@@ -0,0 +1,58 @@
+import threading
+import numpy as np
+import pytest
+from app.config import Config
+from app.services.embedding_server import EmbeddingClient, EmbeddingServer, EmbeddingServerError, pack_texts, unpack_texts
+
+class FakeRAGService:
+    encoder_id = "fake-encoder"
+
+    def encode(self, texts):
+        if "boom" in texts:
+            raise ValueError("encoder failed")
+        return np.array([[len(text), 0.5, -1.0] for text in texts], dtype=np.float32)
+
+    def query_batch(self, texts, framework, n_results, exact_texts=None):
+        probes = exact_texts or texts
+        return [[{"skill": f"{probe} skill", "framework": framework}][:n_results] for probe in probes]
+
+@pytest.fixture
+def server(tmp_path):
+    server = EmbeddingServer(FakeRAGService(), str(tmp_path / "embeddings.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_texts_round_trip_through_the_framing():
+    texts = ["Python", "", "naïve Bayes", "x" * 1000]
+    assert unpack_texts(pack_texts(texts)) == texts
+
+def test_client_encodes_and_queries_over_the_socket(server):
+    client = EmbeddingClient(server.server_address)
+    assert client.info() == {"encoder_id": "fake-encoder"}
+    vectors = client.encode(["ab", "abcd"])
+    assert vectors.dtype == np.float32 and vectors.tolist() == [[2, 0.5, -1], [4, 0.5, -1]]
+    assert client.encode([]).shape == (0, 0)
+    assert client.query_batch(["Python"], "ESCO", 5) == [[{"skill": "Python skill", "framework": "ESCO"}]]
+    assert client.query_batch(["Skills for SQL"], "ESCO", 5, ["SQL"]) == [[{"skill": "SQL skill", "framework": "ESCO"}]]
+    with pytest.raises(EmbeddingServerError, match="encoder failed"):
+        client.encode(["boom"])
+    # The connection stays usable after a server-side error
+    assert client.encode(["a"]).shape == (1, 3)
+
+def test_rag_service_delegates_to_the_server(server, monkeypatch):
+    from app.services.rag_service import RAGService
+    monkeypatch.setattr(Config, "EMBEDDING_SERVER_SOCKET", server.server_address)
+    monkeypatch.setattr(Config, "EMBEDDING_SERVER_QUERY", True)
+    rag_service = RAGService()
+    assert rag_service.encoder is None and rag_service.collection is None and rag_service.index is None
+    rag_service.warmup()
+    assert rag_service.query("Python", "O*NET", 3) == [{"skill": "Python skill", "framework": "O*NET"}]
+    assert rag_service.encode(["abc"]).tolist() == [[3, 0.5, -1]]
+
+def test_unreachable_server_raises(tmp_path):
+    client = EmbeddingClient(str(tmp_path / "missing.sock"))
+    with pytest.raises(EmbeddingServerError):
+        client.wait_ready(timeout=0.3)
@@ -0,0 +1,32 @@
+import sys
+import types
+import numpy as np
+from app.config import Config
+from app.services import encoder as encoder_module
+
+class FakeModel:
+    def __init__(self, name, device=None, backend="torch", model_kwargs=None):
+        self.backend = backend
+
+    def encode(self, texts):
+        vectors = np.stack([np.arange(1, 5, dtype=np.float32) + len(text) for text in texts])
+        if self.backend == "onnx":
+            vectors = vectors + self.noise
+        return vectors
+
+def use_fake_models(monkeypatch, noise):
+    FakeModel.noise = noise
+    monkeypatch.setattr(encoder_module, "SentenceTransformer", FakeModel)
+    monkeypatch.setitem(sys.modules, "onnxruntime", types.SimpleNamespace(SessionOptions=types.SimpleNamespace))
+    monkeypatch.setattr(Config, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(Config, "EMBEDDING_THREADS", 0)
+
+def test_quantized_encoder_kept_when_probes_agree(monkeypatch):
+    use_fake_models(monkeypatch, np.float32(0.01))
+    encoder, encoder_id = encoder_module.load_encoder()
+    assert encoder.backend == "onnx" and encoder_id.endswith(Config.EMBEDDING_ONNX_FILE)
+
+def test_falls_back_to_float_model_when_probes_disagree(monkeypatch):
+    use_fake_models(monkeypatch, np.array([40, -40, 40, -40], dtype=np.float32))
+    encoder, encoder_id = encoder_module.load_encoder()
+    assert encoder.backend == "torch" and encoder_id == Config.EMBEDDING_MODEL
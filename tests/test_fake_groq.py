@@ -0,0 +1,26 @@
+import json
+from groq import Groq
+from benchmarks.fake_groq import BackgroundServer, create_app
+from benchmarks.workload import generate_jobs
+
+def test_groq_client_gets_canned_responses_from_fake_server():
+    with BackgroundServer(create_app(latency_ms=1, jitter_ms=0), 8917) as server:
+        client = Groq(api_key="test", base_url=server.url)
+        response = client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": "Output ONLY valid JSON: {\"hard_skills\": [...]}"}]
+        )
+        assert "hard_skills" in json.loads(response.choices[0].message.content) # type: ignore
+        stream = client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": "Describe the role."}],
+            stream=True
+        )
+        text = "".join(chunk.choices[0].delta.content or "" for chunk in stream)
+        assert text.startswith("The role owns")
+
+def test_workload_is_deterministic_with_repeats():
+    jobs = generate_jobs(50, repeat_ratio=0.5, seed=3)
+    assert jobs == generate_jobs(50, repeat_ratio=0.5, seed=3)
+    assert len({tuple(job.values()) for job in jobs}) < 50
+    assert set(jobs[0]) == {"role", "domain", "industry"}
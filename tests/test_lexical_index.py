@@ -0,0 +1,57 @@
+from app.data.lexical_index import LexicalIndex, tokenize
+from app.services.rag_service import RAGService
+
+def build_index(tmp_path):
+    metadatas = [
+        {"skill": "Apache Spark", "element_id": "s1"},
+        {"skill": "SQL", "element_id": "s2"},
+        {"skill": "SQL Server", "element_id": "s3"},
+        {"skill": "teamwork", "element_id": "s4"}
+    ]
+    documents = [
+        "Apache Spark: distributed data processing engine.",
+        "SQL: query language for relational databases.",
+        "SQL Server: Microsoft relational database management system using SQL.",
+        "teamwork: collaborate with others towards shared goals."
+    ]
+    LexicalIndex.write_partition(str(tmp_path), "ESCO", ["a", "b", "c", "d"], documents, metadatas)
+    return LexicalIndex(str(tmp_path))
+
+def test_tokenize_keeps_technology_symbols():
+    assert tokenize("Skills for C++ and Node.js in the industry") == ["c++", "node.js"]
+
+def test_bm25_ranks_name_matches_and_skips_unmatched(tmp_path):
+    index = build_index(tmp_path)
+    assert [m["skill"] for m in index.search("apache spark developer", "ESCO")] == ["Apache Spark"]
+    assert [m["skill"] for m in index.search("relational databases", "ESCO", 2)] == ["SQL", "SQL Server"]
+    assert index.search("astronomy", "ESCO") == [] and index.search("sql", "O*NET") == []
+
+def test_exact_name_lookup(tmp_path):
+    index = build_index(tmp_path)
+    assert [m["element_id"] for m in index.exact(" sql ", "ESCO")] == ["s2"]
+    assert index.exact("sql databases", "ESCO") == []
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    dense = [{"element_id": "a"}, {"element_id": "b"}, {"element_id": "c"}]
+    lexical = [{"element_id": "c"}, {"element_id": "b"}]
+    assert [m["element_id"] for m in RAGService._fuse([dense, lexical], 2)] == ["c", "b"]
+
+def test_bare_name_probe_is_fused_with_dense_results_for_a_templated_query(tmp_path):
+    rag = RAGService.__new__(RAGService)
+    rag.server, rag.lexical_index = None, build_index(tmp_path)
+    encoded = []
+    rag._dense_query_batch = lambda texts, framework, n_results: encoded.extend(texts) or [[] for _ in texts]
+    queries = ["Skills for SQL role in Finance industry in ESCO", "Skills for Nurse role in Health industry in ESCO"]
+    results = rag.query_batch(queries, "ESCO", 2, exact_texts=["SQL", "Nurse"])
+    assert results[0][0]["element_id"] == "s2"
+    # A probe hit on a templated query still runs the dense search
+    assert encoded == queries
+
+def test_bare_skill_name_query_skips_encoding(tmp_path):
+    rag = RAGService.__new__(RAGService)
+    rag.server, rag.lexical_index = None, build_index(tmp_path)
+    encoded = []
+    rag._dense_query_batch = lambda texts, framework, n_results: encoded.extend(texts) or [[] for _ in texts]
+    results = rag.query_batch(["SQL", "Nurse"], "ESCO", 2)
+    assert results[0][0]["element_id"] == "s2"
+    assert encoded == ["Nurse"]
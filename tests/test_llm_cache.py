@@ -0,0 +1,67 @@
+import asyncio
+import time
+from app.services.llm_cache import LLMCache
+
+def make_cache(tmp_path, **kwargs):
+    options = {"ttl": 60, "max_memory_entries": 2, "max_disk_entries": 100}
+    options.update(kwargs)
+    return LLMCache(path=str(tmp_path / "llm_cache.sqlite3"), **options)
+
+def test_key_depends_on_every_input():
+    base = LLMCache.make_key("model", "system", "prompt", 500)
+    assert base == LLMCache.make_key("model", "system", "prompt", 500)
+    assert base != LLMCache.make_key("other", "system", "prompt", 500)
+    assert base != LLMCache.make_key("model", "other", "prompt", 500)
+    assert base != LLMCache.make_key("model", "system", "other", 500)
+    assert base != LLMCache.make_key("model", "system", "prompt", 100)
+
+def test_memory_and_disk_tiers(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get("a") is None
+    cache.set("a", "first")
+    cache.set("b", "second")
+    cache.set("c", "third")  # evicts "a" from the memory tier only
+    assert cache.get("a") == "first"
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits_disk"] == 1
+    assert stats["memory_entries"] == 2
+    assert stats["disk_entries"] == 3
+
+def test_disk_tier_survives_restart(tmp_path):
+    make_cache(tmp_path).set("a", "persisted")
+    assert make_cache(tmp_path).get("a") == "persisted"
+
+def test_ttl_expiry(tmp_path):
+    cache = make_cache(tmp_path, ttl=1)
+    cache.set("a", "value")
+    time.sleep(1.1)
+    assert cache.get("a") is None
+    assert cache.stats()["disk_entries"] == 0
+
+def test_disk_size_bound(tmp_path):
+    cache = make_cache(tmp_path, max_disk_entries=5)
+    for i in range(LLMCache.PRUNE_EVERY):
+        cache.set(str(i), "value")
+    assert cache.stats()["disk_entries"] == 5
+
+def test_async_access_and_batched_touches(tmp_path, monkeypatch):
+    monkeypatch.setattr(LLMCache, "TOUCH_BATCH", 2)
+    cache = make_cache(tmp_path, max_memory_entries=1)
+
+    def accessed_at(key):
+        return cache._conn.execute("SELECT accessed_at FROM llm_cache WHERE key = ?", (key,)).fetchone()[0]
+
+    async def scenario():
+        await cache.aset("a", "first")
+        await cache.aset("b", "second")  # evicts "a" from the memory tier
+        written = accessed_at("a")
+        assert await cache.aget("a") == "first"
+        assert accessed_at("a") == written  # buffered, not written per hit
+        assert await cache.aget("b") == "second"  # promoting "a" evicted "b", so this is the second disk hit
+        assert accessed_at("a") > written
+        assert await cache.aget("missing") is None
+
+    asyncio.run(scenario())
+    stats = asyncio.run(cache.astats())
+    assert stats["hits_disk"] == 2 and stats["misses"] == 1 and stats["disk_entries"] == 2
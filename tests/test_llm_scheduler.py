@@ -0,0 +1,84 @@
+import asyncio
+import time
+import httpx
+import groq
+import pytest
+from app.config import Config
+from app.services.llm_scheduler import AdaptiveLimiter, LLMScheduler, LLMUnavailableError, retry_after_seconds
+from benchmarks.fake_groq import BackgroundServer, create_app
+
+def rate_limit_error(retry_after: str) -> groq.RateLimitError:
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=httpx.Request("POST", "http://groq"))
+    return groq.RateLimitError("Rate limit reached", response=response, body=None)
+
+def test_limiter_adds_on_fast_windows_and_halves_on_throttling():
+    limiter = AdaptiveLimiter(initial=8, min_limit=1, max_limit=10, latency_tolerance=2.0)
+    for _ in range(8):
+        limiter.on_success(0.1)
+    assert limiter.limit == 9
+    for _ in range(9):
+        limiter.on_success(0.5)  # Median 5x the baseline
+    assert limiter.limit == pytest.approx(8.1)
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == pytest.approx(2.025)
+    assert limiter.try_acquire() and limiter.try_acquire() and not limiter.try_acquire()
+
+def test_retries_wait_for_retry_after_then_give_up(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE_MS", 1.0)
+    scheduler = LLMScheduler(AdaptiveLimiter(initial=4), max_retries=2, hedge=False)
+    calls = []
+
+    async def flaky():
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            raise rate_limit_error("0.1")
+        return "ok"
+
+    assert asyncio.run(scheduler.call(flaky)) == "ok"
+    assert calls[1] - calls[0] >= 0.1 and calls[2] - calls[1] >= 0.1
+    assert scheduler.limiter.limit == 1  # Halved twice from 4
+
+    async def throttled():
+        raise rate_limit_error("0.01")
+
+    with pytest.raises(LLMUnavailableError) as info:
+        asyncio.run(scheduler.call(throttled))
+    assert info.value.retry_after == pytest.approx(0.01)
+    assert retry_after_seconds(rate_limit_error("Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+
+def test_slow_call_is_hedged(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_HEDGE_MIN_SAMPLES", 10)
+    scheduler = LLMScheduler(AdaptiveLimiter(initial=4), hedge=True)
+    for _ in range(20):
+        scheduler.latencies.add(0.02)
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(2.0 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    started = time.perf_counter()
+    assert asyncio.run(scheduler.call(request, hedge=True)) == 2
+    assert time.perf_counter() - started < 1.0
+    assert scheduler.limiter.inflight == 0
+
+def test_burst_against_rate_limited_fake_groq_succeeds(monkeypatch):
+    monkeypatch.setenv("GROQ_BASE_URL", "http://127.0.0.1:8918")
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_BACKOFF_BASE_MS", 20.0)
+    monkeypatch.setattr(Config, "LLM_MAX_RETRIES", 8)
+    monkeypatch.setattr(Config, "LLM_CONCURRENCY_INITIAL", 32)
+    from app.services.llm_service import LLMService
+    fake = create_app(latency_ms=50, jitter_ms=0, max_concurrency=4, retry_after=0.05)
+    with BackgroundServer(fake, 8918):
+        service = LLMService()
+
+        async def burst():
+            return await asyncio.gather(*(service.agenerate(f"Describe role {i}.") for i in range(40)))
+
+        results = asyncio.run(burst())
+    assert all(result.startswith("The role owns") for result in results)
+    assert fake.state.rate_limited > 0
+    assert service.scheduler.limiter.limit < 32
@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+from app.services.metrics import Counter, Histogram, LLM_TOKENS, record_usage, start_request_timing, timed
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, stage="encode")
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="encode",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="encode",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{stage="encode",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{stage="encode"} 4' in lines
+    assert "# TYPE test_seconds histogram" in lines
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test.", ("site",))
+    counter.inc(site='a"b')
+    counter.inc(2, site='a"b')
+    assert 'test_total{site="a\\"b"} 3' in counter.render()
+
+def test_request_timing_collects_spans_from_tasks_and_threads():
+    async def run():
+        timing = start_request_timing()
+
+        def blocking():
+            with timed("encode"):
+                pass
+
+        async def branch():
+            with timed("llm_generate"):
+                await asyncio.to_thread(blocking)
+
+        await asyncio.gather(branch(), branch())
+        return timing
+
+    timing = asyncio.run(run())
+    assert timing.stages["encode"][1] == 2
+    assert timing.stages["llm_generate"][1] == 2
+    header = timing.header()
+    assert header.startswith("llm_generate;dur=") or header.startswith("encode;dur=")
+    assert "total;dur=" in header
+
+def test_record_usage_counts_tokens():
+    before = LLM_TOKENS.value(method="test", type="prompt")
+    record_usage("test", SimpleNamespace(prompt_tokens=12, completion_tokens=5))
+    record_usage("test", None)
+    assert LLM_TOKENS.value(method="test", type="prompt") == before + 12
+    assert LLM_TOKENS.value(method="test", type="completion") >= 5
@@ -0,0 +1,30 @@
+import numpy as np
+from app.data.numpy_index import NumpyIndex
+
+def build_index(tmp_path):
+    embeddings = np.array([[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]], dtype=np.float32)
+    metadatas = [{"skill": "Python"}, {"skill": "Communication"}, {"skill": "SQL"}]
+    NumpyIndex.write_partition(str(tmp_path), "O*NET", ["a", "b", "c"], embeddings, metadatas)
+    NumpyIndex.write_partition(str(tmp_path), "ESCO", ["d"], np.array([[0, 0, 1]]), [{"skill": "teamwork"}])
+    return NumpyIndex(str(tmp_path))
+
+def test_top_k_ranked_by_cosine(tmp_path):
+    index = build_index(tmp_path)
+    assert set(index.partitions) == {"O*NET", "ESCO"}
+    results = index.query(np.array([2, 0, 0]), "O*NET", n_results=2)
+    assert [meta["skill"] for meta in results] == ["Python", "SQL"]
+
+def test_batch_queries_and_partition_filter(tmp_path):
+    index = build_index(tmp_path)
+    results = index.query_batch(np.array([[0, 1, 0], [1, 0, 0]]), "O*NET", n_results=10)
+    assert [meta["skill"] for meta in results[0]] == ["Communication", "SQL", "Python"]
+    assert results[1][0]["skill"] == "Python"
+    assert [meta["skill"] for meta in index.query(np.array([1, 0, 0]), "ESCO")] == ["teamwork"]
+    assert index.query(np.array([1, 0, 0]), "NSQF") == []
+
+def test_partitions_stay_memory_mapped_and_blocks_agree(tmp_path, monkeypatch):
+    index = build_index(tmp_path)
+    assert isinstance(index.partitions["O*NET"][0], np.memmap) and index.partitions["O*NET"][0].dtype == np.float16
+    expected = index.query_batch(np.array([[0, 1, 0], [1, 0, 0]]), "O*NET", n_results=3)
+    monkeypatch.setattr(NumpyIndex, "BLOCK_ROWS", 2)
+    assert index.query_batch(np.array([[0, 1, 0], [1, 0, 0]]), "O*NET", n_results=3) == expected
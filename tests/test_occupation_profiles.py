@@ -0,0 +1,97 @@
+import pandas as pd
+from app.data.occupation_profiles import OccupationProfiles
+from app.data.occupation_ratings import OccupationRatings
+
+def build_profiles():
+    skills = pd.DataFrame({
+        "O*NET-SOC Code": ["15-2051.00", "15-2051.00", "15-2051.00", "29-1141.00"],
+        "Element ID": ["2.A.1.a", "2.A.1.a", "2.A.2.a", "2.B.1.a"],
+        "Element Name": ["Reading Comprehension", "Reading Comprehension", "Critical Thinking", "Social Perceptiveness"],
+        "Scale ID": ["IM", "LV", "IM", "IM"],
+        "Data Value": [3.5, 4.0, 4.25, 4.5]
+    })
+    tech = pd.DataFrame({
+        "O*NET-SOC Code": ["15-2051.00", "15-2051.00", "29-1141.00"],
+        "Example": ["Python", "SAS", "Python"],
+        "Commodity Title": ["Object oriented development software", "Analytical software", "Object oriented development software"],
+        "Hot Technology": ["Y", "N", "Y"],
+        "In Demand": ["Y", "N", "N"]
+    })
+    styles = pd.DataFrame({
+        "O*NET-SOC Code": ["15-2051.00"],
+        "Element ID": ["1.C.4.b"],
+        "Element Name": ["Analytical Thinking"],
+        "Scale ID": ["IM"],
+        "Data Value": [4.8]
+    })
+    return OccupationProfiles.from_frames(OccupationRatings.from_frame(skills), tech, styles)
+
+def test_candidates_follow_quotas_and_ranking():
+    profiles = build_profiles()
+    assert "15-2051.00" in profiles and "99-9999.00" not in profiles
+    names = [c["name"] for c in profiles.candidates("15-2051.00")]
+    assert names == ["Python", "SAS", "Critical Thinking", "Reading Comprehension", "Analytical Thinking"]
+    limited = profiles.candidates("15-2051.00", k=3, quotas={0: 1, 2: 1})
+    assert [(c["name"], c["kind"]) for c in limited] == [("Critical Thinking", "skill"), ("Analytical Thinking", "work_style"), ("Reading Comprehension", "skill")]
+    assert profiles.candidates("99-9999.00") == []
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "profiles.npz")
+    build_profiles().save(path)
+    profiles = OccupationProfiles.load(path)
+    assert [c["name"] for c in profiles.candidates("29-1141.00")] == ["Python", "Social Perceptiveness"]
+    assert OccupationProfiles.load(str(tmp_path / "missing.npz")) is None
+
+def test_build_reads_the_saved_ratings_index(tmp_path, monkeypatch):
+    from app.config import Config
+    path = str(tmp_path / "ratings.npz")
+    OccupationRatings.from_frame(pd.DataFrame({
+        "O*NET-SOC Code": ["15-2051.00"], "Element ID": ["2.A.2.a"], "Element Name": ["Critical Thinking"],
+        "Scale ID": ["IM"], "Data Value": [4.0]
+    })).save(path)
+    monkeypatch.setattr(Config, "ONET_RATINGS_PATH", path)
+
+    class Loader:
+        def load_onet(self):
+            raise AssertionError("Skills.txt should not be re-parsed")
+
+        def load_onet_technology_skills(self):
+            return pd.DataFrame()
+
+        def load_onet_work_styles(self):
+            return pd.DataFrame()
+
+    profiles = OccupationProfiles.build(Loader())
+    [candidate] = profiles.candidates("15-2051.00")
+    assert (candidate["name"], candidate["kind"]) == ("Critical Thinking", "skill")
+    assert abs(candidate["score"] - 0.8) < 1e-6
+
+def test_engine_uses_profile_only_for_an_unambiguous_title():
+    import asyncio
+    from app.core.job_normalizer import JobNormalizer
+    from app.core.title_index import TitleIndex
+    from app.services.recommendation_engine import RecommendationEngine
+
+    class FakeRag:
+        def __init__(self):
+            self.queries = []
+
+        def query(self, query, framework, n_results=5, exact_text=None):
+            self.queries.append(query)
+            return [{"skill": "Leadership"}]
+
+    onet = pd.DataFrame({
+        "code": ["15-2051.00", "29-1141.00", "11-3021.00"],
+        "title": ["Data Scientists", "Nurse Manager", "IT Manager"],
+        "weight": [1.0, 1.0, 1.0]
+    })
+    engine = RecommendationEngine.__new__(RecommendationEngine)
+    engine.normalizer = JobNormalizer(title_index=TitleIndex.from_frames(onet, onet.iloc[:0]))
+    engine.profiles = build_profiles()
+    engine.rag_service = FakeRag()
+
+    skills = asyncio.run(engine._candidate_skills("O*NET", "Data Scientist", "Technology", supplement=False))
+    assert "Python" in skills and engine.rag_service.queries == []
+    # "Manager" ties the nurse and IT manager codes, so it must not borrow either profile
+    skills = asyncio.run(engine._candidate_skills("O*NET", "Manager", "Healthcare", supplement=False))
+    assert skills == ["Leadership"] and len(engine.rag_service.queries) == 1
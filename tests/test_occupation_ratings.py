@@ -0,0 +1,25 @@
+import pandas as pd
+from app.data.occupation_ratings import OccupationRatings
+
+def make_skills_frame():
+    return pd.DataFrame({
+        "O*NET-SOC Code": ["15-2051.00", "15-2051.00", "15-2051.00", "15-2051.00", "11-1011.00", "11-1011.00"],
+        "Element ID": ["2.A.1.a", "2.A.1.a", "2.B.1.a", "2.B.1.a", "2.A.1.a", "2.A.1.a"],
+        "Element Name": ["Reading Comprehension", "Reading Comprehension", "Social Perceptiveness", "Social Perceptiveness", "Reading Comprehension", "Reading Comprehension"],
+        "Scale ID": ["IM", "LV", "IM", "LV", "IM", "LV"],
+        "Data Value": [3.5, 4.0, 4.5, 3.0, 4.25, 5.0]
+    })
+
+def test_lookup_by_occupation_and_element():
+    ratings = OccupationRatings.from_frame(make_skills_frame())
+    assert ratings.values.shape == (2, 2, 2)
+    assert ratings.get("15-2051.00", "2.B.1.a") == {"importance": 4.5, "level": 3.0}
+    assert ratings.get("11-1011.00", "2.B.1.a") == {"importance": None, "level": None}
+    assert ratings.get("99-9999.00", "2.A.1.a") is None
+
+def test_for_occupation_sorted_by_importance(tmp_path):
+    path = str(tmp_path / "ratings.npz")
+    OccupationRatings.from_frame(make_skills_frame()).save(path)
+    ratings = OccupationRatings.load(path)
+    assert [element for element, _, _ in ratings.for_occupation("15-2051.00")] == ["2.B.1.a", "2.A.1.a"]
+    assert ratings.for_occupation("11-1011.00") == [("2.A.1.a", 4.25, 5.0)]
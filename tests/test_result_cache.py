@@ -0,0 +1,91 @@
+import asyncio
+from app.services.recommendation_engine import country_for_domain
+from app.services.result_cache import ResultCache, normalize_request_key
+
+def test_normalized_key_ignores_case_whitespace_and_domain_alias():
+    assert normalize_request_key("Data  Scientist ", "US", "Tech") == normalize_request_key("data scientist", "united states", " TECH")
+    assert normalize_request_key("Data Scientist", "EU", "Tech") != normalize_request_key("Data Scientist", "US", "Tech")
+
+def test_country_is_the_same_for_every_spelling_sharing_a_key():
+    assert {country_for_domain(domain) for domain in ("us", "US", " United  States", "usa")} == {"USA"}
+    assert country_for_domain("Germany") == "Germany"
+
+def test_concurrent_identical_requests_share_one_computation():
+    cache = ResultCache(ttl=60, max_entries=10)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        key = normalize_request_key("Data Scientist", "US", "Tech")
+        results = await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(10)))
+        cached = await cache.get_or_compute(key, compute)
+        return results, cached
+
+    results, cached = asyncio.run(run())
+    assert results == ["result"] * 10
+    assert cached == "result"
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 9
+    assert cache.stats()["hits"] == 1
+
+def test_failures_are_not_cached():
+    cache = ResultCache(ttl=60, max_entries=10)
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def run():
+        try:
+            await cache.get_or_compute(("a",), fail)
+        except RuntimeError:
+            pass
+        return cache.get(("a",))
+
+    assert asyncio.run(run()) is None
+
+def test_invalidate_and_max_entries():
+    cache = ResultCache(ttl=60, max_entries=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.set(("c",), 3)
+    assert cache.get(("a",)) is None
+    assert cache.invalidate(("b",)) == 1
+    assert cache.invalidate() == 1
+    assert cache.get(("c",)) is None
+
+def test_last_cancelled_waiter_cancels_the_computation():
+    cache = ResultCache(ttl=60, max_entries=10)
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        first = asyncio.create_task(cache.get_or_compute(("a",), compute))
+        second = asyncio.create_task(cache.get_or_compute(("a",), compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled  # "second" still waits on it
+        second.cancel()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert cancelled == [1]
+    assert cache.stats()["in_flight"] == 0
+
+def test_set_if_current_skips_writes_across_an_invalidation():
+    cache = ResultCache(ttl=60, max_entries=10)
+    generation = cache.generation
+    cache.invalidate()
+    assert not cache.set_if_current(("a",), "stale", generation)
+    assert cache.get(("a",)) is None
+    assert cache.set_if_current(("a",), "fresh", cache.generation) and cache.get(("a",)) == "fresh"
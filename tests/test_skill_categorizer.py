@@ -0,0 +1,67 @@
+import asyncio
+import numpy as np
+from app.core.skill_categorizer import SkillCategorizer
+from app.core.skill_classifier import SkillTypeClassifier
+from app.services.recommendation_engine import RecommendationEngine
+
+class FakeLLM:
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt, max_tokens=500, use_cache=True):
+        self.prompts.append(prompt)
+        return self.response
+
+class FakeRAG:
+    # "python"-like names sit on the first axis, "teamwork"-like names on the second
+    vectors = {"Python": [1.0, 0.0], "Teamwork": [0.0, 1.0], "Negotiation": [0.7, 0.7]}
+
+    def encode(self, texts):
+        return np.array([self.vectors[text] for text in texts], dtype=np.float32)
+
+def make_classifier():
+    embeddings = np.array([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0], [0.1, 0.99]], dtype=np.float32)
+    return SkillTypeClassifier(embeddings, np.array([0, 0, 1, 1]))
+
+def test_confident_skills_skip_the_llm_and_rest_are_batched():
+    llm = FakeLLM('{"Negotiation": "Soft"}')
+    categorizer = SkillCategorizer(llm, FakeRAG(), make_classifier())
+    hard, soft = categorizer.categorize([{"name": "Python"}, {"name": "Teamwork"}, {"name": "Negotiation"}])
+    assert [s["name"] for s in hard] == ["Python"]
+    assert [s["name"] for s in soft] == ["Teamwork", "Negotiation"]
+    assert len(llm.prompts) == 1 and "Negotiation" in llm.prompts[0] and "- Teamwork" not in llm.prompts[0]
+
+def test_results_memoized_by_normalized_name():
+    llm = FakeLLM('{"Data  Analysis": "Hard", "Empathy": "Soft"}')
+    categorizer = SkillCategorizer(llm)
+    categorizer.categorize([{"name": "Data  Analysis"}, {"name": "Empathy"}])
+    hard, soft = categorizer.categorize([{"name": "data analysis"}, {"name": "EMPATHY"}])
+    assert [s["name"] for s in hard] == ["data analysis"] and [s["name"] for s in soft] == ["EMPATHY"]
+    assert len(llm.prompts) == 1
+
+def test_unparseable_batch_defaults_to_soft_without_memoizing():
+    llm = FakeLLM("not json")
+    categorizer = SkillCategorizer(llm)
+    hard, soft = categorizer.categorize([{"name": "Kubernetes"}])
+    assert hard == [] and soft[0]["category"] == "Soft"
+    categorizer.categorize([{"name": "Kubernetes"}])
+    assert len(llm.prompts) == 2
+
+def test_unbatched_mode_calls_llm_per_skill():
+    llm = FakeLLM("Hard")
+    hard, _ = SkillCategorizer(llm).categorize([{"name": "SQL"}, {"name": "Excel"}], batch=False)
+    assert len(hard) == 2 and len(llm.prompts) == 2
+
+def test_engine_categorizes_with_its_shared_categorizer_when_the_llm_json_is_unusable():
+    class EngineLLM(FakeLLM):
+        async def agenerate(self, prompt, max_tokens=500, use_cache=True, json_mode=False):
+            return "Sure! Here are the skills..."
+
+    engine = RecommendationEngine.__new__(RecommendationEngine)
+    engine.llm_service = EngineLLM('{"Negotiation": "Soft"}')
+    engine.categorizer = SkillCategorizer(engine.llm_service, FakeRAG(), make_classifier())
+    skills = asyncio.run(engine._get_framework_skills("ESCO", "Buyer", "Retail", candidate_skills=["Python", "Teamwork", "Negotiation"]))
+    assert [s.name for s in skills.hard_skills] == ["Python"]
+    assert [s.name for s in skills.soft_skills] == ["Teamwork", "Negotiation"]
+    assert len(engine.llm_service.prompts) == 1  # Only the ambiguous skill went to the LLM
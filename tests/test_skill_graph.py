@@ -0,0 +1,44 @@
+import pandas as pd
+from app.data.skill_graph import SkillGraph
+
+def build_graph():
+    skills = pd.DataFrame({
+        "Element ID": ["s:python", "s:pandas", "s:numpy", "s:sql", "s:teamwork"],
+        "Element Name": ["Python", "pandas", "NumPy", "SQL", "teamwork"]
+    })
+    relations = pd.DataFrame({
+        "originalSkillUri": ["s:python", "s:python", "s:pandas"],
+        "relationType": ["optional", "essential", "optional"],
+        "relatedSkillUri": ["s:pandas", "s:sql", "s:numpy"]
+    })
+    broader = pd.DataFrame({
+        "conceptType": ["KnowledgeSkillCompetence", "KnowledgeSkillCompetence", "KnowledgeSkillCompetence", "SkillGroup"],
+        "conceptUri": ["s:python", "s:sql", "s:teamwork", "g:programming"],
+        "broaderUri": ["g:programming", "g:programming", "g:social", "g:ict"]
+    })
+    hierarchy = pd.DataFrame({
+        "Level 0 URI": ["g:ict", "g:ict"], "Level 0 preferred term": ["ICT", "ICT"],
+        "Level 1 URI": [None, "g:programming"], "Level 1 preferred term": [None, "programming"],
+        "Level 2 URI": [None, None], "Level 2 preferred term": [None, None],
+        "Level 3 URI": [None, None], "Level 3 preferred term": [None, None]
+    })
+    return SkillGraph.from_frames(skills, relations, broader, hierarchy)
+
+def test_bounded_expansion_orders_essential_first():
+    graph = build_graph()
+    assert graph.expand(["s:python"]) == ["s:sql", "s:pandas"]
+    assert graph.expand(["s:python"], depth=2) == ["s:sql", "s:pandas", "s:numpy"]
+    assert graph.expand(["s:python"], depth=2, limit=1) == ["s:sql"]
+    assert graph.expand(["s:unknown"]) == []
+
+def test_siblings_share_a_hierarchy_group():
+    graph = build_graph()
+    assert graph.siblings("s:python") == ["s:sql"]
+    assert graph.siblings("s:teamwork") == []
+    assert graph.label("g:programming") == "programming"
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "skill_graph.npz")
+    build_graph().save(path)
+    graph = SkillGraph.load(path)
+    assert graph.expand(["s:pandas"]) == ["s:numpy"] and graph.label("s:numpy") == "NumPy"
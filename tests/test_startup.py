@@ -0,0 +1,79 @@
+import subprocess
+import sys
+import time
+import pytest
+from fastapi.testclient import TestClient
+import app.main as main_module
+from app.config import Config
+
+def test_importing_the_app_defers_heavy_dependencies():
+    code = "import sys, app.main; print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded = set(result.stdout.split())
+    assert not loaded & {"torch", "sentence_transformers", "chromadb", "groq"}
+
+def test_server_accepts_requests_while_the_engine_warms_up(monkeypatch):
+    monkeypatch.setattr(Config, "BACKGROUND_WARMUP", True)
+
+    def slow_build():
+        time.sleep(0.5)
+        return object()
+
+    monkeypatch.setattr(main_module, "build_engine", slow_build)
+    with TestClient(main_module.app) as client:
+        assert client.get("/ready").status_code == 503
+        assert client.get("/metrics").status_code == 200
+        deadline = time.time() + 10
+        while client.get("/ready").status_code != 200 and time.time() < deadline:
+            time.sleep(0.05)
+        assert client.get("/ready").json() == {"status": "ready"}
+
+def broken_build():
+    raise RuntimeError("collection missing")
+
+def test_failed_blocking_warmup_fails_startup(monkeypatch):
+    monkeypatch.setattr(Config, "BACKGROUND_WARMUP", False)
+    monkeypatch.setattr(main_module, "build_engine", broken_build)
+    with pytest.raises(RuntimeError, match="collection missing"):
+        with TestClient(main_module.app):
+            pass
+
+def test_background_warmup_retries_then_exits(monkeypatch):
+    monkeypatch.setattr(Config, "BACKGROUND_WARMUP", True)
+    monkeypatch.setattr(Config, "WARMUP_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(Config, "WARMUP_RETRY_SECONDS", 0.01)
+    attempts, exits = [], []
+
+    def build():
+        attempts.append(1)
+        broken_build()
+
+    monkeypatch.setattr(main_module, "build_engine", build)
+    monkeypatch.setattr(main_module, "exit_process", lambda: exits.append(1))
+    with TestClient(main_module.app) as client:
+        deadline = time.time() + 10
+        while not exits and time.time() < deadline:
+            time.sleep(0.02)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "failed", "detail": "collection missing"}
+    assert len(attempts) == 3 and len(exits) == 1
+
+def test_background_warmup_recovers_after_a_failed_attempt(monkeypatch):
+    monkeypatch.setattr(Config, "BACKGROUND_WARMUP", True)
+    monkeypatch.setattr(Config, "WARMUP_RETRY_SECONDS", 0.01)
+    attempts = []
+
+    def flaky_build():
+        attempts.append(1)
+        if len(attempts) == 1:
+            broken_build()
+        return object()
+
+    monkeypatch.setattr(main_module, "build_engine", flaky_build)
+    with TestClient(main_module.app) as client:
+        deadline = time.time() + 10
+        while client.get("/ready").status_code != 200 and time.time() < deadline:
+            time.sleep(0.02)
+        assert client.get("/ready").json() == {"status": "ready"}
+    assert len(attempts) == 2
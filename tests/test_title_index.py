@@ -0,0 +1,61 @@
+import pandas as pd
+from app.core.title_index import TitleIndex, normalize_title
+
+def build_index():
+    onet = pd.DataFrame({
+        "code": ["15-2051.00", "15-2051.00", "15-1252.00", "29-1141.00"],
+        "title": ["Data Scientists", "Machine Learning Scientist", "Software Developers", "Registered Nurses"],
+        "weight": [1.0, 0.95, 1.0, 1.0]
+    })
+    esco = pd.DataFrame({
+        "code": ["2511.4", "2512.4"],
+        "title": ["data scientist", "software developer"],
+        "weight": [1.0, 1.0]
+    })
+    return TitleIndex.from_frames(onet, esco)
+
+def test_normalize_title():
+    assert normalize_title("  Data-Scientists (Senior) ") == "data scientist senior"
+
+def test_exact_match_returns_both_frameworks():
+    matches = build_index().lookup("Data Scientist")
+    assert {(m["framework"], m["code"]) for m in matches} == {("O*NET", "15-2051.00"), ("ESCO", "2511.4")}
+    assert all(m["score"] == 1.0 for m in matches)
+
+def test_token_and_typo_fallbacks_filtered_by_framework():
+    index = build_index()
+    assert index.lookup("Senior Software Developer", "O*NET", k=1)[0]["code"] == "15-1252.00"
+    assert index.lookup("data sciencetist", "ESCO", k=1)[0]["code"] == "2511.4"
+    assert index.lookup("astronaut") == []
+
+def test_exact_match_in_the_other_framework_falls_back():
+    index = TitleIndex.from_frames(
+        pd.DataFrame({"code": ["15-1252.00"], "title": ["Software Developers"], "weight": [1.0]}),
+        pd.DataFrame({"code": ["2512.4"], "title": ["software engineer"], "weight": [1.0]})
+    )
+    assert index.lookup("software engineer", "O*NET", k=1)[0]["code"] == "15-1252.00"
+    assert index.lookup("software engineer", "ESCO", k=1)[0]["score"] == 1.0
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / "title_index.pkl")
+    build_index().save(path)
+    assert TitleIndex.load(path).lookup("registered nurse", k=1)[0]["code"] == "29-1141.00"
+
+def test_normalizer_falls_back_on_an_ambiguous_generic_title():
+    from app.core.job_normalizer import JobNormalizer
+    onet = pd.DataFrame({
+        "code": ["11-3021.00", "11-3051.00", "11-1021.00", "15-2051.00"],
+        "title": ["IT Manager", "IO Manager", "OD Manager", "Data Scientists"],
+        "weight": [1.0, 1.0, 1.0, 1.0]
+    })
+    esco = pd.DataFrame({
+        "code": ["2149.9", "2149.10", "2511.4"],
+        "title": ["qa engineer", "qc engineer", "data scientist"],
+        "weight": [1.0, 1.0, 1.0]
+    })
+    normalizer = JobNormalizer(title_index=TitleIndex.from_frames(onet, esco))
+    assert normalizer.normalize("Manager", "O*NET") == "manager"
+    assert normalizer.normalize("Engineer", "ESCO") == "engineer"
+    # Unambiguous titles still resolve, and ESCO answers come from the index
+    assert normalizer.normalize("Data Scientist", "ESCO") == "2511.4"
+    assert normalizer.normalize("data scientist", "O*NET") == "15-2051.00"